@@ -1,3 +1,6 @@
+import importlib.util
+import os
+
 import numpy as np
 
 '''
@@ -24,35 +27,78 @@ for k in available_livetime.keys():
 
 
 '''
-    Effective volumes
+    Effective volumes, from the Veff store of 2025-nsf-review
+    (computing_stuff/veff_store.py, veff_tables.npz)
     energy in GeV
     veff in km^3 sr (include your own factor of 4 pi)
 '''
 steradian = 4 * np.pi
-veff = {
-    "wp" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([4.24E-03, 2.76E-02, 1.14E-01, 3.05E-01, 6.56E-01, 1.15E+00, 1.70E+00, 2.15E+00])*steradian
-    },
-    "deep_high_low_1Hz" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([3.896e-04,  3.842e-03,  2.220e-02,  9.383e-02,  2.907e-01, 7.191e-01,  1.965e+00,  3.486e+00])*steradian
-    },
-    "simple_threshold_2" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([3.586e-03,  2.327e-02,  8.989e-02,  2.771e-01,  7.419e-01,1.541e+00,  3.338e+00,  5.682e+00])*steradian
-    },
-    "simple_threshold_2.5" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([2.284e-03,  1.679e-02,  6.545e-02,  2.190e-01,  6.244e-01, 1.311e+00,  2.894e+00,  5.113e+00])*steradian
-    },
-    "simple_threshold_2.5_downsampled" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([1.605e-03,  1.168e-02,  5.175e-02,  1.876e-01,  5.345e-01, 1.171e+00,  2.689e+00,  4.774e+00])*steradian
-    },
-    "simple_threshold_3_downsampled" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([1.146e-03,  9.014e-03,  4.066e-02,  1.569e-01,  4.493e-01, 1.037e+00,  2.417e+00,  4.413e+00])*steradian
-    },
+veff_store_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                               '2025-nsf-review', 'computing_stuff', 'veff_store.py')
+_spec = importlib.util.spec_from_file_location("veff_store", veff_store_file)
+veff_store = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(veff_store)
+veff_tables = veff_store.get_store()
+veff = {name: veff_tables.table(name) for name in ("wp", "deep_high_low_1Hz", "simple_threshold_2", "simple_threshold_2.5",
+                                                 "simple_threshold_2.5_downsampled", "simple_threshold_3_downsampled")}
+
 
+'''
+    Exposure projections
+    exposure in km^3 sr yr (pass to LimitFigure.add_limit with stations=1, years=1)
+'''
+veff_assumptions = {
+    "smt": "deep_high_low_1Hz",
+    "pa": "simple_threshold_2.5_downsampled",
 }
+
+def compute_exposure(additional_years=0, additional_uptime_fraction=1., additional_veff_assume='smt'):
+    """
+    Exposure on disk today plus projected additional station-years
+
+    Every argument can be a scalar or an array; the result has one exposure
+    curve for every combination of them (an outer product), so a whole grid
+    of scenarios is computed at once.
+
+    Parameters
+    ----------
+    additional_years: float or array of floats
+        additional station-years of operation
+
+    additional_uptime_fraction: float or array of floats
+        fraction of those station-years with the detector live
+
+    additional_veff_assume: str or array of str
+        Veff of the additional livetime, 'smt' (Hi/Lo trigger) or 'pa' (phased array)
+
+    Returns
+    -------
+    energies: array of floats
+        energies in GeV
+
+    exposure: array of floats
+        exposure in km^3 sr yr,
+        shape additional_years.shape + additional_uptime_fraction.shape
+        + additional_veff_assume.shape + (n_energies,)
+    """
+    energies = veff["deep_high_low_1Hz"]["energy"].copy()
+    exposure_today = existing_livetime * veff["deep_high_low_1Hz"]["veff"]
+
+    years = np.asarray(additional_years, dtype=float)
+    uptime = np.asarray(additional_uptime_fraction, dtype=float)
+    assume = np.asarray(additional_veff_assume)
+
+    # Veff per assumption, looked up once per distinct option
+    options, index = np.unique(assume, return_inverse=True)
+    for option in options:
+        if option not in veff_assumptions:
+            raise ValueError("Unrecognized Veff assumption '"+str(option)+"', options are "+str(list(veff_assumptions)))
+    option_veffs = np.array([veff[veff_assumptions[option]]["veff"] for option in options])
+    additional_veffs = option_veffs[index.reshape(assume.shape)]
+
+    n_years, n_uptime, n_assume = years.ndim, uptime.ndim, assume.ndim
+    years = years.reshape(years.shape + (1,) * (n_uptime + n_assume + 1))
+    uptime = uptime.reshape(uptime.shape + (1,) * (n_assume + 1))
+
+    exposure = exposure_today + years * uptime * additional_veffs
+    return energies, exposure
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import rnog
+
+'''
+Check the broadcast rnog.compute_exposure grid against single-scenario calls
+and the exposure formula written out per scenario.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def scalar_exposure(years, uptime, assume):
+    table = rnog.veff[rnog.veff_assumptions[assume]]["veff"]
+    return rnog.existing_livetime * rnog.veff["deep_high_low_1Hz"]["veff"] + years * uptime * table
+
+
+def test_grid_matches_scenarios():
+    years = np.array([0., 10., 50.])
+    uptime = np.array([0.5, 0.8])
+    assume = np.array(['smt', 'pa', 'smt'])
+    energies, exposure = rnog.compute_exposure(years, uptime, assume)
+    assert np.array_equal(energies, rnog.veff["deep_high_low_1Hz"]["energy"])
+    assert exposure.shape==(3, 2, 3, len(energies))
+    for i, j, k in np.ndindex(exposure.shape[:3]):
+        single = rnog.compute_exposure(years[i], uptime[j], assume[k])[1]
+        assert single.shape==(len(energies),)
+        assert np.array_equal(exposure[i, j, k], single)
+        assert np.allclose(single, scalar_exposure(years[i], uptime[j], assume[k]), rtol=1e-12, atol=0)
+
+
+def test_unknown_assumption():
+    with pytest.raises(ValueError):
+        rnog.compute_exposure(10, 1., 'lpda')
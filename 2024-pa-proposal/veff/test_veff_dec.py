@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+from scipy.interpolate import interp1d
+
+import veff_dec
+
+'''
+Check that veff_dec imports without scipy/matplotlib, and that its Aeff
+loaders give what the old top-level script computed.
+Run with `python -m pytest` from this directory.
+'''
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_import_is_light():
+    code = ("import sys, veff_dec; "
+            "print(','.join(m for m in ('scipy', 'matplotlib', 'astropy') if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], cwd=_here, capture_output=True,
+                            text=True, check=True).stdout.strip()
+    assert loaded==''
+
+
+def test_aeff_matches_script():
+    xsec = interp1d(veff_dec.cross_section_E, veff_dec.cross_sections)
+    data = np.loadtxt(os.path.join(_here, 'RNOG_effV.txt'), delimiter=',', skiprows=1)
+    veff = data[:, 1]*4*np.pi*1E9
+    L_int = veff_dec.m_n/(veff_dec.rho_factor * xsec(data[:, 0]))/100
+    energy, aeff = veff_dec.get_rnog_aeff()
+    assert np.array_equal(energy, data[:, 0])
+    assert np.array_equal(aeff, veff/L_int)
+
+    data = np.loadtxt(os.path.join(_here, 'IceCube_Aeff.csv'), delimiter=',', skiprows=1)
+    energy, aeff = veff_dec.get_icecube_aeff()
+    assert np.array_equal(energy, np.log10(data[:, 0])+9)
+    assert np.array_equal(aeff, data[:, 1])
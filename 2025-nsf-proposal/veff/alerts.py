@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+
+import veff_dec
+
+'''
+RNO-G and IceCube sensitivity at the position of every IceCube alert
+
+For every track alert (IceCube_Gold_Bronze_Tracks_copy.csv: type, ra, dec)
+this gives the point-source effective area of both detectors at a
+reference energy and the E^-2 fluence sensitivity at the alert's
+declination, in one vectorized pass over the catalog. The effective areas
+are separable in energy and declination (veff_dec.SkyAeff), so the energy
+integral is done once per detector and every alert only needs its
+declination bin.
+
+Results are columns (a dict of arrays) and can be saved as .npz for
+stacking studies, e.g. `python alerts.py alert_exposure.npz`.
+'''
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_catalog(file='IceCube_Gold_Bronze_Tracks_copy.csv'):
+    """Alert catalog as columns "type" (str), "ra" and "dec" (degrees)"""
+    data = np.loadtxt(os.path.join(_here, file), delimiter=',', skiprows=1,
+                      dtype=[("type", "U16"), ("ra", float), ("dec", float)])
+    return {"type": data["type"], "ra": data["ra"], "dec": data["dec"]}
+
+
+def e2_fluence_integral(sky_aeff, n_points=1001):
+    """
+    Integral of the all-sky Aeff times E^-2 over the table energies
+
+    Returns
+    -------
+    integral: float
+        int A(E) E^-2 dE in m^2 sr / GeV
+    """
+    log_energy = np.linspace(sky_aeff.log_energy[0], sky_aeff.log_energy[-1], n_points)
+    energy = 10**log_energy / 1e9 # GeV
+    # int A E^-2 dE = int A E^-1 dlnE
+    integrand = sky_aeff.allsky(10**log_energy) / energy
+    return np.sum((integrand[1:] + integrand[:-1]) / 2 * np.diff(np.log(energy)))
+
+
+def alert_exposure(catalog, rnog=None, icecube=None, reference_energy=1e18, sup=2.44):
+    """
+    Effective area and E^-2 fluence sensitivity of RNO-G and IceCube for every alert
+
+    Parameters
+    ----------
+    catalog: dict
+        columns "type", "ra", "dec" (degrees), as from load_catalog
+
+    rnog, icecube: veff_dec.SkyAeff or None
+        detectors, SkyAeff.from_rnog() / SkyAeff.from_icecube() by default
+
+    reference_energy: float
+        energy (eV) to give the effective area at
+
+    sup: float
+        upper limit on the number of events (2.44 for F-C UL w/ 0 background)
+
+    Returns
+    -------
+    columns: dict
+        the catalog columns plus, per detector ("rnog", "icecube"):
+        "<det>_dec_bin": declination bin of the alert,
+        "<det>_aeff": point-source effective area at reference_energy in m^2,
+        "<det>_e2_fluence": E^2 dN/dE fluence sensitivity for an E^-2 spectrum in GeV cm^-2
+    """
+    if rnog is None:
+        rnog = veff_dec.SkyAeff.from_rnog()
+    if icecube is None:
+        icecube = veff_dec.SkyAeff.from_icecube()
+
+    dec = np.asarray(catalog["dec"], dtype=float)
+    columns = dict(catalog)
+    for name, detector in (("rnog", rnog), ("icecube", icecube)):
+        energy_index, offset, dec_index = detector.bin_indices(reference_energy, dec)
+        per_steradian = detector.per_steradian[dec_index]
+        columns[name+"_dec_bin"] = dec_index.astype(np.int16)
+        columns[name+"_aeff"] = detector.from_indices(energy_index, offset, dec_index)
+        # point-source int A(E, dec) E^-2 dE, in cm^2 / GeV
+        integral = e2_fluence_integral(detector) * per_steradian * 1e4
+        with np.errstate(divide='ignore'):
+            columns[name+"_e2_fluence"] = sup / integral
+    return columns
+
+
+def save(path, columns):
+    """
+    Save alert columns as .npz, with the alert types stored as small integer codes
+
+    Load with load(path)
+    """
+    types, codes = np.unique(columns["type"], return_inverse=True)
+    arrays = {key: value for key, value in columns.items() if key != "type"}
+    arrays["type_code"] = codes.astype(np.uint8)
+    arrays["type_labels"] = types
+    np.savez(path, **arrays)
+
+
+def load(path):
+    """Columns saved with save"""
+    with np.load(path) as data:
+        columns = {key: data[key] for key in data.files if key not in ("type_code", "type_labels")}
+        columns["type"] = data["type_labels"][data["type_code"]]
+    return columns
+
+
+if __name__=="__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="RNO-G and IceCube sensitivity for every IceCube alert")
+    parser.add_argument('output', nargs='?', default='alert_exposure.npz', help=".npz file to write")
+    parser.add_argument('--catalog', default='IceCube_Gold_Bronze_Tracks_copy.csv')
+    args = parser.parse_args()
+
+    columns = alert_exposure(load_catalog(args.catalog))
+    save(args.output, columns)
+    for name in ("rnog", "icecube"):
+        print("{}: median Aeff(1 EeV) {:.3g} m^2, median E^2 fluence {:.3g} GeV/cm^2".format(
+            name, np.median(columns[name+"_aeff"]), np.median(columns[name+"_e2_fluence"])))
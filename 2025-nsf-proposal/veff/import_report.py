@@ -0,0 +1,73 @@
+import argparse
+import os
+import subprocess
+import sys
+
+'''
+Import-time report for a module
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+lists the slowest imports by cumulative time (what importing that module
+cost, including everything it pulled in), e.g.
+
+    python import_report.py veff_dec --top 15 --budget 150
+
+exits with status 1 if the total import time is over the budget (in ms),
+so it can guard startup time in a batch pipeline.
+'''
+
+
+def profile_imports(module, cwd=None):
+    """
+    Import times of everything loaded by `import module`
+
+    Returns
+    -------
+    imports: list of dict
+        in import order, with "name", "depth" (nesting level), "self" and
+        "cumulative" times in ms
+    """
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import '+module],
+                             capture_output=True, text=True, cwd=cwd)
+    if process.returncode != 0:
+        raise RuntimeError("import "+module+" failed:\n"+process.stderr)
+
+    imports = []
+    for line in process.stderr.splitlines():
+        # import time:   self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append({
+            "name": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self": int(self_us) / 1000.,
+            "cumulative": int(cumulative_us) / 1000.,
+        })
+    return imports
+
+
+def report(module, top=20, cwd=None):
+    """Print the slowest imports of a module, returns the total import time in ms"""
+    imports = profile_imports(module, cwd=cwd)
+    total = [entry["cumulative"] for entry in imports if entry["depth"] == 0 and entry["name"] == module][-1]
+    print("import {}: {:.1f} ms total, {} modules".format(module, total, len(imports)))
+    print("{:>12} {:>10}  {}".format("cumul. [ms]", "self [ms]", "module"))
+    for entry in sorted(imports, key=lambda e: e["cumulative"], reverse=True)[:top]:
+        print("{:>12.1f} {:>10.1f}  {}{}".format(entry["cumulative"], entry["self"],
+                                                 '  ' * entry["depth"], entry["name"]))
+    return total
+
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Report the import time of a module")
+    parser.add_argument('module', nargs='?', default='veff_dec', help="module to import")
+    parser.add_argument('--top', type=int, default=20, help="number of imports to list")
+    parser.add_argument('--budget', type=float, default=None, help="maximum total import time in ms")
+    args = parser.parse_args()
+
+    total = report(args.module, top=args.top)
+    if args.budget is not None and total > args.budget:
+        print("over budget: {:.1f} ms > {:.1f} ms".format(total, args.budget))
+        sys.exit(1)
@@ -0,0 +1,41 @@
+import numpy as np
+
+import alerts
+import veff_dec
+
+'''
+Check the vectorized alert_exposure against evaluating every alert on its own.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def looped_alert(detector, dec, reference_energy=1e18, sup=2.44, n_points=1001):
+    aeff = detector(reference_energy, dec)
+    log_energy = np.linspace(detector.log_energy[0], detector.log_energy[-1], n_points)
+    energy = 10**log_energy / 1e9 # GeV
+    point_aeff = detector(10**log_energy, np.full(n_points, dec)) * 1e4 # cm^2
+    integral = np.trapezoid(point_aeff / energy, x=np.log(energy))
+    return aeff, sup / integral if integral > 0 else np.inf
+
+
+def test_alert_exposure_matches_loop():
+    catalog = alerts.load_catalog()
+    rnog = veff_dec.SkyAeff.from_rnog()
+    icecube = veff_dec.SkyAeff.from_icecube()
+    columns = alerts.alert_exposure(catalog, rnog, icecube)
+    assert len(columns["rnog_aeff"])==len(catalog["dec"])
+    for name, detector in (("rnog", rnog), ("icecube", icecube)):
+        for i, dec in enumerate(catalog["dec"][:50]):
+            aeff, fluence = looped_alert(detector, dec)
+            assert np.isclose(columns[name+"_aeff"][i], aeff, rtol=1e-12, atol=0)
+            assert np.isclose(columns[name+"_e2_fluence"][i], fluence, rtol=1e-9, atol=0)
+
+
+def test_save_load(tmp_path):
+    columns = alerts.alert_exposure(alerts.load_catalog())
+    path = str(tmp_path / 'alerts.npz')
+    alerts.save(path, columns)
+    loaded = alerts.load(path)
+    assert set(loaded)==set(columns)
+    for key in columns:
+        assert np.array_equal(loaded[key], columns[key])
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from scipy.interpolate import interp1d
+
+import veff_dec
+
+'''
+Check that veff_dec imports without scipy/matplotlib, and that its Aeff
+loaders give what the old top-level script computed.
+Run with `python -m pytest` from this directory.
+'''
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_import_is_light():
+    code = ("import sys, veff_dec; "
+            "print(','.join(m for m in ('scipy', 'matplotlib', 'astropy') if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], cwd=_here, capture_output=True,
+                            text=True, check=True).stdout.strip()
+    assert loaded==''
+
+
+def test_aeff_matches_script():
+    xsec = interp1d(veff_dec.cross_section_E, veff_dec.cross_sections)
+    data = np.loadtxt(os.path.join(_here, 'RNOG_effV.txt'), delimiter=',', skiprows=1)
+    veff = data[:, 1]*4*np.pi*1E9
+    L_int = veff_dec.m_n/(veff_dec.rho_factor * xsec(data[:, 0]))/100
+    energy, aeff = veff_dec.get_rnog_aeff()
+    assert np.array_equal(energy, data[:, 0])
+    assert np.array_equal(aeff, veff/L_int)
+
+    data = np.loadtxt(os.path.join(_here, 'IceCube_Aeff.csv'), delimiter=',', skiprows=1)
+    energy, aeff = veff_dec.get_icecube_aeff()
+    assert np.array_equal(energy, np.log10(data[:, 0])+9)
+    assert np.array_equal(aeff, data[:, 1])
+
+
+def test_sky_aeff_matches_figure():
+    sky = veff_dec.SkyAeff.from_rnog()
+    energy, aeff = veff_dec.get_rnog_aeff()
+    edges, relative = veff_dec.get_relative_areas('rel_areas_gl.json')
+    # on the energy nodes: the right panel of make_figure is the all-sky Aeff times the relative areas
+    assert np.allclose(sky.binned(10**energy), aeff[:, np.newaxis] * relative, rtol=1e-12, atol=0)
+    # point source: divided by the solid angle of the declination bin
+    centers = veff_dec.get_bin_centers(edges)
+    solid_angles = 2 * np.pi * np.diff(np.sin(np.radians(edges)))
+    point = sky(10**energy[:, np.newaxis], centers)
+    assert np.allclose(point, aeff[:, np.newaxis] * relative / solid_angles, rtol=1e-12, atol=0)
+    # between nodes, linear in log-log
+    middle = (energy[1:] + energy[:-1]) / 2
+    assert np.allclose(sky.allsky(10**middle), np.sqrt(aeff[1:] * aeff[:-1]), rtol=1e-12, atol=0)
+
+
+def test_sky_aeff_range():
+    sky = veff_dec.SkyAeff.from_rnog()
+    low, high = 10**sky.log_energy[0], 10**sky.log_energy[-1]
+    edges = sky.dec_bin_edges
+    # the table ends are inside
+    assert np.all(np.isfinite(sky([low, high], [edges[0], edges[-1]])))
+    for energy, dec in ((low / 2, 0.), (high * 2, 0.), (1e18, edges[0] - 1), (1e18, edges[-1] + 1),
+                        (np.nan, 0.), (1e18, np.nan)):
+        with pytest.raises(ValueError):
+            sky(energy, dec)
@@ -0,0 +1,54 @@
+import numpy as np
+
+import veff_dec
+import visibility
+
+'''
+Check the analytic local coordinates and the zenith acceptance: averaged
+over a sidereal day and over each declination bin, the instantaneous
+effective area gives back the declination acceptance it replaces.
+Run with `python -m pytest` from this directory.
+'''
+
+sidereal_day = 0.99726957 # days
+
+
+def test_meridian_transit():
+    # a source on the meridian (hour angle 0) is at zenith angle |latitude - dec|
+    mjd = np.array([60000.25, 60400.7])
+    dec = np.array([10., 80.])
+    ra = np.mod(visibility.gmst(mjd) + visibility.summit_longitude, 360.)
+    zenith, azimuth = visibility.local_coordinates(ra, dec, mjd, precess=False)
+    assert np.allclose(zenith, np.abs(visibility.summit_latitude - dec), atol=1e-9)
+    assert np.allclose(np.cos(np.radians(azimuth)), np.sign(dec - visibility.summit_latitude), atol=1e-9)
+
+
+def test_sidereal_period():
+    zenith = [visibility.local_coordinates(120., 35., mjd, precess=False)[0]
+              for mjd in (60000.1, 60000.1 + sidereal_day)]
+    assert np.isclose(zenith[0], zenith[1], atol=1e-4)
+    assert np.isclose(visibility.to_mjd('2000-01-01T12:00'), 51544.5)
+
+
+def test_day_average_matches_declination_acceptance():
+    sky = veff_dec.SkyAeff.from_rnog()
+    acceptance = visibility.ZenithAcceptance(sky)
+    rng = np.random.default_rng(0)
+    edges = np.radians(sky.dec_bin_edges)
+    n = 400000
+    bins = rng.integers(0, len(edges) - 1, n)
+    # uniform in solid angle within every declination bin, at random times of day
+    sin_dec = np.sin(edges[bins]) + rng.random(n) * (np.sin(edges[bins+1]) - np.sin(edges[bins]))
+    dec = np.degrees(np.arcsin(sin_dec))
+    zenith, _ = visibility.local_coordinates(rng.uniform(0., 360., n), dec, 60000 + rng.random(n), precess=False)
+    aeff = acceptance(1e18, zenith)
+    average = np.bincount(bins, aeff, minlength=len(edges) - 1) / np.bincount(bins, minlength=len(edges) - 1)
+    expected = sky.allsky(1e18) * sky.per_steradian
+    assert np.abs(average - expected).max() < 0.01 * expected.max()
+
+
+def test_transient_aeff():
+    columns = visibility.transient_aeff([10., 200.], [30., -5.], ['2025-03-01T04:00', '2025-08-01T20:30'])
+    assert np.all((columns["zenith"] >= 0) & (columns["zenith"] <= 180))
+    assert np.all(columns["aeff"] >= 0)
+    assert np.all(columns["aeff_average"] > 0)
@@ -1,173 +1,288 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from astropy.time import Time
-import astropy.units as u
-from astropy.coordinates import SkyCoord, EarthLocation, AltAz
-from astropy.coordinates import get_sun
-from scipy.interpolate import interp1d
-import datetime
-from matplotlib import patches
-
-import matplotlib
-matplotlib.rc('font',**{'family':'serif'})
+import functools
+import json
+import os
 
-# instantiate figure
+import numpy as np
 
-fig, (ax2,ax) = plt.subplots(1, 2, figsize=(12,5),gridspec_kw={'width_ratios': [1, 1]})
+'''
+Effective area vs energy and vs declination for RNO-G, IceCube (and ARA)
 
+Importable as a module: only numpy is loaded at import time, scipy and
+matplotlib are imported by the functions that need them.
+Run as a script to make combo_veffvsen_veffvsdec.pdf.
+Use import_report.py to check the import time.
+'''
 
-# absolute effective volume
-######################################
-######################################
-######################################
+_here = os.path.dirname(os.path.abspath(__file__))
 
 cross_section_E = np.log10(np.asarray([1e4,2.5e4,6e4,1e5,2.5e5,6e5,1e6,2.5e6,6e6,1e7,2.5e7,6e7,1e8,2.5e8,6e8,1e9,2.5e9,6e9,1e10,2.5e10,6e10,1e11,2.5e11,6e11,1e12]))+9.0#eV
 cross_sections = np.asarray([0.63e-34,0.12e-33,0.22e-33,0.3e-33,0.49e-33,0.77e-33,0.98e-33,0.15e-32,0.22e-32,0.27e-32,0.4e-32,0.56e-32,0.67e-32,0.94e-32,0.13e-31,0.15e-31,0.2e-31,0.27e-31,0.31e-31,0.41e-31,0.53e-31,0.61e-31,0.8e-31,0.1e-30,0.12e-30])#cm
-from scipy.interpolate import interp1d
-xsec_interpolator = interp1d(cross_section_E, cross_sections) # in cm^2
 rho_factor=917.0/1000.00 #g/cm^3
 m_n = 1.67e-24 #g
 
-
 # ARA (starts with km3 sr)
 Energy_EV = np.asarray([16.5, 17.0, 17.5, 18.0, 18.5, 19.0, 19.5, 20.0])
 ARA_veff = np.array([1.105E-1, 5.195E-1, 1.826E+0, 5.259E+0,1.106E+1, 2.077E+1, 3.431E+1, 5.073E+1])
 PA_veff = np.array([2.618E-1, 1.003E+0, 3.096E+0, 7.406E+0,1.466E+1, 2.578E+1, 4.039E+1, 5.073E+1])
 
-total_ARA_veff = (ARA_veff*4)+PA_veff
-total_ARA_veff = total_ARA_veff*1E9 # m3 sr
-L_int_ARA = m_n/(rho_factor * xsec_interpolator(Energy_EV))/100 # cm to m
-total_ARA_aeff = total_ARA_veff/L_int_ARA # m2 sr
-
-# RNOG (starts with km3)
-RNOG_data = np.loadtxt('RNOG_effV.txt',delimiter=',',skiprows=1)
-RNOG_energy = RNOG_data[:,0]
-RNOG_veff = RNOG_data[:,1]*4*np.pi # km3 sr
-
-RNOG_veff = RNOG_veff*1E9 # m3 sr
-L_int_RNOG = m_n/(rho_factor * xsec_interpolator(RNOG_energy))/100 # cm to m
-RNOG_aeff = RNOG_veff/L_int_RNOG # m2 sr
-
-
-# IceCube (starts with m2 sr)
-IC_data = np.loadtxt('IceCube_Aeff.csv',delimiter=',',skiprows=1)
-IC_aeff = np.asarray(IC_data[:,1])
-IC_energy = np.log10(np.asarray(IC_data[:,0]))+9
-
-colors=['black','grey','dodgerblue']
-
-# line_ARA, =ax2.plot(10**Energy_EV,total_ARA_aeff,color=colors[0],lw=2.5,label='ARA (5 Stations)')
-line_IC, = ax2.plot(10**IC_energy,IC_aeff,lw=2.5,color=colors[1],label='IceCube (EHE IC-86)')
-line_RNOG, =ax2.plot(10**RNOG_energy,RNOG_aeff,lw=4,color=colors[2],label='RNO-G (35 Stations)')
-line_RNOG_8, =ax2.plot(10**RNOG_energy,RNOG_aeff/35*8,lw=4,color=colors[0],label='RNO-G (8 Stations)')
-
-ax2.set_yscale('log')
-ax2.set_xscale('log')
-ax2.set_xlim([1e16,1e20])
-ax2.legend(handles=[line_RNOG,
-                    line_RNOG_8,
-                    line_IC,
-                    # ,line_ARA
-                    ],
-                    loc='lower right',fontsize=15)
-ax2.set_xlabel('Energy [eV]')
-ax2.set_ylabel('All-Sky Effective Area [$m^2 sr$]')
-ax2.grid()
+
+@functools.lru_cache(maxsize=None)
+def _xsec_interpolator():
+    from scipy.interpolate import interp1d
+    return interp1d(cross_section_E, cross_sections) # in cm^2
+
+
+def interaction_length(log_energy_eV):
+    """Interaction length in ice, in m, for log10(energy / eV)"""
+    return m_n/(rho_factor * _xsec_interpolator()(log_energy_eV))/100 # cm to m
+
+
+def get_ara_aeff():
+    """ARA (4 stations + PA station): log10(energy / eV), all-sky Aeff in m^2 sr"""
+    total_ARA_veff = (ARA_veff*4)+PA_veff
+    total_ARA_veff = total_ARA_veff*1E9 # m3 sr
+    return Energy_EV, total_ARA_veff/interaction_length(Energy_EV) # m2 sr
+
+
+def get_rnog_aeff(file='RNOG_effV.txt'):
+    """RNO-G (35 stations): log10(energy / eV), all-sky Aeff in m^2 sr"""
+    RNOG_data = np.loadtxt(os.path.join(_here, file),delimiter=',',skiprows=1)
+    RNOG_energy = RNOG_data[:,0]
+    RNOG_veff = RNOG_data[:,1]*4*np.pi # km3 sr
+    RNOG_veff = RNOG_veff*1E9 # m3 sr
+    return RNOG_energy, RNOG_veff/interaction_length(RNOG_energy) # m2 sr
+
+
+def get_icecube_aeff(file='IceCube_Aeff.csv'):
+    """IceCube EHE (IC-86): log10(energy / eV), all-sky Aeff in m^2 sr"""
+    IC_data = np.loadtxt(os.path.join(_here, file),delimiter=',',skiprows=1)
+    IC_aeff = np.asarray(IC_data[:,1])
+    IC_energy = np.log10(np.asarray(IC_data[:,0]))+9
+    return IC_energy, IC_aeff
+
 
 def find_nearest_energy_bin(array, value):
     array = np.asarray(array)
     idx = (np.abs(array-value)).argmin()
     return idx, array[idx]
-# ara_bin, ara_en = find_nearest_energy_bin(10**Energy_EV, 1e18)
-rnog_bin, rnog_en = find_nearest_energy_bin(10**RNOG_energy, 1e18)
-ic_bin, ic_en = find_nearest_energy_bin(10**IC_energy, 1E18)
 
-print(IC_energy)
-# ara_at_1EeV = total_ARA_aeff[ara_bin]
-rnog_at_1EeV = RNOG_aeff[rnog_bin]
-ic_at_1EeV = IC_aeff[ic_bin]
-# print(f"ARA {ara_at_1EeV:e}, RNOG {rnog_at_1EeV:e}, IC {ic_at_1EeV:e}")
 
+def get_bin_centers(bins):
+    return (bins[1:] + bins[:-1]) * 0.5
 
-# relative effective area plot
-######################################
-######################################
-######################################
 
-import json
+def get_relative_areas(file):
+    """Declination bin edges (deg) and relative effective areas from one of the rel_areas_*.json"""
+    with open(os.path.join(_here, file)) as f:
+        data = json.load(f)
+    return np.asarray(data['dec_bin_edges']), np.asarray(data['relative_eff_areas'])
+
+
+class SkyAeff:
+    """
+    Effective area vs energy and declination, A(E, dec) = A(E) * f(dec)
+
+    Stored separably: the all-sky Aeff A(E) on its energy nodes
+    (interpolated linearly in log-log) and the fraction of it per declination
+    bin from a rel_areas_*.json (which is the same at all energies), so the
+    memory is n_energies + n_declinations however many points are evaluated.
+    Lookups use searchsorted bin indices, which can be computed once with
+    bin_indices and reused.
+
+    Parameters
+    ----------
+    log_energy: array of floats
+        log10(energy / eV) nodes, increasing
+
+    aeff: array of floats
+        all-sky effective area (m^2 sr) at the nodes
+
+    dec_bin_edges: array of floats
+        declination bin edges in degrees
+
+    relative_eff_areas: array of floats
+        fraction of the all-sky effective area in every declination bin
+    """
+    def __init__(self, log_energy, aeff, dec_bin_edges, relative_eff_areas):
+        self.log_energy = np.asarray(log_energy, dtype=float)
+        self.log_aeff = np.log10(np.asarray(aeff, dtype=float))
+        self.slopes = np.diff(self.log_aeff) / np.diff(self.log_energy)
+        self.dec_bin_edges = np.asarray(dec_bin_edges, dtype=float)
+        self.relative_eff_areas = np.asarray(relative_eff_areas, dtype=float)
+        # solid angle of every declination bin
+        solid_angles = 2 * np.pi * np.diff(np.sin(np.radians(self.dec_bin_edges)))
+        self.per_steradian = self.relative_eff_areas / solid_angles
+
+    @classmethod
+    def from_rnog(cls, file='RNOG_effV.txt', dec_file='rel_areas_gl.json', n_stations=35):
+        """RNO-G from the Veff table (35 stations) and the Greenland declination acceptance"""
+        energy, aeff = get_rnog_aeff(file)
+        return cls(energy, aeff / 35 * n_stations, *get_relative_areas(dec_file))
+
+    @classmethod
+    def from_icecube(cls, file='IceCube_Aeff.csv', dec_file='rel_areas_ic.json'):
+        """IceCube EHE from the all-sky Aeff table and the IceCube declination acceptance"""
+        energy, aeff = get_icecube_aeff(file)
+        return cls(energy, aeff, *get_relative_areas(dec_file))
+
+    def bin_indices(self, energy, dec):
+        """
+        Energy segment, position in it, and declination bin of every point
+
+        energy in eV, dec in degrees (broadcast against each other).
+        Points outside the table on either axis raise a ValueError,
+        rather than being extrapolated.
+        """
+        log_energy = np.log10(np.asarray(energy, dtype=float))
+        dec = np.asarray(dec, dtype=float)
+        if np.any(~(log_energy >= self.log_energy[0])) or np.any(~(log_energy <= self.log_energy[-1])):
+            raise ValueError("Energies outside the effective area table ({:.3g} - {:.3g} eV)".format(
+                10**self.log_energy[0], 10**self.log_energy[-1]))
+        if np.any(~(dec >= self.dec_bin_edges[0])) or np.any(~(dec <= self.dec_bin_edges[-1])):
+            raise ValueError("Declinations outside the acceptance table ({:g} - {:g} deg)".format(
+                self.dec_bin_edges[0], self.dec_bin_edges[-1]))
+        # the last node / edge belongs to the last segment / bin
+        energy_index = np.minimum(np.searchsorted(self.log_energy, log_energy, side='right') - 1,
+                                  len(self.log_energy) - 2)
+        offset = log_energy - self.log_energy[energy_index]
+        dec_index = np.minimum(np.searchsorted(self.dec_bin_edges, dec, side='right') - 1,
+                               len(self.relative_eff_areas) - 1)
+        return energy_index, offset, dec_index
+
+    def allsky(self, energy):
+        """All-sky effective area (m^2 sr) at energy (eV), see bin_indices for the range"""
+        energy_index, offset, _ = self.bin_indices(energy, 0.)
+        return 10**(self.log_aeff[energy_index] + self.slopes[energy_index] * offset)
+
+    def from_indices(self, energy_index, offset, dec_index):
+        """Point-source effective area (m^2) from precomputed bin_indices"""
+        return 10**(self.log_aeff[energy_index] + self.slopes[energy_index] * offset) * self.per_steradian[dec_index]
+
+    def __call__(self, energy, dec):
+        """Point-source effective area (m^2) for sources at energy (eV) and declination (deg)"""
+        return self.from_indices(*self.bin_indices(energy, dec))
+
+    def binned(self, energy):
+        """All-sky Aeff in every declination bin (m^2 sr), as in the right panel of make_figure"""
+        return self.allsky(energy)[..., np.newaxis] * self.relative_eff_areas
+
+
+def make_figure(save_name='combo_veffvsen_veffvsdec.pdf'):
+    import matplotlib
+    import matplotlib.pyplot as plt
+    matplotlib.rc('font',**{'family':'serif'})
+
+    # instantiate figure
+
+    fig, (ax2,ax) = plt.subplots(1, 2, figsize=(12,5),gridspec_kw={'width_ratios': [1, 1]})
+
+    # absolute effective volume
+    ######################################
+    ######################################
+    ######################################
+
+    RNOG_energy, RNOG_aeff = get_rnog_aeff()
+    IC_energy, IC_aeff = get_icecube_aeff()
+
+    colors=['black','grey','dodgerblue']
+
+    # line_ARA, =ax2.plot(10**Energy_EV,total_ARA_aeff,color=colors[0],lw=2.5,label='ARA (5 Stations)')
+    line_IC, = ax2.plot(10**IC_energy,IC_aeff,lw=2.5,color=colors[1],label='IceCube (EHE IC-86)')
+    line_RNOG, =ax2.plot(10**RNOG_energy,RNOG_aeff,lw=4,color=colors[2],label='RNO-G (35 Stations)')
+    line_RNOG_8, =ax2.plot(10**RNOG_energy,RNOG_aeff/35*8,lw=4,color=colors[0],label='RNO-G (8 Stations)')
+
+    ax2.set_yscale('log')
+    ax2.set_xscale('log')
+    ax2.set_xlim([1e16,1e20])
+    ax2.legend(handles=[line_RNOG,
+                        line_RNOG_8,
+                        line_IC,
+                        # ,line_ARA
+                        ],
+                        loc='lower right',fontsize=15)
+    ax2.set_xlabel('Energy [eV]')
+    ax2.set_ylabel('All-Sky Effective Area [$m^2 sr$]')
+    ax2.grid()
+
+    # ara_bin, ara_en = find_nearest_energy_bin(10**Energy_EV, 1e18)
+    rnog_bin, rnog_en = find_nearest_energy_bin(10**RNOG_energy, 1e18)
+    ic_bin, ic_en = find_nearest_energy_bin(10**IC_energy, 1E18)
+
+    # ara_at_1EeV = total_ARA_aeff[ara_bin]
+    rnog_at_1EeV = RNOG_aeff[rnog_bin]
+    ic_at_1EeV = IC_aeff[ic_bin]
+    # print(f"ARA {ara_at_1EeV:e}, RNOG {rnog_at_1EeV:e}, IC {ic_at_1EeV:e}")
+
+    # relative effective area plot
+    ######################################
+    ######################################
+    ######################################
+
+    # IceCube
+    IC_dec_bin_edges, IC_rel_eff_areas = get_relative_areas('rel_areas_ic.json')
+    IC_dec_bin_centers = get_bin_centers(IC_dec_bin_edges)
+    IC_abs_eff_areas = IC_rel_eff_areas * ic_at_1EeV
+    ax.hist(
+        IC_dec_bin_centers, bins=IC_dec_bin_edges, weights=IC_abs_eff_areas,
+        histtype='step', color='grey', lw=2.5
+    )
+    ax.hist(
+        IC_dec_bin_centers, bins=IC_dec_bin_edges,
+        weights=IC_abs_eff_areas, color='grey', alpha=0.25
+    )
+
+    # RNO-G
+    RNOG_dec_bin_edges, RNOG_rel_eff_areas = get_relative_areas('rel_areas_gl.json')
+    RNOG_dec_bin_centers = get_bin_centers(RNOG_dec_bin_edges)
+    RNOG_abs_eff_areas = RNOG_rel_eff_areas * rnog_at_1EeV
+    ax.hist(
+        RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges, weights=RNOG_abs_eff_areas,
+        histtype='step', color='dodgerblue', lw=4
+    )
+    ax.hist(
+        RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges,
+        weights=RNOG_abs_eff_areas, color='dodgerblue', alpha=.25
+    )
+
+    ax.hist(
+        RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges, weights=RNOG_abs_eff_areas/35*8,
+        histtype='step', color='black', lw=4
+    )
+    ax.hist(
+        RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges,
+        weights=RNOG_abs_eff_areas/35*8, color='black', alpha=.25
+    )
+
+    # # ARA / SP like
+    # ARA_dec_bin_edges, ARA_rel_eff_areas = get_relative_areas('rel_areas_sp.json')
+    # ARA_dec_bin_centers = get_bin_centers(ARA_dec_bin_edges)
+    # ARA_abs_eff_areas = ARA_rel_eff_areas * ara_at_1EeV
+    # print(f"ARA summed aeffs {np.sum(ARA_abs_eff_areas)}")
+    # ax.hist(
+    #     ARA_dec_bin_centers, bins=ARA_dec_bin_edges, weights=ARA_abs_eff_areas,
+    #     histtype='step', color='black', lw=2.5
+    # )
+    # ax.hist(
+    #     ARA_dec_bin_centers, bins=ARA_dec_bin_edges, weights=ARA_abs_eff_areas,
+    #     color='black', alpha=0.25
+    # )
+
+    # make axes pretty
+    ax.grid()
+    ax.set_xlabel('Declination [deg.]',fontsize=20)
+    ax.set_ylabel("Effective Area at 1 EeV  [$m^2$]")
+    ax.set_xlim([-90,90])
+    ax.set_ylim([0,20000])
+
+    for a in [ax, ax2]:
+        a.yaxis.label.set_fontsize(18)
+        a.xaxis.label.set_fontsize(18)
+        a.tick_params(axis='both', which='major', labelsize=15)
+
+    plt.tight_layout()
+    plt.savefig(save_name,bbox_inches='tight', dpi=300)
+    return fig
 
-def get_bin_centers(bins):
-    return (bins[1:] + bins[:-1]) * 0.5
 
-# IceCube
-IC = open('rel_areas_ic.json')
-IC_data = json.load(IC)
-IC_dec_bin_edges = np.asarray(IC_data['dec_bin_edges'])
-IC_dec_bin_centers = get_bin_centers(IC_dec_bin_edges)
-IC_rel_eff_areas = np.asarray(IC_data['relative_eff_areas'])
-IC_abs_eff_areas = IC_rel_eff_areas * ic_at_1EeV
-ax.hist(
-    IC_dec_bin_centers, bins=IC_dec_bin_edges, weights=IC_abs_eff_areas,
-    histtype='step', color='grey', lw=2.5
-)
-ax.hist(
-    IC_dec_bin_centers, bins=IC_dec_bin_edges,
-    weights=IC_abs_eff_areas, color='grey', alpha=0.25
-)
-
-# RNO-G
-RNOG = open('rel_areas_gl.json')
-RNOG_data = json.load(RNOG)
-RNOG_dec_bin_edges = np.asarray(RNOG_data['dec_bin_edges'])
-RNOG_dec_bin_centers = get_bin_centers(RNOG_dec_bin_edges)
-RNOG_rel_eff_areas = np.asarray(RNOG_data['relative_eff_areas'])
-RNOG_abs_eff_areas = RNOG_rel_eff_areas * rnog_at_1EeV
-ax.hist(
-    RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges, weights=RNOG_abs_eff_areas,
-    histtype='step', color='dodgerblue', lw=4
-)
-ax.hist(
-    RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges,
-    weights=RNOG_abs_eff_areas, color='dodgerblue', alpha=.25
-)
-
-ax.hist(
-    RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges, weights=RNOG_abs_eff_areas/35*8,
-    histtype='step', color='black', lw=4
-)
-ax.hist(
-    RNOG_dec_bin_centers, bins=RNOG_dec_bin_edges,
-    weights=RNOG_abs_eff_areas/35*8, color='black', alpha=.25
-)
-
-# # ARA / SP like
-# ARA = open('rel_areas_sp.json')
-# ARA_data = json.load(ARA)
-# ARA_dec_bin_edges = np.asarray(ARA_data['dec_bin_edges'])
-# ARA_dec_bin_centers = get_bin_centers(ARA_dec_bin_edges)
-# ARA_rel_eff_areas = np.asarray(ARA_data['relative_eff_areas'])
-# ARA_abs_eff_areas = ARA_rel_eff_areas * ara_at_1EeV
-# print(f"ARA summed aeffs {np.sum(ARA_abs_eff_areas)}")
-# ax.hist(
-#     ARA_dec_bin_centers, bins=ARA_dec_bin_edges, weights=ARA_abs_eff_areas,
-#     histtype='step', color='black', lw=2.5
-# )
-# ax.hist(
-#     ARA_dec_bin_centers, bins=ARA_dec_bin_edges, weights=ARA_abs_eff_areas,
-#     color='black', alpha=0.25
-# )
-
-# make axes pretty
-ax.grid()
-ax.set_xlabel('Declination [deg.]',fontsize=20)
-ax.set_ylabel("Effective Area at 1 EeV  [$m^2$]")
-ax.set_xlim([-90,90])
-ax.set_ylim([0,20000])
-
-for a in [ax, ax2]:
-    a.yaxis.label.set_fontsize(18)
-    a.xaxis.label.set_fontsize(18)
-    a.tick_params(axis='both', which='major', labelsize=15)
-
-plt.tight_layout()
-plt.savefig('combo_veffvsen_veffvsdec.pdf',bbox_inches='tight', dpi=300)
+if __name__=="__main__":
+    make_figure()
@@ -0,0 +1,200 @@
+import numpy as np
+
+import veff_dec
+
+'''
+Instantaneous source visibility and effective area at Summit Station
+
+For transients (GRB, GW, TDE follow-up) what matters is the zenith angle
+of the source at its trigger time, not the time-averaged declination
+acceptance. Sidereal time is computed analytically (IAU 1982 GMST, UT1 ~
+UTC) and the J2000 coordinates are precessed to the trigger date to first
+order, good to well below a degree for 2000-2050, so 10^5 transients
+are converted to local coordinates in one vectorized pass without
+astropy.
+
+The instantaneous effective area needs the acceptance vs zenith, while
+the rel_areas_*.json files give it vs declination (averaged over a
+sidereal day). ZenithAcceptance unfolds one into the other for the
+site latitude (non-negative least squares over equal solid angle zenith
+bins), so that averaging its instantaneous Aeff over a day gives back
+the declination acceptance.
+'''
+
+# Summit Station, Greenland, in degrees (longitude east positive)
+summit_latitude = 72.5796
+summit_longitude = -38.4592
+
+_mjd_epoch = np.datetime64('1858-11-17T00:00:00', 'us')
+_j2000_mjd = 51544.5
+
+
+def to_mjd(times):
+    """Modified Julian Date of datetime64 (or ISO string) times; floats are taken as MJD already"""
+    times = np.asarray(times)
+    if times.dtype.kind in 'fiu':
+        return times.astype(float)
+    return (times.astype('datetime64[us]') - _mjd_epoch) / np.timedelta64(86400, 's')
+
+
+def gmst(mjd):
+    """Greenwich mean sidereal time in degrees (IAU 1982)"""
+    days = np.asarray(mjd, dtype=float) - _j2000_mjd
+    centuries = days / 36525.
+    return np.mod(280.46061837 + 360.98564736629 * days
+                  + 0.000387933 * centuries**2 - centuries**3 / 38710000., 360.)
+
+
+def precess_from_j2000(ra, dec, mjd):
+    """
+    J2000 ra, dec (degrees) to the mean equator of date, to first order
+
+    Uses the annual precession m = 46.12", n = 20.04"; the error stays
+    below ~0.01 deg over 2000-2050 away from the celestial poles.
+    """
+    years = (np.asarray(mjd, dtype=float) - _j2000_mjd) / 365.25
+    ra_rad, dec_rad = np.radians(ra), np.radians(dec)
+    m, n = 46.1244 / 3600., 20.0431 / 3600.
+    cos_dec = np.maximum(np.cos(dec_rad), 1e-6)
+    d_ra = (m + n * np.sin(ra_rad) * np.sin(dec_rad) / cos_dec) * years
+    d_dec = n * np.cos(ra_rad) * years
+    return np.mod(ra + d_ra, 360.), np.clip(dec + d_dec, -90., 90.)
+
+
+def local_coordinates(ra, dec, times, latitude=summit_latitude, longitude=summit_longitude, precess=True):
+    """
+    Zenith and azimuth of sources at the given times
+
+    Parameters
+    ----------
+    ra, dec: arrays of floats
+        J2000 right ascension and declination in degrees
+
+    times: array of datetime64, ISO strings, or MJD floats
+        trigger times (UTC)
+
+    latitude, longitude: float
+        site in degrees, Summit Station by default
+
+    precess: bool
+        precess the coordinates from J2000 to the trigger date
+
+    Returns
+    -------
+    zenith, azimuth: arrays of floats
+        in degrees, azimuth east of north
+    """
+    mjd = to_mjd(times)
+    if precess:
+        ra, dec = precess_from_j2000(ra, dec, mjd)
+    hour_angle = np.radians(gmst(mjd) + longitude - ra)
+    dec_rad = np.radians(dec)
+    lat = np.radians(latitude)
+
+    cos_zenith = np.sin(lat) * np.sin(dec_rad) + np.cos(lat) * np.cos(dec_rad) * np.cos(hour_angle)
+    zenith = np.degrees(np.arccos(np.clip(cos_zenith, -1., 1.)))
+    azimuth = np.degrees(np.arctan2(-np.cos(dec_rad) * np.sin(hour_angle),
+                                    np.sin(dec_rad) * np.cos(lat) - np.cos(dec_rad) * np.sin(lat) * np.cos(hour_angle)))
+    return zenith, np.mod(azimuth, 360.)
+
+
+class ZenithAcceptance:
+    """
+    Instantaneous point-source effective area vs energy and zenith
+
+    Unfolded from a SkyAeff's declination acceptance for a site at the
+    given latitude, on equal solid angle zenith bins.
+
+    Parameters
+    ----------
+    sky_aeff: veff_dec.SkyAeff
+        the detector, e.g. veff_dec.SkyAeff.from_rnog()
+
+    latitude: float
+        site latitude in degrees
+
+    n_zenith_bins: int or None
+        number of zenith bins, as many as declination bins by default
+
+    n_dec_samples, n_hour_angles: int
+        sampling of every declination bin over a sidereal day
+
+    Attributes
+    ----------
+    zenith_bin_edges: array of floats
+        in degrees
+
+    per_steradian: array of floats
+        fraction of the all-sky Aeff per steradian in every zenith bin
+
+    residual: float
+        relative mismatch of the daily average to the declination acceptance
+    """
+    def __init__(self, sky_aeff, latitude=summit_latitude, n_zenith_bins=None,
+                 n_dec_samples=64, n_hour_angles=720):
+        from scipy.optimize import nnls
+
+        self.sky_aeff = sky_aeff
+        dec_edges = np.radians(sky_aeff.dec_bin_edges)
+        n_dec = len(dec_edges) - 1
+        n_zenith = n_dec if n_zenith_bins is None else n_zenith_bins
+        self.zenith_bin_edges = np.degrees(np.arccos(np.linspace(1., -1., n_zenith + 1)))
+
+        # fraction of a sidereal day a source in every declination bin spends in every zenith bin
+        samples = (np.arange(n_dec_samples) + 0.5) / n_dec_samples
+        sin_dec = np.sin(dec_edges[:-1])[:, np.newaxis] + np.diff(np.sin(dec_edges))[:, np.newaxis] * samples
+        hour_angle = np.linspace(-np.pi, np.pi, n_hour_angles, endpoint=False)
+        lat = np.radians(latitude)
+        cos_zenith = (np.sin(lat) * sin_dec[..., np.newaxis]
+                      + np.cos(lat) * np.sqrt(1 - sin_dec**2)[..., np.newaxis] * np.cos(hour_angle))
+        zenith = np.degrees(np.arccos(np.clip(cos_zenith, -1., 1.))).reshape(n_dec, -1)
+        zenith_index = np.clip(np.searchsorted(self.zenith_bin_edges, zenith, side='right') - 1, 0, n_zenith - 1)
+        time_fractions = np.zeros((n_dec, n_zenith))
+        np.add.at(time_fractions, (np.repeat(np.arange(n_dec), zenith.shape[1]), zenith_index.ravel()), 1.)
+        time_fractions /= zenith.shape[1]
+
+        self.per_steradian, residual = nnls(time_fractions, sky_aeff.per_steradian)
+        self.residual = residual / np.linalg.norm(sky_aeff.per_steradian)
+
+    def zenith_index(self, zenith):
+        return np.clip(np.searchsorted(self.zenith_bin_edges, zenith, side='right') - 1,
+                       0, len(self.per_steradian) - 1)
+
+    def __call__(self, energy, zenith):
+        """Instantaneous point-source effective area (m^2) at energy (eV) and zenith (deg)"""
+        return self.sky_aeff.allsky(energy) * self.per_steradian[self.zenith_index(zenith)]
+
+
+def transient_aeff(ra, dec, times, energy=1e18, acceptance=None):
+    """
+    Zenith and instantaneous RNO-G effective area of transients at Summit Station
+
+    Parameters
+    ----------
+    ra, dec: arrays of floats
+        J2000 coordinates in degrees
+
+    times: array of datetime64, ISO strings, or MJD floats
+        trigger times (UTC)
+
+    energy: float or array of floats
+        neutrino energy in eV
+
+    acceptance: ZenithAcceptance or None
+        ZenithAcceptance(veff_dec.SkyAeff.from_rnog()) by default
+
+    Returns
+    -------
+    columns: dict
+        "zenith", "azimuth" in degrees, "aeff" instantaneous effective area in m^2,
+        "aeff_average" the sidereal-day average at the source declination in m^2
+    """
+    if acceptance is None:
+        acceptance = ZenithAcceptance(veff_dec.SkyAeff.from_rnog())
+    zenith, azimuth = local_coordinates(ra, dec, times)
+    return {
+        "zenith": zenith,
+        "azimuth": azimuth,
+        "aeff": acceptance(energy, zenith),
+        "aeff_average": acceptance.sky_aeff(energy, dec),
+    }
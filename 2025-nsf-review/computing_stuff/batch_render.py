@@ -0,0 +1,117 @@
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import time
+import traceback
+
+'''
+Render a list of LimitFigure specs on a pool of worker processes
+
+Every worker is a fresh (spawned) interpreter on the Agg backend, and every
+job closes all figures and runs inside its own rc_context, so no pyplot
+state leaks from the parent or from one job into the next.
+Spawned workers re-import the calling script, so call render_batch
+from under `if __name__=="__main__":`.
+
+A spec is a dict like
+    {
+        "save_name": "limit_E2FE.png",
+        "figure": {"e_power": 2, "xlims": (1e6, 1e11), "ylims": (1e-10, 1e-5)},
+        "group": "rnog_proposal",      # optional, with "models"/"experiments"
+        "limits": [{"name": "RNOG", "energies": ..., "veffs": ..., "sup": 2.44}],
+        "title": None,                 # optional
+        "legend_size": 10,             # optional
+        "savefig": {"dpi": 300},       # optional, passed to savefig
+        "rc": {},                      # optional, matplotlib rcParams for this job
+    }
+'''
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def _render(spec):
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from limits import LimitFigure
+
+    timings = {}
+    start = time.perf_counter()
+    plt.close('all')
+    with matplotlib.rc_context(spec.get("rc", {})):
+        figure = LimitFigure(**spec.get("figure", {}))
+        figure.build_base_plot(spec.get("group", 'clean'),
+                               experiments=spec.get("experiments"), models=spec.get("models"))
+        timings["build"] = time.perf_counter() - start
+
+        tick = time.perf_counter()
+        for limit in spec.get("limits", []):
+            figure.add_limit(**limit)
+        if spec.get("title") is not None:
+            figure.title(spec["title"])
+        timings["limits"] = time.perf_counter() - tick
+
+        tick = time.perf_counter()
+        figure.show(legend_size=spec.get("legend_size", 12), save_name=spec["save_name"],
+                    **spec.get("savefig", {}))
+        timings["save"] = time.perf_counter() - tick
+        plt.close(figure.fig)
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def _run_job(spec):
+    result = {
+        "save_name": spec.get("save_name"),
+        "pid": os.getpid(),
+    }
+    try:
+        result["timings"] = _render(spec)
+        result["status"] = "ok"
+    except Exception:
+        result["status"] = "error"
+        result["error"] = traceback.format_exc()
+    return result
+
+
+def render_batch(specs, processes=None, manifest_name=None):
+    """
+    Render many figures in parallel
+
+    Parameters
+    ----------
+    specs: list of dict
+        figure specs, see the top of this file
+
+    processes: int or None
+        size of the process pool, None for one per CPU
+
+    manifest_name: str or None
+        if given, the manifest is also written there as JSON
+
+    Returns
+    -------
+    manifest: dict
+        "jobs": per spec (in order) the output name, status, worker pid and
+        timings of each stage in seconds (or the traceback on failure)
+        "processes": the pool size, "wall_time": total time in seconds
+    """
+    if processes is None:
+        processes = os.cpu_count()
+    start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                                initializer=_init_worker) as pool:
+        jobs = list(pool.map(_run_job, specs))
+    manifest = {
+        "processes": processes,
+        "wall_time": time.perf_counter() - start,
+        "jobs": jobs,
+    }
+    if manifest_name is not None:
+        with open(manifest_name, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,156 @@
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import scipy
+
+import limits
+import rnog
+from limits import LimitFigure
+
+'''
+Stage-by-stage timing of the limit figure pipeline
+
+Call like `python benchmark_limits.py results.json` to time every stage and
+store the results (plus environment info and the git commit) as JSON.
+Compare two runs, e.g. from before and after a change, with
+`python benchmark_limits.py --compare before.json after.json`.
+'''
+
+repeat = 5
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()!=''
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "backend": matplotlib.get_backend(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def time_stage(func, setup=None, number=None):
+    """
+    Time func, calling setup (untimed) before each repeat
+
+    Stages that change state (like build_base_plot) should pass number=1,
+    so every timed call starts from a fresh setup.
+
+    Returns the min and median over `repeat` runs, in seconds per call
+    """
+    if number is None:
+        number, _ = timeit.Timer(func).autorange()
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        times.append(timeit.Timer(func).timeit(number=number) / number)
+    return {"min": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def run():
+    files = sorted(glob.glob('models/*.txt') + glob.glob('experiments/*.txt'))
+    energies = rnog.veff["wp"]["energy"]
+    veffs = rnog.veff["deep_high_low_1Hz"]["veff"] * rnog.existing_livetime
+    flux = lambda e: 1e-8 * e**-2
+
+    stages = {}
+
+    stages["read_data_parse"] = time_stage(
+        lambda: [LimitFigure._read_data(f, use_cache=False) for f in files])
+    stages["read_data_cached"] = time_stage(
+        lambda: [LimitFigure._read_data(f) for f in files])
+
+    figure = LimitFigure()
+    raw = [LimitFigure._read_data(f, use_cache=False) for f in files]
+    stages["get_data_convert"] = time_stage(
+        lambda: [figure._convert_data(e.copy(), f.copy(), lo.copy(), hi.copy(), m)
+                 for e, f, lo, hi, m in raw])
+    plt.close(figure.fig)
+
+    stages["calculate_flux"] = time_stage(lambda: limits.calculate_flux(energies, veffs))
+    stages["count_neutrinos"] = time_stage(lambda: limits.count_neutrinos(flux, energies, veffs))
+
+    def new_figure():
+        plt.close('all')
+        return LimitFigure(e_power=2, xlims=(1e6, 1e11), ylims=(1e-10, 1e-5))
+    stages["figure_create"] = time_stage(new_figure)
+
+    state = {}
+    def setup_figure():
+        state["figure"] = new_figure()
+    stages["build_base_plot"] = time_stage(
+        lambda: state["figure"].build_base_plot('rnog_proposal'), setup=setup_figure, number=1)
+
+    figure = new_figure()
+    figure.build_base_plot('rnog_proposal')
+    figure.add_limit('RNOG', energies, veffs)
+    figure.show()
+    for fmt, dpi in (('png', 300), ('pdf', 300)):
+        stages["savefig_"+fmt] = time_stage(
+            lambda: figure.fig.savefig(io.BytesIO(), format=fmt, dpi=dpi))
+    plt.close('all')
+
+    return {"environment": environment(), "stages": stages}
+
+
+def compare(before, after):
+    with open(before) as f:
+        old = json.load(f)
+    with open(after) as f:
+        new = json.load(f)
+    print("before: {} ({})".format(old["environment"]["commit"], before))
+    print("after:  {} ({})".format(new["environment"]["commit"], after))
+    print("{:>20} {:>12} {:>12} {:>8}".format("stage", "before [s]", "after [s]", "ratio"))
+    for stage in old["stages"]:
+        if stage not in new["stages"]:
+            continue
+        t_old = old["stages"][stage]["min"]
+        t_new = new["stages"][stage]["min"]
+        print("{:>20} {:>12.3e} {:>12.3e} {:>8.2f}".format(stage, t_old, t_new, t_new/t_old))
+
+
+if __name__=="__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the limit figure pipeline")
+    parser.add_argument('output', nargs='?', default=None, help="JSON file to write the results to")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        compare(*args.compare)
+        sys.exit(0)
+
+    output = None if args.output is None else os.path.abspath(args.output)
+    # data files are looked up relative to this folder
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    results = run()
+    for stage, timing in results["stages"].items():
+        print("{:>20} {:>12.3e} s".format(stage, timing["min"]))
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
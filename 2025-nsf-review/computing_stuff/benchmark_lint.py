@@ -0,0 +1,44 @@
+import timeit
+
+import numpy as np
+
+import limits
+
+'''
+Compare the per-energy loop that calculate_flux used to run
+against the batched get_average_lint, at a few energy grid sizes.
+Call like `python benchmark_lint.py`.
+'''
+
+def looped_average_lint(energies):
+    int_len = np.zeros(len(energies))
+    for i, e in enumerate(energies):
+        int_len[i] = limits.get_average_lint(e)
+    return int_len
+
+
+def time_call(func, energies):
+    timer = timeit.Timer(lambda: func(energies))
+    number, elapsed = timer.autorange()
+    if number==1:
+        # a single call already takes a while (the 10^6 loop), don't repeat it
+        return elapsed
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+if __name__=="__main__":
+
+    sizes = [10, 10**4, 10**6]
+
+    print("{:>10} {:>14} {:>14} {:>10}".format("energies", "loop [s]", "batched [s]", "speedup"))
+    for n in sizes:
+        energies = np.logspace(4, 12, n)
+
+        looped = looped_average_lint(energies)
+        batched = limits.get_average_lint(energies)
+        if not np.allclose(looped, batched, rtol=1e-12, atol=0):
+            raise RuntimeError("Batched interaction lengths differ from the looped ones")
+
+        t_loop = time_call(looped_average_lint, energies)
+        t_batch = time_call(limits.get_average_lint, energies)
+        print("{:>10} {:>14.3e} {:>14.3e} {:>10.1f}".format(n, t_loop, t_batch, t_loop/t_batch))
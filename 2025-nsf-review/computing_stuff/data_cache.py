@@ -0,0 +1,102 @@
+import functools
+import json
+import os
+
+import numpy as np
+
+'''
+Persistent cache for the parsed files in models/ and experiments/
+
+The parsed (unit converted) arrays and the meta dict of every text file
+are stored next to it in a binary sidecar (<file>.cache.npz), stamped with
+the size and mtime of the text file. An in-process LRU sits in front of
+the sidecars, so repeated figures don't even touch the disk.
+Editing the text file changes its size/mtime, which invalidates both.
+'''
+
+cache_version = 1
+sidecar_suffix = '.cache.npz'
+lru_size = 128
+
+_array_keys = ('energies', 'fluxes', 'band_min', 'band_max')
+
+
+def sidecar_path(file):
+    return file + sidecar_suffix
+
+
+def _read_sidecar(sidecar, size, mtime_ns):
+    """
+    Read a sidecar, returning None if it is missing, stale or unreadable
+    """
+    try:
+        with np.load(sidecar, allow_pickle=False) as npz:
+            stamp = npz['stamp']
+            if (stamp[0]!=cache_version or stamp[1]!=size or stamp[2]!=mtime_ns):
+                return None
+            arrays = tuple(npz[key] for key in _array_keys)
+            meta = json.loads(str(npz['meta']))
+    except (OSError, KeyError, ValueError):
+        return None
+    return arrays + (meta,)
+
+
+def _write_sidecar(sidecar, size, mtime_ns, data):
+    """
+    Write a sidecar atomically, silently skipping it if the folder is read-only
+    """
+    tmp = '{}.{}.tmp'.format(sidecar, os.getpid())
+    arrays = dict(zip(_array_keys, data[:4]))
+    try:
+        with open(tmp, 'wb') as f:
+            np.savez(f,
+                     stamp=np.array([cache_version, size, mtime_ns], dtype=np.int64),
+                     meta=np.array(json.dumps(data[4])),
+                     **arrays)
+        os.replace(tmp, sidecar)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=lru_size)
+def _load(path, size, mtime_ns, parse):
+    sidecar = sidecar_path(path)
+    data = _read_sidecar(sidecar, size, mtime_ns)
+    if data is None:
+        data = parse(path)
+        _write_sidecar(sidecar, size, mtime_ns, data)
+    # these are shared between callers, so guard them against in-place edits
+    for array in data[:4]:
+        array.setflags(write=False)
+    return data
+
+
+def load(file, parse):
+    """
+    Load a parsed data file through the LRU and the on-disk sidecar
+
+    Parameters
+    ----------
+    file: str
+        path to the text file
+
+    parse: callable
+        parser used on a cache miss, called as parse(path) and returning
+        (energies, fluxes, band_min, band_max, meta)
+
+    Returns
+    -------
+    energies, fluxes, band_min, band_max, meta
+        the arrays are read-only and shared, copy them before modifying
+    """
+    path = os.path.abspath(file)
+    stat = os.stat(path)
+    return _load(path, stat.st_size, stat.st_mtime_ns, parse)
+
+
+def clear():
+    """Empty the in-process LRU (the sidecars on disk are kept)"""
+    _load.cache_clear()
@@ -0,0 +1,320 @@
+import concurrent.futures
+import os
+
+'''
+Manifest of the models/ and experiments/ data sets that LimitFigure can draw
+
+Every entry is a list of layers drawn in order, plus (for experiments)
+the annotations placed for a given e_power. Layer kinds:
+    line:    ax.plot of the flux column
+    band:    ax.fill_between of the band minimum/maximum columns
+    i3_data: the IceCube HESE data points (with upper limits)
+    i3_fit:  the IceCube power law fit and its uncertainty band
+Layers with "legend": True go into the neutrino model legend.
+Annotations with "per_bin": True have their y position scaled by the
+figure's energy bins per decade; "e_power": None means any e_power.
+'''
+
+_ice_cube_label = [
+    {"e_power": 2, "text": "IceCube", "xy": (3e6, 5e-8), "per_bin": False,
+     "style": {"xycoords": "data", "horizontalalignment": "center", "color": "dodgerblue", "rotation": 0}},
+    {"e_power": 1, "text": "IceCube", "xy": (1.3e7, 2.5e-15), "per_bin": False,
+     "style": {"xycoords": "data", "horizontalalignment": "center", "color": "dodgerblue", "rotation": 0, "fontsize": 12}},
+]
+
+models = {
+    "heinze": {
+        "layers": [
+            {"kind": "line", "file": "models/heinze_cr.txt", "legend": True,
+             "style": {"color": "black", "linestyle": "-.", "label": r"Best fit, Heinze et al."}},
+        ],
+    },
+    "van_vliet": {
+        "layers": [
+            {"kind": "line", "file": "models/van_vliet_10.txt", "legend": True,
+             "style": {"color": "orchid", "linestyle": "-.", "label": r"10% protons, van Vliet et al."}},
+        ],
+    },
+    "ahlers": {
+        "layers": [
+            {"kind": "line", "file": "models/ahlers_100.txt", "legend": True,
+             "style": {"color": "mediumblue", "linestyle": "-.", "label": r"100% protons, Ahlers & Halzen"}},
+            {"kind": "line", "file": "models/ahlers_10.txt", "legend": True,
+             "style": {"color": "royalblue", "linestyle": "-.", "label": r"10% protons, Ahlers & Halzen"}},
+        ],
+    },
+    "kotera": {
+        "layers": [
+            {"kind": "band", "file": "models/kotera_band.txt", "legend": True,
+             "style": {"color": "cornflowerblue", "alpha": 0.25, "label": r"UHECR, Olinto et al."}},
+            {"kind": "line", "file": "models/kotera_high_e.txt", "legend": True, # (1009.1382)
+             "style": {"color": "darkblue", "linestyle": "--", "label": r"SFR $E_{max}=10^{21.5}$, Kotera et al."}},
+        ],
+    },
+    "fang_merger": {
+        "layers": [
+            {"kind": "line", "file": "models/fang_ns_merger.txt", "legend": True, # (1707.04263)
+             "style": {"color": "palevioletred", "linestyle": (0, (3, 5, 1, 5)), "label": "NS-NS merger, Fang & Metzger"}},
+        ],
+    },
+    "fang_pulsar": {
+        "layers": [
+            {"kind": "band", "file": "models/fang_pulsar.txt", "legend": True, # (1311.2044)
+             "style": {"color": "pink", "alpha": 0.5, "label": "Pulsar, Fang et al."}},
+        ],
+    },
+    "fang_cluster": {
+        "layers": [
+            {"kind": "line", "file": "models/fang_cluster.txt", "legend": True, # (1704.00015)
+             "style": {"color": "mediumvioletred", "zorder": 1, "linestyle": (0, (5, 10)), "label": "Clusters, Fang & Murase"}},
+        ],
+    },
+    "biehl": {
+        "layers": [
+            {"kind": "band", "file": "models/biehl_tde.txt",
+             "style": {"color": "thistle", "alpha": 0.5}},
+            {"kind": "line", "file": "models/biehl_tde.txt", "legend": True, # (1711.03555)
+             "style": {"color": "darkmagenta", "linestyle": ":", "zorder": 1, "label": "TDE, Biehl et al."}},
+        ],
+    },
+    "boncioli": {
+        "layers": [
+            {"kind": "band", "file": "models/boncioli_llgrb.txt",
+             "style": {"color": "0.8"}},
+            {"kind": "line", "file": "models/boncioli_llgrb.txt", "legend": True, # (1808.07481)
+             "style": {"linestyle": "-.", "c": "k", "zorder": 1, "label": "LLGRB, Boncioli et al."}},
+        ],
+    },
+    "murase_agn": {
+        "layers": [
+            {"kind": "line", "file": "models/murase_agn.txt", "legend": True, # (1511.01590)
+             "style": {"color": "red", "linestyle": "--", "label": "AGN, Murase"}},
+        ],
+    },
+    "murase_grb": {
+        "layers": [ # (0707.1140)
+            {"kind": "line", "file": "models/murase_grb_late_prompt.txt", "legend": True,
+             "style": {"color": "saddlebrown", "linestyle": "-.", "label": "GRB afterglow-late prompt, Murase"}},
+            {"kind": "line", "file": "models/murase_grb_wind.txt", "legend": True,
+             "style": {"color": "goldenrod", "linestyle": "-.", "label": "GRB afterglow-wind, Murase"}},
+            {"kind": "line", "file": "models/murase_grb_ism.txt", "legend": True,
+             "style": {"color": "gold", "linestyle": "-.", "label": "GRB afterglow-ISM, Murase"}},
+        ],
+    },
+}
+
+experiments = {
+    "grand_10k": {
+        "layers": [
+            {"kind": "line", "file": "experiments/grand_10k.txt",
+             "style": {"color": "saddlebrown", "linestyle": "--"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "GRAND 10k", "xy": (1e10, 5e-8), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "saddlebrown", "rotation": 40}},
+            {"e_power": 1, "text": "GRAND 10k", "xy": (2e9, 5e-18), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "saddlebrown", "rotation": -10}},
+        ],
+    },
+    "grand_200k": {
+        "layers": [
+            {"kind": "line", "file": "experiments/grand_200k.txt",
+             "style": {"color": "saddlebrown", "linestyle": "--"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "GRAND 200k", "xy": (1e10, 3e-9), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "saddlebrown", "rotation": 40}},
+        ],
+    },
+    "radar": {
+        "layers": [
+            {"kind": "band", "file": "experiments/radar.txt",
+             "style": {"facecolor": "None", "edgecolor": "0.8", "hatch": "x"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "Radar", "xy": (1e9, 3e-8), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "0.7", "rotation": 45}},
+        ],
+    },
+    "ice_cube_ehe": {
+        "layers": [
+            {"kind": "line", "file": "experiments/ice_cube_ehe.txt",
+             "style": {"color": "grey"}},
+        ],
+        "annotations": _ice_cube_label + [
+            {"e_power": None, "text": "IceCube", "xy": (1e7, 0.95e-8), "per_bin": False,
+             "style": {"xycoords": "data", "horizontalalignment": "center", "color": "gray", "rotation": 17}},
+        ],
+    },
+    "ice_cube_hese_data": {
+        "layers": [
+            {"kind": "i3_data", "file": "experiments/ice_cube_hese.txt", "scale": 3,
+             "style": {"color": "dodgerblue", "marker": "o", "ecolor": "dodgerblue", "linestyle": "None"}},
+        ],
+        "annotations": _ice_cube_label,
+    },
+    "ice_cube_hese_fit": {
+        "layers": [
+            {"kind": "i3_fit", "range": "hese", "fit": {"offset": 2.46, "slope": -2.92},
+             "band_style": {"hatch": "\\", "edgecolor": "dodgerblue", "facecolor": "azure"},
+             "style": {"color": "dodgerblue"}},
+        ],
+        "annotations": _ice_cube_label,
+    },
+    "ice_cube_mu_fit": {
+        "layers": [
+            {"kind": "i3_fit", "range": "mu", "fit": {"offset": 1.01, "slope": -2.19},
+             "band_style": {"edgecolor": "dodgerblue", "facecolor": "azure"},
+             "style": {"color": "dodgerblue"}},
+        ],
+        "annotations": _ice_cube_label,
+    },
+    "anita": {
+        "layers": [
+            {"kind": "line", "file": "experiments/anita.txt",
+             "style": {"color": "darkorange"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "ANITA I - III", "xy": (2e9, 5e-6), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "darkorange"}},
+            {"e_power": 1, "text": "ANITA I - III", "xy": (3e9, 1e-15), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "darkorange"}},
+        ],
+    },
+    "anitaiv": {
+        "layers": [
+            {"kind": "line", "file": "experiments/anita_iv.txt",
+             "style": {"color": "grey"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "ANITA I - IV", "xy": (4e9, 5e-6), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey"}},
+            {"e_power": 1, "text": "ANITA I - IV", "xy": (2e9, 1e-14), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "fontsize": 12}},
+        ],
+    },
+    "auger": {
+        "layers": [
+            {"kind": "line", "file": "experiments/auger.txt",
+             "style": {"color": "grey"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "Auger", "xy": (1.2e8, 1.1e-7), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": -40}},
+            {"e_power": 1, "text": "Auger", "xy": (3e10, 9.5e-18), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": -8, "fontsize": 12}},
+        ],
+    },
+    "auger_2019": {
+        "layers": [
+            {"kind": "line", "file": "experiments/auger_2019.txt",
+             "style": {"color": "grey"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "Auger", "xy": (4e7, 5e-8), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": -40}},
+            {"e_power": 1, "text": "Auger", "xy": (5e7, 2e-15), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": 0, "fontsize": 12}},
+        ],
+    },
+    "arianna": {
+        "layers": [
+            {"kind": "line", "file": "experiments/arianna.txt", "scale": 2.,
+             "style": {"color": "grey"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "ARIANNA (7x3yr)", "xy": (1.2e8, 1.1e-7), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": -40}},
+            {"e_power": 1, "text": "ARIANNA (7x3yr)", "xy": (5e9, 8.7e-17), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": -25, "fontsize": 12}},
+        ],
+    },
+    "arianna_2019": {
+        "layers": [
+            {"kind": "line", "file": "experiments/arianna_2019.txt", "scale": 2.,
+             "style": {"color": "grey"}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "ARIANNA (7x4.5yr)", "xy": (6.8e9, 1.9e-6), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": 20}},
+            {"e_power": 1, "text": "ARIANNA (7x4.5yr)", "xy": (3.6e9, 9.6e-17), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": -26, "fontsize": 12}},
+        ],
+    },
+    "ara_a23": {
+        "layers": [
+            {"kind": "line", "file": "experiments/ara_a23.txt",
+             "style": {"color": "grey", "linewidth": 1.0}},
+        ],
+        "annotations": [
+            {"e_power": 2, "text": "ARA2 (2x4yr)", "xy": (1.4e10, 5.1e-7), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "grey", "rotation": 15}},
+            {"e_power": 1, "text": "ARA (2x4yr)", "xy": (3e8, 15.5e-17), "per_bin": True,
+             "style": {"xycoords": "data", "horizontalalignment": "left", "color": "purple", "rotation": -41}},
+        ],
+    },
+}
+
+class DatasetRegistry:
+    """
+    Name -> manifest entry lookup, with the data files loaded on use
+
+    The registry keeps no data itself: every load goes through the loader,
+    which for LimitFigure is backed by data_cache (keyed on the size and
+    mtime of the file), so edited files are picked up without a restart.
+
+    Parameters
+    ----------
+    manifest: dict
+        data set name -> entry, e.g. datasets.models; the files are paths
+        relative to the working directory (e.g. 'models/heinze_cr.txt')
+
+    loader: callable
+        loader(file) returns (energies, fluxes, band_min, band_max, meta),
+        as arrays the caller may modify
+    """
+    def __init__(self, manifest, loader):
+        self.manifest = dict(manifest)
+        self.loader = loader
+
+    def __contains__(self, name):
+        return name in self.manifest
+
+    def entry(self, name):
+        """Return the manifest entry of a data set"""
+        try:
+            return self.manifest[name]
+        except KeyError:
+            raise ValueError("Unrecognized data set '"+str(name)+"'") from None
+
+    def load(self, file):
+        """Return the data of one file (see loader)"""
+        return self.loader(file)
+
+    def files(self, names=None):
+        """All data files used by the given data sets (default: the whole manifest)"""
+        if names is None:
+            names = list(self.manifest)
+        files = []
+        for name in names:
+            for layer in self.entry(name)["layers"]:
+                if "file" in layer and layer["file"] not in files:
+                    files.append(layer["file"])
+        return files
+
+    def preload(self, names=None, max_workers=None):
+        """
+        Load the data of many data sets at once on a thread pool,
+        which warms the loader's cache for the figures drawn afterwards
+
+        Files that don't exist (e.g. experiments/anita.txt) are skipped.
+
+        Returns
+        -------
+        loaded: list of str
+            the files that were loaded
+        """
+        files = [f for f in self.files(names) if os.path.isfile(f)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(self.load, files))
+        return files
@@ -0,0 +1,168 @@
+import numpy as np
+
+'''
+Columnar livetime ledger: one row per (station, day, trigger) with the
+seconds of livetime, e.g. from the per-run livetime export.
+
+Rows are kept sorted by (station, trigger, day) together with a running
+sum of the seconds, so the livetime of one station/trigger in a date range
+is two binary searches and a subtraction. Ledgers can be saved as .npy
+and loaded memory-mapped, so large multi-season ledgers don't have to be
+read into memory.
+'''
+
+triggers = {
+    "hilo": 0,
+    "pa": 1,
+    "didaq": 2,
+}
+
+ledger_dtype = np.dtype([
+    ("station", np.int16),
+    ("trigger", np.int8),
+    ("day", "datetime64[D]"),
+    ("seconds", np.float64),
+    ("cumulative", np.float64), # running sum of seconds over the sorted ledger, inclusive
+])
+
+seconds_per_day = 24 * 60 * 60
+
+
+def _station_id(station):
+    """'s23' or 23 -> 23"""
+    if isinstance(station, str):
+        station = station.lstrip('s')
+    return int(station)
+
+
+def _trigger_ids(trigger):
+    if trigger is None:
+        return list(triggers.values())
+    if trigger not in triggers:
+        raise ValueError("Unknown trigger '"+str(trigger)+"', options are "+str(list(triggers)))
+    return [triggers[trigger]]
+
+
+class Ledger:
+    """
+    Per-station, per-day, per-trigger livetime
+
+    Parameters
+    ----------
+    records: structured array of ledger_dtype
+        sorted by (station, trigger, day), with the cumulative column filled,
+        as made by from_records or load
+    """
+    def __init__(self, records):
+        self.records = records
+        # plain views of the (possibly memory-mapped) columns, np.memmap indexing is slow
+        self._days = records["day"].view(np.ndarray)
+        self._cumulative = records["cumulative"].view(np.ndarray)
+
+        # row range, days and preceding cumulative livetime of every (station, trigger) group
+        keys = records["station"].astype(np.int32) * 256 + records["trigger"]
+        starts = np.flatnonzero(np.diff(keys)) + 1
+        starts = np.concatenate([[0], starts]) if len(records) else starts
+        stops = np.append(starts[1:], len(records))
+        self._groups = {}
+        for a, b in zip(starts, stops):
+            a, b = int(a), int(b)
+            key = (int(records["station"][a]), int(records["trigger"][a]))
+            self._groups[key] = (a, b, self._days[a:b], self._before(a))
+
+    @classmethod
+    def from_records(cls, rows):
+        """
+        Build a ledger from (station, date, trigger, seconds) rows in any order
+
+        station as 23 or 's23', date as 'YYYY-MM-DD', trigger as in `triggers`
+        """
+        records = np.zeros(len(rows), dtype=ledger_dtype)
+        if len(rows):
+            stations, dates, trigs, seconds = zip(*rows)
+            records["station"] = [_station_id(s) for s in stations]
+            records["trigger"] = [_trigger_ids(t)[0] for t in trigs]
+            records["day"] = np.array(dates, dtype="datetime64[D]")
+            records["seconds"] = seconds
+        records = records[np.lexsort((records["day"], records["trigger"], records["station"]))]
+        records["cumulative"] = np.cumsum(records["seconds"])
+        return cls(records)
+
+    def save(self, path):
+        np.save(path, self.records)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a ledger written by save, memory-mapped by default"""
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    def stations(self):
+        return sorted({station for station, _ in self._groups})
+
+    def _before(self, index):
+        """Summed seconds of all rows before the given row indices"""
+        if np.ndim(index)==0:
+            index = int(index)
+            return float(self._cumulative[index-1]) if index > 0 else 0.
+        index = np.asarray(index)
+        return np.where(index > 0, self._cumulative[np.maximum(index - 1, 0)], 0.)
+
+    def cumulative(self, station, trigger=None, dates=None):
+        """
+        Livetime (seconds) of a station accumulated before each date
+
+        Parameters
+        ----------
+        station: int or str
+            e.g. 23 or 's23'
+
+        trigger: str or None
+            'hilo', 'pa', 'didaq', or None for all triggers
+
+        dates: array of dates (datetime64 or 'YYYY-MM-DD'), or None
+            dates (exclusive) to evaluate at; None gives the total
+
+        Returns
+        -------
+        livetime: float or array of floats
+        """
+        station = _station_id(station)
+        scalar = dates is None or np.ndim(dates) == 0
+        if dates is not None:
+            dates = np.datetime64(dates, 'D') if scalar else np.asarray(dates, dtype="datetime64[D]")
+        total = 0.
+        for trigger_id in _trigger_ids(trigger):
+            group = self._groups.get((station, trigger_id))
+            if group is None:
+                continue
+            start, stop, days, offset = group
+            index = stop if dates is None else start + days.searchsorted(dates)
+            total = total + self._before(index) - offset
+        return total if scalar else np.zeros(dates.shape) + total
+
+    def livetime(self, station=None, trigger=None, start=None, stop=None):
+        """
+        Livetime (seconds) in the date range [start, stop)
+
+        Parameters
+        ----------
+        station: int, str or None
+            e.g. 23 or 's23', None for all stations
+
+        trigger: str or None
+            'hilo', 'pa', 'didaq', or None for all triggers
+
+        start, stop: datetime64, 'YYYY-MM-DD' or None
+            open ended if None
+        """
+        stations = self.stations() if station is None else [station]
+        total = 0.
+        for s in stations:
+            total += self.cumulative(s, trigger, stop)
+            if start is not None:
+                total -= self.cumulative(s, trigger, start)
+        return total
+
+    def station_days(self, trigger=None):
+        """Total livetime per station in days, as {'s11': days, ...}"""
+        return {"s{}".format(s): self.livetime(s, trigger) / seconds_per_day for s in self.stations()}
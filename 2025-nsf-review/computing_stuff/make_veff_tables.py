@@ -0,0 +1,85 @@
+import numpy as np
+
+import veff_store
+
+'''
+Source of veff_tables.npz, the Veff store read by rnog.py, limits.py and make_plots
+here and by the rnog.py of 2024-pa-proposal/limit and 2025-nsf-proposal/computing_stuff
+
+The tables below are the literals that used to live in those rnog.py files.
+To add or update a table, edit it here, bump version, and rerun
+`python make_veff_tables.py` to rewrite veff_tables.npz.
+'''
+
+version = "2025-nsf-review-v2"
+
+steradian = 4 * np.pi
+tables = {
+    "wp" : {
+        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
+        "veff": np.array([4.24E-03, 2.76E-02, 1.14E-01, 3.05E-01, 6.56E-01, 1.15E+00, 1.70E+00, 2.15E+00])*steradian
+    },
+    "deep_high_low_1Hz" : {
+        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
+        "veff": np.array([3.896e-04,  3.842e-03,  2.220e-02,  9.383e-02,  2.907e-01, 7.191e-01,  1.965e+00,  3.486e+00])*steradian
+    },
+    "simple_threshold_2" : {
+        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
+        "veff": np.array([3.586e-03,  2.327e-02,  8.989e-02,  2.771e-01,  7.419e-01,1.541e+00,  3.338e+00,  5.682e+00])*steradian
+    },
+    "simple_threshold_2.5" : {
+        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
+        "veff": np.array([2.284e-03,  1.679e-02,  6.545e-02,  2.190e-01,  6.244e-01, 1.311e+00,  2.894e+00,  5.113e+00])*steradian
+    },
+    "simple_threshold_2.5_downsampled" : {
+        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
+        "veff": np.array([1.605e-03,  1.168e-02,  5.175e-02,  1.876e-01,  5.345e-01, 1.171e+00,  2.689e+00,  4.774e+00])*steradian
+    },
+    "simple_threshold_3_downsampled" : {
+        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
+        "veff": np.array([1.146e-03,  9.014e-03,  4.066e-02,  1.569e-01,  4.493e-01, 1.037e+00,  2.417e+00,  4.413e+00])*steradian
+    },
+    # the tables of 2025-nsf-proposal
+    "hilo" : {
+        "energy" : 10**np.array([16.0, 16.5, 17.0, 17.5, 
+                                 18.0, 18.5, 19.0, 19.5, 
+                                 20.0, 20.5, 21.0])/1E9,
+        "veff": np.array([5.07161981726308E-05, 6.10821140578283E-04, 4.40799764153179E-03, 2.63275189228185E-02, 
+                          1.07360092009057E-01, 3.47613010768232E-01, 9.69779744928276E-01, 2.64979577734877E+00,
+                          4.92403818243416E+00, 9.64007611958286E+00, 1.48490226038343E+01])*steradian
+    },
+    "pa" : {
+        "energy" : 10**np.array([16.0, 16.5, 17.0, 17.5, 
+                                 18.0, 18.5, 19.0, 19.5, 
+                                 20.0, 20.5, 21.0])/1E9,
+        "veff": np.array([1.44618202588028E-04, 1.34056609936527E-03, 1.02062260137554E-02, 5.19510413328914E-02,
+                          1.84524121183946E-01, 5.47931496040555E-01, 1.45005147650225E+00, 3.66604275817319E+00,
+                          6.56525389717405E+00, 1.21510388635034E+01, 1.74386690726701E+01])*steradian
+    },
+    "didaq" : {
+        "energy" : 10**np.array([16.0, 16.5, 17.0, 17.5, 
+                                 18.0, 18.5, 19.0, 19.5, 
+                                 20.0, 20.5, 21.0])/1E9,
+        "veff": np.array([1.91569204795727E-04, 1.70543857875877E-03, 1.31053401998672E-02, 6.47628025379279E-02,
+                          2.23106135771391E-01, 6.48090738676717E-01, 1.69018734228923E+00, 4.1741662485854E+00,
+                          7.38586175454399E+00, 1.34065202354636E+01, 1.8733492307088E+01])*steradian
+    },
+
+}
+
+metadata = {
+    "wp": {"trigger": None, "threshold": None, "downsampled": False, "production": "white paper"},
+    "deep_high_low_1Hz": {"trigger": "deep high/low", "threshold": "1 Hz", "downsampled": False, "production": None},
+    "simple_threshold_2": {"trigger": "simple threshold", "threshold": 2.0, "downsampled": False, "production": None},
+    "simple_threshold_2.5": {"trigger": "simple threshold", "threshold": 2.5, "downsampled": False, "production": None},
+    "simple_threshold_2.5_downsampled": {"trigger": "simple threshold", "threshold": 2.5, "downsampled": True, "production": None},
+    "simple_threshold_3_downsampled": {"trigger": "simple threshold", "threshold": 3.0, "downsampled": True, "production": None},
+    "hilo": {"trigger": "deep high/low", "threshold": None, "downsampled": False, "production": "2025 NSF proposal"},
+    "pa": {"trigger": "phased array", "threshold": None, "downsampled": False, "production": "2025 NSF proposal"},
+    "didaq": {"trigger": "deep high/low + phased array", "threshold": None, "downsampled": False, "production": "2025 NSF proposal"},
+}
+
+
+if __name__=="__main__":
+    veff_store.save(veff_store.default_store, tables, version, metadata)
+    print("Wrote", len(tables), "tables (version "+version+") to", veff_store.default_store)
@@ -1,21 +1,34 @@
 import numpy as np
 
+import livetime
+import veff_store
+
+'''
+Livetime ledger (station, day, trigger, seconds), see livetime.py
+
+Until the per-day export is in, every station has one Hi/Lo row
+holding its total accumulated livetime through the 2024 season.
+Larger ledgers can be saved and loaded memory-mapped with
+livetime.Ledger.save/load.
 '''
-List of accumulated livetime *in years*
+livetime_ledger = livetime.Ledger.from_records([
+    ("s11", "2024-12-31", "hilo", 375 * livetime.seconds_per_day),
+    ("s12", "2024-12-31", "hilo", 161 * livetime.seconds_per_day),
+    ("s13", "2024-12-31", "hilo", 333 * livetime.seconds_per_day),
+    ("s14", "2024-12-31", "hilo", 0 * livetime.seconds_per_day),
+    ("s21", "2024-12-31", "hilo", 346 * livetime.seconds_per_day),
+    ("s22", "2024-12-31", "hilo", 176 * livetime.seconds_per_day),
+    ("s23", "2024-12-31", "hilo", 317 * livetime.seconds_per_day),
+    ("s24", "2024-12-31", "hilo", 323 * livetime.seconds_per_day),
+])
+
+'''
+List of accumulated livetime *in years*, derived from the ledger
 '''
 days_to_years = 1./365.
 available_livetime = {
-    "s11" : 375,
-    "s12" : 161,
-    "s13" : 333,
-    "s14" : 0,
-    "s21" : 346,
-    "s22" : 176,
-    "s23" : 317,
-    "s24" : 323
+    station: days * days_to_years for station, days in livetime_ledger.station_days().items()
 }
-for l in available_livetime:
-    available_livetime[l] = available_livetime[l]*days_to_years
 
 existing_livetime = 0.
 for k in available_livetime.keys():
@@ -24,35 +37,10 @@ for k in available_livetime.keys():
 
 
 '''
-    Effective volumes
+    Effective volumes, from the Veff store (veff_store.py, veff_tables.npz)
     energy in GeV
     veff in km^3 sr
 '''
 steradian = 4 * np.pi
-veff = {
-    "wp" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([4.24E-03, 2.76E-02, 1.14E-01, 3.05E-01, 6.56E-01, 1.15E+00, 1.70E+00, 2.15E+00])*steradian
-    },
-    "deep_high_low_1Hz" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([3.896e-04,  3.842e-03,  2.220e-02,  9.383e-02,  2.907e-01, 7.191e-01,  1.965e+00,  3.486e+00])*steradian
-    },
-    "simple_threshold_2" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([3.586e-03,  2.327e-02,  8.989e-02,  2.771e-01,  7.419e-01,1.541e+00,  3.338e+00,  5.682e+00])*steradian
-    },
-    "simple_threshold_2.5" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([2.284e-03,  1.679e-02,  6.545e-02,  2.190e-01,  6.244e-01, 1.311e+00,  2.894e+00,  5.113e+00])*steradian
-    },
-    "simple_threshold_2.5_downsampled" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([1.605e-03,  1.168e-02,  5.175e-02,  1.876e-01,  5.345e-01, 1.171e+00,  2.689e+00,  4.774e+00])*steradian
-    },
-    "simple_threshold_3_downsampled" : {
-        "energy" : 10**np.array([16.50, 17.00, 17.50, 18.00, 18.50, 19.00, 19.50, 20])/1E9,
-        "veff": np.array([1.146e-03,  9.014e-03,  4.066e-02,  1.569e-01,  4.493e-01, 1.037e+00,  2.417e+00,  4.413e+00])*steradian
-    },
-
-}
+veff_tables = veff_store.get_store()
+veff = {name: veff_tables.table(name) for name in veff_tables.names()}
@@ -0,0 +1,99 @@
+import matplotlib.image
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from limits import LimitFigure
+
+'''
+Fast rendering of many RNO-G limit scenarios on the same base plot
+
+The models/experiments layer of build_base_plot never changes between
+scenarios, so it is rendered once per figure setup (limits, e_power,
+figsize, dpi, ...) and cached as a raster. Every scenario restores that
+raster and only draws its own limit curves on top (blitting).
+Only raster output (PNG) can be made this way; use LimitFigure.show
+for PDFs.
+'''
+
+_base_layers = {}
+
+
+def _get_base_layer(dpi, group, experiments, models, legend_size, figure_kwargs):
+    key = (dpi, group,
+           None if experiments is None else tuple(experiments),
+           None if models is None else tuple(models),
+           legend_size, repr(sorted(figure_kwargs.items())))
+    if key not in _base_layers:
+        figure = LimitFigure(**figure_kwargs)
+        figure.build_base_plot(group, experiments=experiments, models=models)
+        figure.show(legend_size=legend_size)
+        # keep the cached figure away from pyplot's current-figure state
+        plt.close(figure.fig)
+        FigureCanvasAgg(figure.fig)
+        figure.fig.set_dpi(dpi)
+        figure.fig.canvas.draw()
+        background = figure.fig.canvas.copy_from_bbox(figure.fig.bbox)
+        _base_layers[key] = (figure, background)
+    return _base_layers[key]
+
+
+def clear_base_layers():
+    """Forget all cached base layers"""
+    _base_layers.clear()
+
+
+def render_scenario(limits, save_name=None, dpi=100, group='rnog_proposal',
+                    experiments=None, models=None, legend_size=12, compress_level=1,
+                    **figure_kwargs):
+    """
+    Render one scenario (a set of limit curves) over a cached base plot
+
+    Parameters
+    ----------
+    limits: list of dict
+        keyword arguments of LimitFigure.add_limit for every curve
+        (energies, veffs, stations, years, sup, color, linestyle)
+
+    save_name: str or None
+        PNG file to write, if any
+
+    dpi: int
+        resolution of the raster
+
+    group, experiments, models:
+        passed to LimitFigure.build_base_plot
+
+    legend_size: int
+        font size of the model legend, as in LimitFigure.show
+
+    compress_level: int
+        PNG compression (0-9); encoding dominates at high dpi, so default to fast
+
+    **figure_kwargs:
+        passed to LimitFigure (xlims, ylims, e_power, figsize, ...)
+
+    Returns
+    -------
+    image: array of uint8, shape (height, width, 4)
+        the rendered RGBA image
+    """
+    figure, background = _get_base_layer(dpi, group, experiments, models, legend_size, figure_kwargs)
+    canvas = figure.fig.canvas
+    canvas.restore_region(background)
+
+    for i, limit in enumerate(limits):
+        energies, fluxes = figure.get_limit(limit["energies"], limit["veffs"],
+                                            limit.get("stations", 1), limit.get("years", 1),
+                                            sup=limit.get("sup", 2.44))
+        line, = figure.ax.plot(energies, fluxes,
+                               color=limit.get("color"), linestyle=limit.get("linestyle"),
+                               linewidth=5, zorder=100+i, animated=True)
+        figure.ax.draw_artist(line)
+        line.remove()
+
+    image = np.array(canvas.buffer_rgba())
+    if save_name is not None:
+        matplotlib.image.imsave(save_name, image, dpi=dpi,
+                                pil_kwargs={"compress_level": compress_level})
+    return image
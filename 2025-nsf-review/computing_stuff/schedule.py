@@ -0,0 +1,246 @@
+import numpy as np
+
+import rnog
+
+'''
+Deployment schedule simulator
+
+A schedule is a list of events (station, date, DAQ): from that date on the
+station runs that DAQ, until the station's next event (an upgrade, or None
+to switch it off). Together with an uptime curve and a Veff per DAQ, this
+gives the cumulative exposure at monthly resolution as one
+(months x energies) array, using only cumulative sums, so re-running
+after a schedule change takes about a millisecond.
+
+Livetime is counted in station-years with every month 1/12 of a year, as
+in compute_quantities.ipynb.
+'''
+
+daqs = ("hilo", "pa", "didaq")
+
+# as in compute_quantities.ipynb
+km3_sr_yr_to_cm3_sr_s = 1E15 * (86400 * 365)
+
+default_months = np.arange('2021-01', '2046-01', dtype='datetime64[M]')
+
+default_uptimes = {
+    "hilo": 0.5,
+    "pa": 0.5,
+    "didaq": 2/3,
+}
+
+default_veffs = {
+    "hilo": "deep_high_low_1Hz",
+    "pa": "simple_threshold_2.5_downsampled",
+    "didaq": "simple_threshold_2",
+}
+
+# the plan from compute_quantities.ipynb: the 8 deployed stations run Hi/Lo
+# until July 2025 and the phased array after that, and 27 DiDAQ stations are
+# added in July 2026-2030 (5, 6, 6, 6, 4). Livetime on disk before July 2024
+# is in rnog.existing_livetime (see on_disk_exposure)
+_deployed = ["s11", "s12", "s13", "s14", "s21", "s22", "s23", "s24"]
+_new_stations = ["d{:02d}".format(i) for i in range(1, 28)]
+default_events = (
+    [(station, "2024-07", "hilo") for station in _deployed]
+    + [(station, "2025-07", "pa") for station in _deployed]
+    + [(station, "2026-07", "didaq") for station in _new_stations[:5]]
+    + [(station, "2027-07", "didaq") for station in _new_stations[5:11]]
+    + [(station, "2028-07", "didaq") for station in _new_stations[11:17]]
+    + [(station, "2029-07", "didaq") for station in _new_stations[17:23]]
+    + [(station, "2030-07", "didaq") for station in _new_stations[23:27]]
+)
+
+
+def on_disk_exposure():
+    """Exposure (km^3 sr yr) on disk before the default schedule starts"""
+    return rnog.existing_livetime * rnog.veff[default_veffs["hilo"]]["veff"]
+
+
+def veff_table(veffs=None):
+    """
+    Veff (km^3 sr) per DAQ, shape (len(daqs), n_energies)
+
+    veffs: dict of arrays or rnog.veff table names per DAQ, missing DAQs use default_veffs
+    """
+    veffs = dict(default_veffs, **(veffs or {}))
+    return np.array([rnog.veff[veffs[d]]["veff"] if isinstance(veffs[d], str) else veffs[d]
+                     for d in daqs], dtype=float)
+
+
+def _uptime_curve(uptime, months):
+    if callable(uptime):
+        uptime = uptime(months)
+    return np.broadcast_to(np.asarray(uptime, dtype=float), months.shape)
+
+
+def _intervals(events, months):
+    """
+    Station index, DAQ index (-1 for off) and [start, stop) month indices of every event
+
+    Also returns the station labels (sorted), the rows of the station index
+    """
+    stations, dates, daq = zip(*events)
+    labels, station_index = np.unique(np.array(stations, dtype=str), return_inverse=True)
+    dates = np.array(dates, dtype='datetime64[M]')
+    daq_index = np.array([-1 if d is None else daqs.index(d) for d in daq])
+
+    # every event lasts until the next event of the same station
+    order = np.lexsort((dates, station_index))
+    station_index, dates, daq_index = station_index[order], dates[order], daq_index[order]
+    start = np.searchsorted(months, dates)
+    stop = np.append(start[1:], len(months))
+    last = np.append(station_index[1:] != station_index[:-1], True)
+    stop[last] = len(months)
+    return labels, station_index, daq_index, start, stop
+
+
+def initial_counted(events, dates, initial_date=None):
+    """
+    Whether the initial exposure is part of the exposure at the start of each month
+
+    The initial exposure (on disk before the schedule, see on_disk_exposure)
+    is counted from initial_date on, by default the month of the first event,
+    so months before the schedule starts have no exposure.
+
+    Returns
+    -------
+    counted: array of bools, shape np.shape(dates)
+    """
+    dates = np.asarray(dates, dtype='datetime64[M]')
+    if initial_date is None:
+        if len(events) == 0:
+            return np.ones(dates.shape, dtype=bool)
+        initial_date = np.array([date for _, date, _ in events], dtype='datetime64[M]').min()
+    return dates >= np.datetime64(initial_date, 'M')
+
+
+def station_counts(events, months=default_months):
+    """
+    Number of stations running each DAQ in each month
+
+    Returns
+    -------
+    counts: array of ints, shape (len(daqs), n_months)
+    """
+    if len(events) == 0:
+        return np.zeros((len(daqs), len(months)), dtype=int)
+    _, _, daq_index, start, stop = _intervals(events, months)
+
+    # +1 at the start and -1 at the end of every interval, then a cumulative sum
+    running = daq_index >= 0
+    changes = np.zeros((len(daqs), len(months) + 1), dtype=int)
+    np.add.at(changes, (daq_index[running], start[running]), 1)
+    np.add.at(changes, (daq_index[running], stop[running]), -1)
+    return np.cumsum(changes, axis=1)[:, :-1]
+
+
+def station_daqs(events, months=default_months):
+    """
+    DAQ (index into daqs, -1 for off) of every station in every month
+
+    Returns
+    -------
+    stations: array of str
+        station labels, sorted
+
+    daq_index: array of ints, shape (n_stations, n_months)
+    """
+    if len(events) == 0:
+        return np.array([], dtype=str), np.zeros((0, len(months)), dtype=int)
+    labels, station_index, daq_index, start, stop = _intervals(events, months)
+    table = np.full((len(labels), len(months)), -1)
+    for station, daq, a, b in zip(station_index, daq_index, start, stop):
+        table[station, a:b] = daq
+    return labels, table
+
+
+def simulate(events=default_events, uptimes=None, veffs=None, months=default_months, initial=None,
+             initial_date=None):
+    """
+    Cumulative exposure of a deployment schedule
+
+    Parameters
+    ----------
+    events: list of (station, date, daq)
+        station label, date (month resolution, e.g. '2026-07') and DAQ
+        ('hilo', 'pa', 'didaq', or None to switch the station off)
+
+    uptimes: dict or None
+        uptime per DAQ as a float, an array over months, or a function of the
+        months (datetime64[M] array); missing DAQs use default_uptimes
+
+    veffs: dict or None
+        Veff per DAQ as an array (km^3 sr) or a table name in rnog.veff;
+        missing DAQs use default_veffs
+
+    months: array of datetime64[M]
+        months to simulate, 2021-2045 by default
+
+    initial: array of floats or None
+        exposure (km^3 sr yr) accumulated before the schedule,
+        on_disk_exposure() by default
+
+    initial_date: datetime64[M], str or None
+        month from which initial is counted, the first event by default
+        (see initial_counted)
+
+    Returns
+    -------
+    result: dict
+        "months": the months,
+        "energy": energies in GeV,
+        "stations": (n_daq, n_months) stations running each DAQ,
+        "livetime": (n_daq, n_months) cumulative station-years per DAQ,
+        "initial": the exposure before the first month (initial if it is counted by then, else 0),
+        "exposure": (n_months, n_energies) cumulative exposure in km^3 sr yr
+        at the end of every month
+    """
+    months = np.asarray(months, dtype='datetime64[M]')
+    uptimes = dict(default_uptimes, **(uptimes or {}))
+    veffs = veff_table(veffs)
+    if initial is None:
+        initial = on_disk_exposure()
+    initial = np.broadcast_to(np.asarray(initial, dtype=float), veffs.shape[1:]).copy()
+
+    counts = station_counts(events, months)
+    uptime = np.array([_uptime_curve(uptimes[d], months) for d in daqs])
+    monthly_livetime = counts * uptime / 12.
+
+    # the exposure at the end of a month is the one at the start of the next
+    counted = initial_counted(events, months + 1, initial_date)
+    return {
+        "months": months,
+        "energy": rnog.veff[default_veffs["hilo"]]["energy"].copy(),
+        "stations": counts,
+        "livetime": np.cumsum(monthly_livetime, axis=1),
+        "initial": initial * initial_counted(events, months[0], initial_date),
+        "exposure": counted[:, np.newaxis] * initial + np.cumsum(monthly_livetime.T @ veffs, axis=0),
+    }
+
+
+def exposure_at(result, dates):
+    """
+    Cumulative exposure (km^3 sr yr) of a simulate result at the start of the given months
+
+    Works on any result with "months", "initial" and an "exposure" of shape
+    (..., n_months, n_energies), and returns shape (...,) + np.shape(dates) + (n_energies,)
+    """
+    dates = np.asarray(dates, dtype='datetime64[M]')
+    index = np.searchsorted(result["months"], dates)
+    # the exposure at the start of month i is the one at the end of month i-1
+    exposure = result["exposure"]
+    initial = np.broadcast_to(result["initial"], exposure.shape[:-2] + (1,) + exposure.shape[-1:])
+    exposure = np.concatenate([initial, exposure], axis=-2)
+    return np.take(exposure, index, axis=-2)
+
+
+def numvstime_data(result, years=range(2024, 2041), month=7):
+    """
+    Exposure at the start of `month` of every year, in cm^3 sr s
+
+    Returns {year: exposure}, like the `data` dict of makeRNOGReviewPlot_NumVsTime.py
+    """
+    dates = np.array(["{}-{:02d}".format(year, month) for year in years], dtype='datetime64[M]')
+    exposure = exposure_at(result, dates) * km3_sr_yr_to_cm3_sr_s
+    return {year: exposure[..., i, :] for i, year in enumerate(years)}
@@ -0,0 +1,174 @@
+import numpy as np
+
+import rnog
+import schedule
+
+'''
+Station failure/repair model for exposure projections
+
+Every deployed station is in one of three states each month: operating,
+degraded or down, with a monthly transition matrix per calendar month.
+Stations fail over the winter and can only be repaired during the summer
+field season, which a flat uptime fraction hides. All stations of the
+schedule are simulated together for many trials, vectorized over
+(trials, stations); only the months are looped over.
+
+The output has the same layout as schedule.simulate (plus a leading trial
+axis), so it feeds schedule.exposure_at, schedule.numvstime_data and
+LimitFigure.add_limit in the same way.
+'''
+
+states = ("operating", "degraded", "down")
+
+# fraction of a month a station in each state takes data
+default_state_uptime = (1.0, 0.5, 0.0)
+
+# Greenland field season
+default_repair_months = (6, 7, 8)
+
+
+def seasonal_transitions(winter_failure=0.06, winter_degrade=0.06, degraded_failure=0.1,
+                         summer_failure=0.01, repair=0.8, repair_months=default_repair_months):
+    """
+    Monthly transition matrices for every calendar month
+
+    Parameters
+    ----------
+    winter_failure, winter_degrade: float
+        monthly probability of an operating station going down / degraded outside the summer
+
+    degraded_failure: float
+        monthly probability of a degraded station going down outside the repair months
+
+    summer_failure: float
+        monthly probability of an operating or degraded station going down during the repair months
+
+    repair: float
+        monthly probability of a degraded or down station being fixed during the repair months
+
+    repair_months: tuple of int
+        calendar months (1-12) with a field season
+
+    Returns
+    -------
+    transitions: array of shape (12, 3, 3)
+        transitions[month-1, i, j] is the probability to go from state i to state j
+    """
+    transitions = np.empty((12, len(states), len(states)))
+    for month in range(1, 13):
+        if month in repair_months:
+            transitions[month-1] = [
+                [1 - summer_failure, 0., summer_failure],
+                [repair, 1 - repair - summer_failure, summer_failure],
+                [repair, 0., 1 - repair],
+            ]
+        else:
+            transitions[month-1] = [
+                [1 - winter_failure - winter_degrade, winter_degrade, winter_failure],
+                [0., 1 - degraded_failure, degraded_failure],
+                [0., 0., 1.],
+            ]
+    return transitions
+
+
+def simulate_states(n_trials=1000, seed=None, events=schedule.default_events, transitions=None,
+                    state_uptime=default_state_uptime, veffs=None, months=schedule.default_months,
+                    initial=None, initial_date=None):
+    """
+    Exposure of a deployment schedule with stations failing and being repaired
+
+    Stations start operating in the month they are deployed (or switch DAQ),
+    then move between states with the transitions of each calendar month.
+
+    Parameters
+    ----------
+    n_trials: int
+        number of simulated histories, all kept in the result (e.g. n_trials x
+        n_months x n_energies floats for "exposure"); reduce it with percentile_result
+
+    seed: int or None
+        seed of the random generator (reproducible for a given seed and n_trials)
+
+    events, veffs, months, initial, initial_date:
+        schedule and Veff per DAQ, as in schedule.simulate
+
+    transitions: array of shape (12, 3, 3) or None
+        monthly transition matrices per calendar month, seasonal_transitions() by default
+
+    state_uptime: tuple of 3 floats
+        uptime of an operating, degraded and down station
+
+    Returns
+    -------
+    result: dict
+        as schedule.simulate, with a leading trial axis:
+        "months", "energy", "initial", "stations": (n_daq, n_months),
+        "operating": (n_trials, n_months) fraction of deployed stations operating,
+        "livetime": (n_trials, n_daq, n_months) cumulative station-years per DAQ,
+        "exposure": (n_trials, n_months, n_energies) cumulative exposure in km^3 sr yr
+    """
+    months = np.asarray(months, dtype='datetime64[M]')
+    if transitions is None:
+        transitions = seasonal_transitions()
+    cumulative = np.cumsum(transitions, axis=-1)
+    calendar_month = months.astype(int) % 12
+    state_uptime = np.asarray(state_uptime, dtype=float)
+    n_daqs = len(schedule.daqs)
+
+    _, station_daq = schedule.station_daqs(events, months)
+    deployed = station_daq >= 0
+    # stations (re)start operating when deployed or switched to another DAQ
+    started = deployed & np.concatenate([deployed[:, :1], station_daq[:, 1:] != station_daq[:, :-1]], axis=1)
+    daq_onehot = (station_daq[np.newaxis] == np.arange(n_daqs)[:, np.newaxis, np.newaxis]).astype(float)
+    n_deployed = np.maximum(deployed.sum(axis=0), 1)
+
+    veff_table = schedule.veff_table(veffs)
+    if initial is None:
+        initial = schedule.on_disk_exposure()
+    initial = np.broadcast_to(np.asarray(initial, dtype=float), veff_table.shape[1:]).copy()
+
+    rng = np.random.default_rng(seed)
+    monthly_livetime = np.empty((n_trials, n_daqs, len(months)))
+    operating = np.empty((n_trials, len(months)))
+    state = np.zeros((n_trials, len(station_daq)), dtype=np.intp)
+    for m in range(len(months)):
+        state[:, started[:, m]] = 0
+        uptime = state_uptime[state] * deployed[:, m]
+        # (trials, stations) x (stations, daqs)
+        monthly_livetime[:, :, m] = uptime @ daq_onehot[:, :, m].T / 12.
+        operating[:, m] = ((state == 0) & deployed[:, m]).sum(axis=1) / n_deployed[m]
+
+        # next month's state
+        thresholds = cumulative[calendar_month[m]][state]
+        draws = rng.random(state.shape)
+        state = np.minimum((draws[..., np.newaxis] >= thresholds).sum(axis=-1), len(states) - 1)
+
+    counted = schedule.initial_counted(events, months + 1, initial_date)
+    return {
+        "months": months,
+        "energy": rnog.veff[schedule.default_veffs["hilo"]]["energy"].copy(),
+        "initial": initial * schedule.initial_counted(events, months[0], initial_date),
+        "stations": schedule.station_counts(events, months),
+        "operating": operating,
+        "livetime": np.cumsum(monthly_livetime, axis=-1),
+        "exposure": counted[:, np.newaxis] * initial
+                    + np.cumsum(np.swapaxes(monthly_livetime, 1, 2) @ veff_table, axis=1),
+    }
+
+
+def percentile_result(result, percentile=50):
+    """
+    One percentile (per month and energy) of a simulate_states result over the trials
+
+    The returned dict has the layout of schedule.simulate, so e.g.
+    schedule.exposure_at(percentile_result(result, 16), '2031-07') is a
+    pessimistic exposure to pass to LimitFigure.add_limit.
+    """
+    return {
+        "months": result["months"],
+        "energy": result["energy"],
+        "initial": result["initial"],
+        "stations": result["stations"],
+        "livetime": np.percentile(result["livetime"], percentile, axis=0),
+        "exposure": np.percentile(result["exposure"], percentile, axis=0),
+    }
@@ -0,0 +1,47 @@
+import matplotlib.image
+import matplotlib.pyplot as plt
+import numpy as np
+
+import batch_render
+from limits import LimitFigure
+
+'''
+Check that figures rendered on the worker pool are identical to
+rendering the same spec in this process, and that failures are reported.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def make_spec(save_name, stations):
+    return {
+        "save_name": save_name,
+        "figure": {"e_power": 2, "xlims": (1e6, 1e11), "ylims": (1e-10, 1e-5)},
+        "group": "rnog_proposal",
+        "limits": [{"name": "RNOG", "energies": np.logspace(7, 10, 7),
+                    "veffs": np.logspace(-1, 2, 7), "stations": stations, "years": 5}],
+        "savefig": {"dpi": 50},
+    }
+
+
+def render_here(spec):
+    figure = LimitFigure(**spec["figure"])
+    figure.build_base_plot(spec["group"])
+    for limit in spec["limits"]:
+        figure.add_limit(**limit)
+    figure.show(save_name=spec["save_name"], **spec["savefig"])
+    plt.close(figure.fig)
+
+
+def test_batch_matches_serial(tmp_path):
+    specs = [make_spec(str(tmp_path / 'a.png'), 35), make_spec(str(tmp_path / 'b.png'), 10),
+             {"save_name": str(tmp_path / 'c.png'), "figure": {"e_power": 3}}]
+    manifest = batch_render.render_batch(specs, processes=2)
+    statuses = [job["status"] for job in manifest["jobs"]]
+    assert statuses==["ok", "ok", "error"]
+    assert manifest["jobs"][2]["error"].startswith("Traceback")
+
+    for spec in specs[:2]:
+        pooled = matplotlib.image.imread(spec["save_name"])
+        spec["save_name"] = spec["save_name"].replace('.png', '_serial.png')
+        render_here(spec)
+        assert np.array_equal(pooled, matplotlib.image.imread(spec["save_name"]))
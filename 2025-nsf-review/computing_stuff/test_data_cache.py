@@ -0,0 +1,66 @@
+import glob
+import os
+import shutil
+
+import numpy as np
+
+import data_cache
+from limits import LimitFigure
+
+'''
+Check that data_cache hands back exactly what the parser produces,
+and that edits to a data file invalidate the LRU and the sidecar.
+Run with `python -m pytest` from this directory.
+'''
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return LimitFigure._parse_data(path)
+
+
+def assert_same_data(cached, parsed):
+    for a, b in zip(cached[:4], parsed[:4]):
+        assert np.array_equal(a, b)
+    assert cached[4]==parsed[4]
+
+
+def test_cached_matches_parsed(tmp_path):
+    for file in sorted(glob.glob('models/*.txt') + glob.glob('experiments/*.txt')):
+        copy = str(tmp_path / os.path.basename(file))
+        shutil.copy(file, copy)
+        parsed = LimitFigure._parse_data(copy)
+        # first through the parser, then from the sidecar with an empty LRU
+        assert_same_data(data_cache.load(copy, LimitFigure._parse_data), parsed)
+        data_cache.clear()
+        assert_same_data(data_cache.load(copy, LimitFigure._parse_data), parsed)
+
+
+def test_lru_and_sidecar_hits(tmp_path):
+    copy = str(tmp_path / 'heinze_cr.txt')
+    shutil.copy('models/heinze_cr.txt', copy)
+    parser = CountingParser()
+    data_cache.load(copy, parser)
+    assert os.path.isfile(data_cache.sidecar_path(copy))
+    data_cache.load(copy, parser)
+    data_cache.clear()
+    data = data_cache.load(copy, parser)
+    assert parser.calls==1
+    assert not data[0].flags.writeable
+
+
+def test_edit_invalidates(tmp_path):
+    copy = str(tmp_path / 'heinze_cr.txt')
+    shutil.copy('models/heinze_cr.txt', copy)
+    parser = CountingParser()
+    before = data_cache.load(copy, parser)
+    with open(copy, 'a') as f:
+        f.write('1e12\t1e-30\t1e-31\t1e-29\n')
+    after = data_cache.load(copy, parser)
+    assert parser.calls==2
+    assert len(after[0])==len(before[0])+1
+    assert after[0][-1]==1e12
@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import datasets
+import limits
+from limits import LimitFigure
+
+'''
+Check the manifest-driven add_model/add_experiment against the data
+files they draw, and the registry's error handling and file reloading.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def existing_files(entry):
+    return all(os.path.isfile(layer["file"]) for layer in entry["layers"] if "file" in layer)
+
+
+def test_models_draw_file_data():
+    for name, entry in datasets.models.items():
+        figure = LimitFigure()
+        figure.add_model(name)
+        lines = [layer for layer in entry["layers"] if layer["kind"]=='line']
+        for line, layer in zip(figure.ax.get_lines(), lines):
+            energy, flux, _, _ = figure.get_data(layer["file"])
+            assert np.array_equal(line.get_xdata(), energy), name
+            assert np.array_equal(line.get_ydata(), flux*layer.get("scale", 1)), name
+        plt.close(figure.fig)
+
+
+def test_experiments_draw():
+    for name, entry in datasets.experiments.items():
+        if not existing_files(entry):
+            continue
+        figure = LimitFigure()
+        figure.add_experiment(name)
+        assert figure.ax.get_children()
+        plt.close(figure.fig)
+
+
+def test_unknown_name_raises():
+    figure = LimitFigure()
+    with pytest.raises(ValueError):
+        figure.add_model('murase_grb_wind')
+    with pytest.raises(ValueError):
+        figure.add_experiment('no_such_experiment')
+    plt.close(figure.fig)
+
+
+def test_load_picks_up_edits(tmp_path):
+    copy = str(tmp_path / 'heinze_cr.txt')
+    shutil.copy('models/heinze_cr.txt', copy)
+    manifest = {"heinze": {"layers": [{"kind": "line", "file": copy, "style": {}}]}}
+    registry = datasets.DatasetRegistry(manifest, LimitFigure._read_data)
+    assert registry.preload()==[copy]
+    before = registry.load(copy)
+    before[0][:] = 0
+    assert not np.array_equal(registry.load(copy)[0], before[0])
+    with open(copy, 'a') as f:
+        f.write('1e12\t1e-30\t1e-31\t1e-29\n')
+    assert len(registry.load(copy)[0])==len(before[0])+1
+
+
+def test_module_registries():
+    assert 'heinze' in limits.model_registry
+    assert 'murase_grb_wind' not in limits.model_registry
@@ -0,0 +1,108 @@
+import numpy as np
+import scipy.constants
+
+import limits
+
+'''
+Check the batched paths in limits.py against the per-energy code they replaced.
+Run with `python -m pytest` from this directory.
+'''
+
+# CTW 2011 coefficients, as in the original per-energy get_total_cross_section
+reference_coefficients = {
+    'neutrino': ((-1.826, -17.31, -6.406, 1.431, -17.91),
+                 (-1.826, -17.31, -6.448, 1.431, -18.61)),
+    'antineutrino': ((-1.033, -15.95, -7.247, 1.569, -17.72),
+                     (-1.033, -15.95, -7.296, 1.569, -18.30)),
+}
+
+
+def reference_lint(energy, particle_type):
+    sigma = 0
+    for c_0, c_1, c_2, c_3, c_4 in reference_coefficients[particle_type]:
+        log_term = np.log(np.log10(energy) - c_0)
+        sigma = sigma + 10**(c_1 + c_2*log_term + c_3*log_term**2 + c_4/log_term)
+    return 1 / (scipy.constants.N_A * sigma)
+
+
+def reference_average_lint(energy):
+    lint_nu = reference_lint(energy, 'neutrino')
+    lint_nubar = reference_lint(energy, 'antineutrino')
+    return 2/((1/lint_nu)+(1/lint_nubar))
+
+
+def test_average_lint_matches_loop():
+    energies = np.logspace(4, 12, 1001)
+    looped = np.array([reference_average_lint(e) for e in energies])
+    batched = limits.get_average_lint(energies)
+    assert batched.shape==energies.shape
+    assert np.allclose(batched, looped, rtol=1e-12, atol=0)
+
+
+def test_average_lint_scalar():
+    lint = limits.get_average_lint(1e9)
+    assert np.ndim(lint)==0
+    assert np.isclose(lint, reference_average_lint(1e9), rtol=1e-12, atol=0)
+
+
+def test_lint_per_particle():
+    energies = np.logspace(4, 12, 101)
+    for particle in ('neutrino', 'antineutrino'):
+        assert np.allclose(limits.get_lint(energies, particle),
+                           reference_lint(energies, particle), rtol=1e-12, atol=0)
+
+
+def test_count_neutrinos_batch_matches_loop():
+    energies = np.logspace(7, 10, 7)
+    veffs = np.array([np.logspace(-1, 2, 7), np.logspace(-0.5, 1.5, 7)])
+    stations = np.array([35, 10])
+    years = np.array([5, 2])
+    fluxes = [lambda e: 1e-8 * e**-2, lambda e: 1e-5 * e**-2.5]
+    counts = limits.count_neutrinos_batch(fluxes, energies, veffs, stations, years)
+    assert counts.shape==(2, 2, 7)
+    for i, flux in enumerate(fluxes):
+        for j in range(len(veffs)):
+            looped = limits.count_neutrinos(flux, energies, veffs[j], stations[j], years[j])
+            assert np.allclose(counts[i, j], looped, rtol=1e-12, atol=0)
+
+
+def test_count_neutrinos_batch_tabulated():
+    energies = np.logspace(7, 10, 7)
+    veffs = np.logspace(-1, 2, 7)
+    table_e = np.logspace(5, 12, 50)
+    table = (table_e, 1e-8 * table_e**-2)
+    counts = limits.count_neutrinos_batch([table], energies, veffs)
+    looped = limits.count_neutrinos(lambda e: 1e-8 * e**-2, energies, veffs)
+    assert np.allclose(counts[0, 0], looped, rtol=1e-9, atol=0)
+
+
+def test_limit_sweep_matches_calculate_flux():
+    energies = np.logspace(7, 10, 7)
+    veffs = np.logspace(-1, 2, 7)
+    stations = [10, 35]
+    years = [1, 5, 10]
+    sup = (2.3, 2.44)
+    sweep = limits.limit_sweep(energies, veffs, stations, years, sup=sup)
+    assert sweep["limit"].shape==(2, 3, 2, 7)
+    for i, j, k in np.ndindex(sweep["limit"].shape[:3]):
+        single = limits.calculate_flux(energies, veffs, stations[i], years[j], sup=sup[k])
+        assert np.allclose(sweep["limit"][i, j, k], single, rtol=1e-12, atol=0)
+
+
+def test_table_backend_error_bound():
+    # inside the table, plus points on both sides where it falls back to the formula
+    energies = np.concatenate([np.logspace(4, 12, 100001), [1e3, 5e3, 2e12, 1e13]])
+    for particle in ('neutrino', 'antineutrino'):
+        analytic = limits.get_total_cross_section(energies, particle)
+        table = limits.get_total_cross_section(energies, particle, backend='table')
+        assert np.allclose(table, analytic, rtol=1e-8, atol=0)
+    assert np.allclose(limits.get_average_lint(energies, backend='table'),
+                       reference_average_lint(energies), rtol=1e-8, atol=0)
+
+
+def test_table_backend_in_limits():
+    energies = np.logspace(7, 10, 7)
+    veffs = np.logspace(-1, 2, 7)
+    analytic = limits.calculate_flux(energies, veffs, 35, 5)
+    table = limits.calculate_flux(energies, veffs, 35, 5, backend='table')
+    assert np.allclose(table, analytic, rtol=1e-8, atol=0)
@@ -0,0 +1,71 @@
+import numpy as np
+
+import livetime
+import rnog
+
+'''
+Check the livetime ledger's binary-search sums against summing the
+matching rows directly, and rnog.available_livetime against its old literals.
+Run with `python -m pytest` from this directory.
+'''
+
+baseline_days = {
+    "s11": 375, "s12": 161, "s13": 333, "s14": 0,
+    "s21": 346, "s22": 176, "s23": 317, "s24": 323,
+}
+
+
+def random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    stations = rng.choice([11, 12, 13, 21, 22, 23, 24], n)
+    days = np.datetime64('2022-06-01') + rng.integers(0, 900, n)
+    trigs = rng.choice(list(livetime.triggers), n)
+    seconds = rng.uniform(0, livetime.seconds_per_day, n)
+    return [("s{}".format(s), str(d), t, x) for s, d, t, x in zip(stations, days, trigs, seconds)]
+
+
+def direct_livetime(rows, station=None, trigger=None, start=None, stop=None):
+    total = 0.
+    for s, d, t, x in rows:
+        d = np.datetime64(d, 'D')
+        if station is not None and s!=station:
+            continue
+        if trigger is not None and t!=trigger:
+            continue
+        if start is not None and d < np.datetime64(start, 'D'):
+            continue
+        if stop is not None and d >= np.datetime64(stop, 'D'):
+            continue
+        total += x
+    return total
+
+
+def test_ledger_matches_direct_sum(tmp_path):
+    rows = random_rows(2000)
+    ledger = livetime.Ledger.from_records(rows)
+    path = str(tmp_path / 'ledger.npy')
+    ledger.save(path)
+    for current in (ledger, livetime.Ledger.load(path)):
+        for station in (None, 's11', 's23'):
+            for trigger in (None, 'hilo', 'pa'):
+                for start, stop in ((None, None), ('2023-01-01', None),
+                                    (None, '2023-07-15'), ('2023-01-01', '2024-01-01')):
+                    expected = direct_livetime(rows, station, trigger, start, stop)
+                    assert np.isclose(current.livetime(station, trigger, start, stop), expected,
+                                      rtol=1e-10, atol=1e-6)
+
+
+def test_cumulative_dates():
+    rows = random_rows(500, seed=1)
+    ledger = livetime.Ledger.from_records(rows)
+    dates = np.array(['2022-01-01', '2023-03-03', '2024-12-31', '2023-03-03'], dtype='datetime64[D]')
+    cumulative = ledger.cumulative('s12', dates=dates)
+    expected = [direct_livetime(rows, 's12', stop=d) for d in dates]
+    assert np.allclose(cumulative, expected, rtol=1e-10, atol=1e-6)
+
+
+def test_available_livetime_matches_literals():
+    assert set(rnog.available_livetime)==set(baseline_days)
+    for station, days in baseline_days.items():
+        assert np.isclose(rnog.available_livetime[station], days/365., rtol=1e-12, atol=0)
+    assert np.isclose(rnog.existing_livetime, sum(baseline_days.values())/365., rtol=1e-12)
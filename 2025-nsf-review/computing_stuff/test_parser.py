@@ -0,0 +1,109 @@
+import glob
+
+import numpy as np
+
+from limits import LimitFigure
+
+'''
+Check the single-read parser of LimitFigure against the original
+two-pass reader (header walk, then np.loadtxt of the whole file).
+Run with `python -m pytest` from this directory.
+'''
+
+units = LimitFigure.units
+
+
+# the reader as it was before the header and body were parsed from one read
+def reference_read_data(file):
+    energy_col = None
+    flux_col = None
+    min_col = None
+    max_col = None
+    e_power = None
+    bins_per_decade = None
+    data_type = None
+    with open(file, 'r') as f:
+        column_number = -1
+        for line in f:
+            line = line.rstrip()
+            if line=='':
+                continue
+            if not line.startswith('#'):
+                break
+            line = line.strip('#')
+            words = line.split()
+            column_number += 1
+            if 'data type:' in line.lower():
+                data_type = " ".join(words[2:]).lower()
+                continue
+            if 'bins per decade' in line.lower():
+                bins_per_decade = float(words[-1])
+                continue
+            if words[0].lower().startswith("column"):
+                column_number = -1
+                continue
+            if words[0].lower()=='energy':
+                unit = words[1].strip('[').rstrip(']')
+                if unit not in units:
+                    raise ValueError("Unable to interpret unit "+words[2])
+                energy_unit = units[unit]
+                energy_col = column_number
+            elif words[0].lower()=='flux' and words[1].lower()!='band':
+                flux_unit = 1
+                for word in words[1:]:
+                    word = word.strip('[').rstrip(']')
+                    bits = word.split("^")
+                    unit = bits[0]
+                    power = float(bits[1]) if len(bits)>1 else 1
+                    if unit not in units:
+                        raise ValueError("Unable to interpret unit ["+word+"]")
+                    if unit.endswith('eV'):
+                        e_power = power
+                    elif unit.endswith('m'):
+                        if power!=-2:
+                            raise ValueError("Expected unit ["+word+"] to be to the -2 power")
+                    else:
+                        if power!=-1:
+                            raise ValueError("Expected unit ["+word+"] to be to the -1 power")
+                    flux_unit *= units[unit]
+                flux_col = column_number
+            elif 'minimum' in words:
+                min_col = column_number
+            elif 'maximum' in words:
+                max_col = column_number
+
+    data = np.loadtxt(file, comments='#')
+    energies = data[:, energy_col] * energy_unit
+    fluxes = data[:, flux_col] * flux_unit
+    band_min = data[:, min_col] * flux_unit
+    band_max = data[:, max_col] * flux_unit
+    meta = {
+        "energy_unit": energy_unit,
+        "flux_unit": flux_unit,
+        "energy_power": e_power,
+        "data_type": data_type,
+        "bins_per_decade": bins_per_decade
+    }
+    return energies, fluxes, band_min, band_max, meta
+
+
+def test_parse_matches_two_pass_reader():
+    files = sorted(glob.glob('models/*.txt') + glob.glob('experiments/*.txt'))
+    assert files
+    for file in files:
+        parsed = LimitFigure._parse_data(file)
+        reference = reference_read_data(file)
+        for a, b in zip(parsed[:4], reference[:4]):
+            assert np.array_equal(a, b), file
+        assert parsed[4]==reference[4], file
+
+
+def test_single_row_body(tmp_path):
+    file = tmp_path / 'one_row.txt'
+    file.write_text("# Data type: Flux\n# Column values:\n# Energy [GeV]\n"
+                    "# Flux [GeV^-1 cm^-2 s^-1 sr^-1]\n# Flux band minimum\n# Flux band maximum\n"
+                    "\n1e6\t1e-20\t1e-21\t1e-19\n")
+    energies, fluxes, band_min, band_max, meta = LimitFigure._parse_data(str(file))
+    assert energies.shape==(1,)
+    assert (energies[0], fluxes[0], band_min[0], band_max[0])==(1e6, 1e-20, 1e-21, 1e-19)
+    assert meta["energy_power"]==-1
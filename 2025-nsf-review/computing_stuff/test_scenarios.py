@@ -0,0 +1,44 @@
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+import scenarios
+from limits import LimitFigure
+
+'''
+Check that the blitted scenarios are pixel-identical to drawing the
+whole LimitFigure from scratch.
+Run with `python -m pytest` from this directory.
+'''
+
+energies = np.logspace(7, 10, 7)
+veffs = np.logspace(-1, 2, 7)
+
+
+def full_render(limits, dpi):
+    figure = LimitFigure()
+    figure.build_base_plot('rnog_proposal')
+    for limit in limits:
+        figure.add_limit('scenario', limit["energies"], limit["veffs"],
+                         limit.get("stations", 1), limit.get("years", 1),
+                         color=limit.get("color"), linestyle=limit.get("linestyle"))
+    figure.show()
+    plt.close(figure.fig)
+    FigureCanvasAgg(figure.fig)
+    figure.fig.set_dpi(dpi)
+    figure.fig.canvas.draw()
+    return np.array(figure.fig.canvas.buffer_rgba())
+
+
+def test_scenarios_match_full_render():
+    scenarios.clear_base_layers()
+    batch = [
+        [{"energies": energies, "veffs": veffs, "stations": 35, "years": 5, "color": 'C0'}],
+        [{"energies": energies, "veffs": veffs, "stations": 10, "years": 2, "color": 'C1', "linestyle": '--'},
+         {"energies": energies, "veffs": veffs*2, "stations": 35, "years": 10, "color": 'C2'}],
+    ]
+    for limits in batch:
+        image = scenarios.render_scenario(limits, dpi=60)
+        assert np.array_equal(image, full_render(limits, dpi=60))
+    # both scenarios were drawn over the same cached base layer
+    assert len(scenarios._base_layers)==1
@@ -0,0 +1,63 @@
+import numpy as np
+
+import schedule
+
+'''
+Check the cumulative-sum schedule simulator against a month-by-month loop
+over the stations of the schedule.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def looped_exposure(events, months, uptimes, veffs, initial, initial_date):
+    """exposure at the start of every month, station by station and month by month"""
+    veff_table = schedule.veff_table(veffs)
+    current = {}
+    by_month = {}
+    for station, date, daq in events:
+        by_month.setdefault(np.datetime64(date, 'M'), []).append((station, daq))
+    exposure = np.zeros(veff_table.shape[1])
+    at_start = []
+    for month in months:
+        for station, daq in by_month.get(month, []):
+            current[station] = daq
+        at_start.append(exposure + (initial if month >= np.datetime64(initial_date, 'M') else 0.))
+        for station, daq in current.items():
+            if daq is not None:
+                d = schedule.daqs.index(daq)
+                exposure = exposure + uptimes[daq] / 12. * veff_table[d]
+    return np.array(at_start)
+
+
+def test_simulate_matches_loop():
+    months = np.arange('2023-01', '2032-01', dtype='datetime64[M]')
+    events = schedule.default_events + [("s13", "2027-02", None), ("s14", "2029-10", "didaq")]
+    uptimes = {"hilo": 0.4, "pa": 0.55, "didaq": 0.7}
+    initial = schedule.on_disk_exposure()
+    result = schedule.simulate(events, uptimes=uptimes, months=months)
+    expected = looped_exposure(events, months, uptimes, None, initial, '2024-07')
+    assert np.allclose(schedule.exposure_at(result, months), expected, rtol=1e-12, atol=1e-15)
+
+
+def test_initial_counted_from_first_event():
+    result = schedule.simulate()
+    initial = schedule.on_disk_exposure()
+    before, first, later = schedule.exposure_at(result, ['2021-01', '2024-07', '2024-08'])
+    assert np.all(before==0)
+    assert np.allclose(first, initial, rtol=1e-12, atol=0)
+    assert np.all(later > initial)
+    assert np.all(result["initial"]==0)
+    # counting it from the start of the grid instead
+    result = schedule.simulate(initial_date='2021-01')
+    assert np.allclose(schedule.exposure_at(result, '2021-01'), initial, rtol=1e-12, atol=0)
+    assert np.allclose(result["initial"], initial, rtol=1e-12, atol=0)
+
+
+def test_station_counts():
+    months = np.arange('2024-01', '2031-01', dtype='datetime64[M]')
+    counts = schedule.station_counts(schedule.default_events, months)
+    index = {str(m): i for i, m in enumerate(months)}
+    assert counts[:, index['2024-06']].tolist()==[0, 0, 0]
+    assert counts[:, index['2024-07']].tolist()==[8, 0, 0]
+    assert counts[:, index['2025-07']].tolist()==[0, 8, 0]
+    assert counts[:, index['2030-07']].tolist()==[0, 8, 27]
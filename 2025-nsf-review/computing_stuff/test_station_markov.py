@@ -0,0 +1,45 @@
+import numpy as np
+
+import schedule
+import station_markov
+
+'''
+Check the station failure/repair model against schedule.simulate in the
+limit where stations never fail, and against the transition rates it is given.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def test_no_failures_match_schedule():
+    identity = np.broadcast_to(np.eye(len(station_markov.states)), (12, 3, 3))
+    uptime = 0.6
+    result = station_markov.simulate_states(20, seed=1, transitions=identity,
+                                            state_uptime=(uptime, 0., 0.))
+    expected = schedule.simulate(uptimes={daq: uptime for daq in schedule.daqs})
+    for key in ("livetime", "exposure"):
+        assert np.allclose(result[key], expected[key][np.newaxis], rtol=1e-12, atol=1e-15)
+    assert np.array_equal(result["initial"], expected["initial"])
+    dates = ['2024-07', '2031-07']
+    assert np.allclose(schedule.exposure_at(result, dates), schedule.exposure_at(expected, dates)[np.newaxis],
+                       rtol=1e-12, atol=1e-15)
+
+
+def test_failure_rate():
+    # one station, no repairs: the operating fraction decays by (1 - p) per month
+    p = 0.05
+    transitions = station_markov.seasonal_transitions(winter_failure=p, winter_degrade=0.,
+                                                      repair=0., summer_failure=p, repair_months=())
+    events = [("s11", "2030-01", "hilo")]
+    months = np.arange('2030-01', '2031-01', dtype='datetime64[M]')
+    result = station_markov.simulate_states(20000, seed=2, events=events, transitions=transitions,
+                                            months=months)
+    operating = result["operating"].mean(axis=0)
+    assert np.allclose(operating, (1 - p)**np.arange(len(months)), atol=0.02)
+
+
+def test_percentile_result():
+    result = station_markov.simulate_states(200, seed=3)
+    low = station_markov.percentile_result(result, 16)
+    high = station_markov.percentile_result(result, 84)
+    assert low["exposure"].shape==result["exposure"].shape[1:]
+    assert np.all(low["exposure"] <= high["exposure"])
@@ -0,0 +1,44 @@
+import numpy as np
+
+import schedule
+import uptime_mc
+
+'''
+Check the Monte Carlo uptime bands against the deterministic schedule.simulate.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def fixed(uptime):
+    return lambda rng, size: np.full(size, uptime)
+
+
+def test_fixed_uptimes_match_schedule():
+    # unsorted dates, including one before the schedule starts
+    dates = np.array(['2040-07', '2026-07', '2024-01', '2031-07'], dtype='datetime64[M]')
+    distributions = {daq: fixed(uptime) for daq, uptime in schedule.default_uptimes.items()}
+    bands = uptime_mc.simulate_uptime(200, seed=1, dates=dates, distributions=distributions,
+                                      percentiles=(2.5, 50, 97.5), chunk_size=64)
+    expected = schedule.exposure_at(schedule.simulate(), dates)
+    # every trial is the same, so all percentiles sit on it (to the histogram resolution)
+    for exposure in bands["exposure"]:
+        assert np.allclose(exposure, expected, rtol=1e-3, atol=0)
+
+
+def test_median_matches_schedule_unsorted_dates():
+    dates = np.array(['2040-07', '2026-07'], dtype='datetime64[M]')
+    bands = uptime_mc.simulate_uptime(20000, seed=2, dates=dates, percentiles=(16, 50, 84))
+    expected = schedule.exposure_at(schedule.simulate(), dates)
+    assert np.allclose(bands["exposure"][1], expected, rtol=5e-3, atol=0)
+    assert np.all(bands["exposure"][0] <= bands["exposure"][1])
+    assert np.all(bands["exposure"][1] <= bands["exposure"][2])
+    # the same dates in order give the same bands
+    ordered = uptime_mc.simulate_uptime(20000, seed=2, dates=dates[::-1], percentiles=(16, 50, 84))
+    assert np.allclose(ordered["exposure"][:, ::-1], bands["exposure"], rtol=5e-3, atol=0)
+
+
+def test_reproducible():
+    a = uptime_mc.simulate_uptime(2000, seed=3, dates=['2030-07'])
+    b = uptime_mc.simulate_uptime(2000, seed=3, dates=['2030-07'])
+    assert np.array_equal(a["exposure"], b["exposure"])
+    assert np.array_equal(a["limit"], b["limit"])
@@ -0,0 +1,77 @@
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+import limits
+import make_veff_tables
+import rnog
+import veff_store
+
+'''
+Check the Veff store against the literal tables it is generated from
+(make_veff_tables.py), and its interpolation against a direct log-log one.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def test_store_matches_source():
+    store = veff_store.VeffStore(version=make_veff_tables.version)
+    assert store.names()==list(make_veff_tables.tables)
+    for name, table in make_veff_tables.tables.items():
+        assert np.array_equal(store.table(name)["energy"], table["energy"])
+        assert np.array_equal(store.table(name)["veff"], table["veff"])
+        assert np.array_equal(rnog.veff[name]["veff"], table["veff"])
+        assert store.metadata(name)==make_veff_tables.metadata[name]
+
+
+def test_campaigns_read_the_store():
+    # the rnog.py of the other campaigns, loaded by path since they are also called rnog
+    here = os.path.dirname(os.path.abspath(__file__))
+    expected_names = {
+        '2024-pa-proposal/limit/rnog.py': ["wp", "deep_high_low_1Hz", "simple_threshold_2", "simple_threshold_2.5",
+                                           "simple_threshold_2.5_downsampled", "simple_threshold_3_downsampled"],
+        '2025-nsf-proposal/computing_stuff/rnog.py': ["hilo", "pa", "didaq"],
+    }
+    for path, names in expected_names.items():
+        spec = importlib.util.spec_from_file_location("campaign_rnog", os.path.join(here, '..', '..', path))
+        campaign = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(campaign)
+        assert list(campaign.veff)==names
+        for name in names:
+            assert np.array_equal(campaign.veff[name]["energy"], make_veff_tables.tables[name]["energy"])
+            assert np.array_equal(campaign.veff[name]["veff"], make_veff_tables.tables[name]["veff"])
+
+
+def test_save_round_trip(tmp_path):
+    path = str(tmp_path / 'tables.npz')
+    veff_store.save(path, make_veff_tables.tables, 'test', make_veff_tables.metadata)
+    store = veff_store.VeffStore(path, version='test')
+    for name, table in make_veff_tables.tables.items():
+        assert np.array_equal(store.veff(name), table["veff"])
+    with pytest.raises(ValueError):
+        veff_store.VeffStore(path, version='other')
+
+
+def test_interpolation():
+    store = veff_store.get_store()
+    table = make_veff_tables.tables["deep_high_low_1Hz"]
+    energy, veff = table["energy"], table["veff"]
+    # on the grid the stored values come back exactly
+    assert np.array_equal(store.veff("deep_high_low_1Hz", energy), veff)
+    # in between, linear in log10(veff) vs log10(energy)
+    log_mid = (np.log10(energy[1:]) + np.log10(energy[:-1])) / 2
+    expected = 10**((np.log10(veff[1:]) + np.log10(veff[:-1])) / 2)
+    assert np.allclose(store.veff("deep_high_low_1Hz", 10**log_mid), expected, rtol=1e-12, atol=0)
+    with pytest.raises(ValueError):
+        store.veff("deep_high_low_1Hz", energy[0] / 2)
+    with pytest.raises(ValueError):
+        store.veff("no_such_table")
+
+
+def test_calculate_flux_by_name():
+    table = make_veff_tables.tables["simple_threshold_2.5"]
+    by_name = limits.calculate_flux(table["energy"], "simple_threshold_2.5", 35, 5)
+    by_array = limits.calculate_flux(table["energy"], table["veff"], 35, 5)
+    assert np.array_equal(by_name, by_array)
@@ -0,0 +1,185 @@
+import numpy as np
+
+import limits
+import rnog
+import schedule
+
+'''
+Monte Carlo uptime model for exposure projections
+
+Instead of one fixed uptime per DAQ, every station gets its own uptime in
+every season (July to June), drawn from a distribution per DAQ. For each
+trial the cumulative exposure at the evaluation dates is a linear
+function of those uptimes, so trials are evaluated as matrix products, in
+chunks to bound memory. Exposures are accumulated into fine histograms
+between their smallest (all uptimes 0) and largest (all uptimes 1)
+possible values, which gives percentile bands without keeping every
+trial; the bands are resolved to (largest - smallest) / n_bins.
+
+Results are reproducible for a given seed, n_trials and chunk_size.
+'''
+
+# placeholder spreads around the fixed uptimes of compute_quantities.ipynb
+# (mean 0.5 for Hi/Lo and PA, 2/3 for the DiDAQ)
+default_distributions = {
+    "hilo": ("beta", (5., 5.)),
+    "pa": ("beta", (5., 5.)),
+    "didaq": ("beta", (8., 4.)),
+}
+
+season_start_month = 7
+
+
+def _draw(rng, distribution, size):
+    """Uptimes from ("rng method", params) or a function of (rng, size), clipped to [0, 1]"""
+    if callable(distribution):
+        uptimes = distribution(rng, size)
+    else:
+        name, params = distribution
+        uptimes = getattr(rng, name)(*params, size=size)
+    return np.clip(uptimes, 0., 1.)
+
+
+def _season_weights(events, months, dates):
+    """
+    Station-years (uptime 1) of every (DAQ, station, season) accumulated before each date
+
+    Returns
+    -------
+    weights: array of shape (n_daqs, n_stations, n_seasons, n_dates)
+    """
+    _, station_daq = schedule.station_daqs(events, months)
+    month_number = months.astype(int)
+    season = (month_number - (season_start_month - 1)) // 12
+    season -= season.min()
+
+    running = station_daq[np.newaxis] == np.arange(len(schedule.daqs))[:, np.newaxis, np.newaxis]
+    in_season = season[:, np.newaxis] == np.arange(season.max() + 1)
+    before = months[:, np.newaxis] < dates
+    return np.einsum('dsm,my,mk->dsyk', running, in_season, before, dtype=float) / 12.
+
+
+def _histogram_percentiles(counts, low, high, percentiles):
+    """
+    Percentiles from histograms over [low, high]
+
+    counts has shape (..., n_bins), low and high shape (...);
+    returns shape (len(percentiles), ...)
+    """
+    n_bins = counts.shape[-1]
+    total = counts.sum(axis=-1, keepdims=True)
+    cdf = np.cumsum(counts, axis=-1) / total
+    q = np.asarray(percentiles, dtype=float)[:, np.newaxis] / 100.
+    q = q.reshape(q.shape[:1] + (1,) * (counts.ndim - 1) + (1,))
+
+    index = np.minimum(np.argmax(cdf[np.newaxis] >= q - 1e-12, axis=-1), n_bins - 1)
+    cdf_right = np.take_along_axis(np.broadcast_to(cdf, q.shape[:1] + cdf.shape), index[..., np.newaxis], axis=-1)[..., 0]
+    in_bin = np.take_along_axis(np.broadcast_to(counts / total, q.shape[:1] + cdf.shape), index[..., np.newaxis], axis=-1)[..., 0]
+    fraction = np.where(in_bin > 0, 1 - (cdf_right - q[..., 0]) / np.where(in_bin > 0, in_bin, 1), 0.)
+    return low + (index + np.clip(fraction, 0., 1.)) / n_bins * (high - low)
+
+
+def simulate_uptime(n_trials=100000, seed=None, distributions=None, events=schedule.default_events,
+                    veffs=None, dates=None, percentiles=(2.5, 16, 50, 84, 97.5),
+                    chunk_size=10000, n_bins=8192, initial=None, initial_date=None, sup=1, figure=None):
+    """
+    Percentile bands of exposure and limits with random per-station, per-season uptimes
+
+    Parameters
+    ----------
+    n_trials: int
+        number of Monte Carlo trials (10^4 - 10^6)
+
+    seed: int or None
+        seed of the random generator
+
+    distributions: dict or None
+        uptime distribution per DAQ, as ("numpy Generator method", params),
+        e.g. ("beta", (5, 5)), or a function of (rng, size);
+        missing DAQs use default_distributions
+
+    events, veffs, initial, initial_date:
+        schedule and Veff per DAQ, as in schedule.simulate
+
+    dates: array of datetime64[M] or None
+        dates to evaluate at, the start of every season (July) 2025-2045 by default
+
+    percentiles: list of floats
+        percentiles (0-100) of the bands
+
+    chunk_size: int
+        number of trials evaluated at once
+
+    n_bins: int
+        histogram bins per (date, energy)
+
+    sup: float
+        upper limit on the number of events, as in LimitFigure.add_limit
+
+    figure: LimitFigure or None
+        if given, limits are in this figure's units (as from add_limit),
+        otherwise in m^-2 s^-1 sr^-1 GeV^-1 (as from limits.calculate_flux)
+
+    Returns
+    -------
+    bands: dict
+        "dates", "energy", "percentiles",
+        "exposure": (n_percentiles, n_dates, n_energies) in km^3 sr yr,
+        "limit": (n_percentiles, n_dates, n_energies), the limit for the
+        exposure at the same percentile from the top (so "limit"[-1] is the
+        weakest limit and "exposure"[-1] the largest exposure)
+    """
+    months = schedule.default_months
+    if dates is None:
+        dates = np.arange('2025', '2046', dtype='datetime64[Y]').astype('datetime64[M]') + (season_start_month - 1)
+    dates = np.asarray(dates, dtype='datetime64[M]')
+    distributions = dict(default_distributions, **(distributions or {}))
+
+    energies = rnog.veff[schedule.default_veffs["hilo"]]["energy"]
+    veff_table = schedule.veff_table(veffs)
+    if initial is None:
+        initial = schedule.on_disk_exposure()
+    initial = np.broadcast_to(np.asarray(initial, dtype=float), veff_table.shape[1:])
+    initial = schedule.initial_counted(events, dates, initial_date)[:, np.newaxis] * initial
+
+    # only keep the (station, season) columns with any livetime
+    weights = _season_weights(events, months, dates)
+    columns = []
+    for d in range(len(schedule.daqs)):
+        w = weights[d].reshape(-1, len(dates))
+        columns.append(w[w.any(axis=1)])
+
+    low = initial
+    high = low + np.stack([w.sum(axis=0) for w in columns], axis=-1) @ veff_table
+    width = np.where(high > low, high - low, 1.)
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(len(dates) * len(energies) * n_bins, dtype=np.int64)
+    offsets = np.arange(len(dates) * len(energies)).reshape(len(dates), len(energies)) * n_bins
+    for start in range(0, n_trials, chunk_size):
+        size = min(chunk_size, n_trials - start)
+        livetime = np.zeros((size, len(dates), len(schedule.daqs)))
+        for d, daq in enumerate(schedule.daqs):
+            if len(columns[d]):
+                livetime[:, :, d] = _draw(rng, distributions[daq], (size, len(columns[d]))) @ columns[d]
+        exposure = initial + livetime @ veff_table
+        bins = np.clip(((exposure - low) / width * n_bins).astype(np.int64), 0, n_bins - 1)
+        counts += np.bincount((bins + offsets).ravel(), minlength=len(counts))
+
+    counts = counts.reshape(len(dates), len(energies), n_bins)
+    exposure = _histogram_percentiles(counts, low, high, percentiles)
+
+    # the limit falls with exposure, so its p-th percentile comes from the (100-p)-th of the exposure
+    upper = _histogram_percentiles(counts, low, high, 100. - np.asarray(percentiles, dtype=float))
+    if figure is None:
+        limit = limits.calculate_flux(energies, upper, sup=sup)
+    else:
+        _, limit = figure.get_limit(energies, upper, sup=sup)
+
+    return {
+        "dates": dates,
+        "energy": energies,
+        "percentiles": np.asarray(percentiles, dtype=float),
+        "exposure": exposure,
+        "limit": limit,
+    }
@@ -0,0 +1,139 @@
+import functools
+import json
+import os
+
+import numpy as np
+
+'''
+Versioned store of effective volume tables
+
+One .npz file holds a set of tables (energy in GeV, veff in km^3 sr),
+a version tag, and metadata per table (trigger, threshold, simulation
+production, ...). Veff at arbitrary energies is interpolated in log-log
+from the table; the log-space nodes are cached per table.
+
+All scripts should read the same file (default_store), so the numbers
+are no longer copied by hand between campaigns. That file is written by
+make_veff_tables.py, which holds the source tables.
+'''
+
+store_format = 1
+default_store = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'veff_tables.npz')
+
+
+def save(path, tables, version, metadata=None):
+    """
+    Write a set of Veff tables
+
+    Parameters
+    ----------
+    path: str
+        file to write (.npz)
+
+    tables: dict
+        {name: {"energy": energies in GeV, "veff": veff in km^3 sr}}, in the order to store them
+
+    version: str
+        version tag of this table set
+
+    metadata: dict or None
+        {name: dict of json-able metadata}, e.g. trigger, threshold, production
+    """
+    metadata = metadata or {}
+    header = {"format": store_format, "version": version, "tables": []}
+    arrays = {}
+    for i, (name, table) in enumerate(tables.items()):
+        energy = np.asarray(table["energy"], dtype=float)
+        veff = np.asarray(table["veff"], dtype=float)
+        if energy.shape != veff.shape or energy.ndim != 1:
+            raise ValueError("Table '"+name+"' needs 1D energy and veff arrays of the same length")
+        if np.any(np.diff(energy) <= 0):
+            raise ValueError("Table '"+name+"' energies should be increasing")
+        header["tables"].append({"name": name, "metadata": metadata.get(name, {})})
+        arrays["energy_{}".format(i)] = energy
+        arrays["veff_{}".format(i)] = veff
+    arrays["header"] = np.array(json.dumps(header))
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+class VeffStore:
+    """
+    Read-only view of a Veff table file
+
+    Parameters
+    ----------
+    path: str
+        .npz file written by save
+
+    version: str or None
+        if given, raise if the file has a different version tag
+    """
+    def __init__(self, path=default_store, version=None):
+        self.path = path
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            if header["format"] != store_format:
+                raise ValueError("Unrecognized Veff store format "+str(header["format"])+" in "+path)
+            if version is not None and header["version"] != version:
+                raise ValueError("Veff store "+path+" is version '"+header["version"]+"', expected '"+version+"'")
+            self.version = header["version"]
+            self._tables = {}
+            for i, entry in enumerate(header["tables"]):
+                energy = data["energy_{}".format(i)]
+                veff = data["veff_{}".format(i)]
+                energy.flags.writeable = False
+                veff.flags.writeable = False
+                self._tables[entry["name"]] = (energy, veff, entry["metadata"])
+        self._nodes = {}
+
+    def names(self):
+        return list(self._tables)
+
+    def _get(self, name):
+        if name not in self._tables:
+            raise ValueError("Unrecognized Veff table '"+str(name)+"', options are "+str(self.names()))
+        return self._tables[name]
+
+    def metadata(self, name):
+        return dict(self._get(name)[2])
+
+    def table(self, name):
+        """The stored table as {"energy": ..., "veff": ...} (copies, like the old rnog.veff entries)"""
+        energy, veff, _ = self._get(name)
+        return {"energy": energy.copy(), "veff": veff.copy()}
+
+    def _log_nodes(self, name):
+        if name not in self._nodes:
+            energy, veff, _ = self._get(name)
+            self._nodes[name] = (np.log10(energy), np.log10(veff))
+        return self._nodes[name]
+
+    def veff(self, name, energies=None):
+        """
+        Veff (km^3 sr) of a table at the given energies (GeV)
+
+        Interpolated linearly in log10(veff) vs log10(energy); energies that
+        are on the table grid return the stored values exactly. Energies
+        outside the table raise a ValueError rather than extrapolating.
+        None returns the stored grid values.
+        """
+        energy, veff, _ = self._get(name)
+        if energies is None:
+            return veff.copy()
+        energies = np.asarray(energies, dtype=float)
+        if np.any(energies < energy[0]) or np.any(energies > energy[-1]):
+            raise ValueError("Energies outside the range of Veff table '"+name+"' ({:.3g} - {:.3g} GeV)".format(energy[0], energy[-1]))
+        log_energy, log_veff = self._log_nodes(name)
+        result = 10**np.interp(np.log10(energies), log_energy, log_veff)
+
+        index = np.minimum(np.searchsorted(energy, energies), len(energy)-1)
+        on_grid = energy[index] == energies
+        result = np.where(on_grid, veff[index], result)
+        return result[()]
+
+
+@functools.lru_cache(maxsize=None)
+def get_store(path=default_store):
+    """Shared VeffStore per file"""
+    return VeffStore(path)
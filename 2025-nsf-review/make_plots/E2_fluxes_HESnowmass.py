@@ -9,11 +9,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 import units
 import fluxes
-import pandas as pd
 import os
 from expdata import *
 from modeldata import *
-from scipy import interpolate
 
 # YOU NEED TO CHANGE THIS IN BOTH expdata.py and modeldata.py 
 # TO UPDATE PROPERLY
@@ -32,9 +30,6 @@ plotUnitsLivetime = '5 years or 100 days'
 # Other planned experiments
 
 
-from scipy.interpolate import interp1d
-
-
 def get_TAGZK_flux(energy):
     """
     GZK neutrino flux from TA best fit from D. Bergmann privat communications
@@ -43,6 +38,7 @@ def get_TAGZK_flux(energy):
     TA_data = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "TA_combined_fit_m3.txt"))
     E = TA_data[:, 0] * units.GeV
     f = TA_data[:, 1] * plotUnitsFlux / E ** 2
+    from scipy.interpolate import interp1d
     get_TAGZK_flux = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return get_TAGZK_flux(energy)
 
@@ -55,6 +51,7 @@ def get_TAGZK_flux_ICRC2021(energy):
     TA_data = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "TA_GZKprediction_ICRC2021.txt"))
     E = TA_data[:, 0] * units.GeV
     f = TA_data[:, 1] * plotUnitsFlux / E ** 2
+    from scipy.interpolate import interp1d
     get_TAGZK_flux = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return get_TAGZK_flux(energy)
 
@@ -66,6 +63,7 @@ def get_proton_10(energy):
     vanVliet_reas = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "ReasonableNeutrinos1.txt"))
     E = vanVliet_reas[0, :] * units.GeV
     f = vanVliet_reas[1, :] * plotUnitsFlux / E ** 2
+    from scipy.interpolate import interp1d
     getE = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return getE(energy)
 
@@ -74,6 +72,7 @@ def get_GZK_Auger_best_fit(energy):
     Heinze_band = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "talys_neu_bands.out"))
     E = Heinze_band[:, 0] * units.GeV
     f = Heinze_band[:, 1] / units.GeV / units.cm ** 2 / units.s / units.sr
+    from scipy.interpolate import interp1d
     getE = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return getE(energy)
 
@@ -197,16 +196,12 @@ def get_E2_limit_figure(fig=None, ax=None, show_model_legend=True,
             tde_min_flux = tde[:, 3] * 3 * flavorRatio
             
             astro_energies = np.logspace(11, 21.1, num=70)
-            # interpolate in log space
-            muf_interp = interpolate.interp1d( muf_epos_cosmo[:,0], np.log10(muf_flux), fill_value=-99., bounds_error=False,) 
-            clusters_interp = interpolate.interp1d( np.log10(clusters[:, 0]) + 9., np.log10(clusters_flux),  fill_value=-99.,bounds_error=False,)
-            tde_max_interp= interpolate.interp1d( np.log10(tde[:, 0]) + 9., np.log10(tde_max_flux),  fill_value=-99.,bounds_error=False,)
-            tde_min_interp= interpolate.interp1d( np.log10(tde[:, 0]) + 9., np.log10(tde_min_flux),  fill_value=-99.,bounds_error=False,)
-            
-            muf_interp_flux = muf_interp(np.log10(astro_energies))
-            clusters_interp_flux = clusters_interp(np.log10(astro_energies))
-            tde_max_interp_flux = tde_max_interp(np.log10(astro_energies))
-            tde_min_interp_flux = tde_min_interp(np.log10(astro_energies))
+            # interpolate in log space (np.interp gives the same as interp1d with fill_value=-99.)
+            log_astro_energies = np.log10(astro_energies)
+            muf_interp_flux = np.interp(log_astro_energies, muf_epos_cosmo[:,0], np.log10(muf_flux), left=-99., right=-99.)
+            clusters_interp_flux = np.interp(log_astro_energies, np.log10(clusters[:, 0]) + 9., np.log10(clusters_flux), left=-99., right=-99.)
+            tde_max_interp_flux = np.interp(log_astro_energies, np.log10(tde[:, 0]) + 9., np.log10(tde_max_flux), left=-99., right=-99.)
+            tde_min_interp_flux = np.interp(log_astro_energies, np.log10(tde[:, 0]) + 9., np.log10(tde_min_flux), left=-99., right=-99.)
             
             muf_interp_flux[np.isinf(muf_interp_flux)] = -99.
             clusters_interp_flux[np.isinf(clusters_interp_flux)] = -99.
@@ -1,12 +1,92 @@
+import collections
+import hashlib
+import math
+import sys
 import numpy as np
-from NuRadioReco.utilities import units
-from scipy.interpolate import interp1d
-from scipy import constants
+import units
 import logging
 
 logger = logging.getLogger("cross sections")
 
 
+def check_units(reference=None):
+    """
+    Compare the bundled units.py with the units of NuRadioReco
+
+    make_plots only uses the bundled units.py, so it runs (and starts fast)
+    without NuRadioReco; quantities passed in from NuRadioMC code need the
+    two to agree.
+
+    Parameters
+    ----------
+    reference: module or None
+        NuRadioReco.utilities.units by default, if it is installed
+
+    Returns
+    -------
+    mismatches: dict
+        name: (bundled value, reference value) of every constant that differs,
+        empty if they all match or NuRadioReco is not installed
+    """
+    if reference is None:
+        try:
+            from NuRadioReco.utilities import units as reference
+        except ImportError:
+            return {}
+
+    mismatches = {}
+    for name, value in vars(units).items():
+        if name.startswith('_') or not isinstance(value, (int, float)) or not hasattr(reference, name):
+            continue
+        if not math.isclose(value, getattr(reference, name), rel_tol=1e-12):
+            mismatches[name] = (value, getattr(reference, name))
+    return mismatches
+
+
+# NuRadioReco is not imported here (it is slow to import), but if it is loaded already both units have to agree
+if "NuRadioReco.utilities.units" in sys.modules:
+    _mismatches = check_units(sys.modules["NuRadioReco.utilities.units"])
+    if _mismatches:
+        logger.warning("units.py differs from NuRadioReco.utilities.units: {}".format(_mismatches))
+
+
+# coefficients (c0, ..., c4) of param() per parameterization and interaction type
+param_coefficients = {
+    # Phys.Rev.D83:113009,2011 Amy Connolly, Robert S. Thorne, David Waters
+    'ctw': {
+        'cc': (-1.826, -17.31, -6.406, 1.431, -17.91),  # nu, CC
+        'nc': (-1.826, -17.31, -6.448, 1.431, -18.61),  # nu, NC
+        'cc_bar': (-1.033, -15.95, -7.247, 1.569, -17.72),  # nu_bar, CC
+        'nc_bar': (-1.033, -15.95, -7.296, 1.569, -18.30),  # nu_bar, NC
+
+        'nc_up': (-1.456, 32.23, -32.32, 5.881, -49.41),  # nu, NC
+        'cc_up': (-1.456, 33.47, -33.02, 6.026, -49.41),  # nu, CC
+        'nc_bar_up': (-2.945, 143.2, -76.70, 11.75, -142.8),  # nu_bar, NC
+        'cc_bar_up': (-2.945, 144.5, -77.44, 11.9, -142.8),  # nu_bar, CC
+        'nc_down': (-15.35, 16.16, 37.71, -8.801, -253.1),  # nu, NC
+        'cc_down': (-15.35, 13.86, 39.84, -9.205, -253.1),  # nu, CC
+        'nc_bar_down': (-13.08, 15.17, 31.19, -7.757, -216.1),  # nu_bar, NC
+        'cc_bar_down': (-13.08, 12.48, 33.52, -8.191, -216.1),  # nu_bar, CC
+    },
+    # Parameterization as above fitted to GENIE HEDIS module (with BGR18) cross sections
+    # as in arXiv:2004.04756v2 (prepared for JCAP)
+    # Precalculated xsec tables for 'nu_mu(_bar)_O16/tot_cc(nc)'/16 for isoscalar target
+    # obtained from GHE19_00a_00_000.root in https://github.com/pochoarus/GENIE-HEDIS/tree/nupropearth/genie_xsec
+    # Fitted in the energy range above 1 TeV; do not use below
+    'hedis_bgr18': {
+        'cc': (-1.6049779136562436, -17.7480299104706, -6.748861524562085, 1.5569481852252935, -16.545379184836094),  # nu, CC
+        'nc': (-1.9625311094497564, -17.576550328008224, -6.444583672267122, 1.4702739736023922, -18.6167800243672),  # nu, NC
+        'cc_bar': (-2.28879962998228, -15.725804320703244, -5.273935123272873, 1.0314821502761589, -23.15773837113476),  # nu_bar, CC
+        'nc_bar': (-2.582585867636026, -15.742658435090945, -5.075692336968196, 0.9963850387362603, -24.870843546539973),  # nu_bar, NC
+    },
+}
+
+# the same coefficients as one (5, n_rows) matrix, for get_nu_cross_section_fused
+_coefficient_rows = {(parameterization, inttype): row for row, (parameterization, inttype) in enumerate(
+    (p, i) for p in param_coefficients for i in param_coefficients[p])}
+_coefficient_matrix = np.array([param_coefficients[p][i] for p, i in _coefficient_rows]).T
+
+
 def param(energy, inttype='cc', parameterization='ctw'):
     """
     Parameterization and constants as used in
@@ -21,60 +101,13 @@ def param(energy, inttype='cc', parameterization='ctw'):
         else:
             return np.nan
 
-    if parameterization == 'ctw':
-        """
-        Phys.Rev.D83:113009,2011 Amy Connolly, Robert S. Thorne, David Waters
-        """
-        if inttype == 'cc':
-            c = (-1.826, -17.31, -6.406, 1.431, -17.91)  # nu, CC
-        elif inttype == 'nc':
-            c = (-1.826, -17.31, -6.448, 1.431, -18.61)  # nu, NC
-        elif inttype == 'cc_bar':
-            c = (-1.033, -15.95, -7.247, 1.569, -17.72)  # nu_bar, CC
-        elif inttype == 'nc_bar':
-            c = (-1.033, -15.95, -7.296, 1.569, -18.30)  # nu_bar, NC
-
-        elif inttype == 'nc_up':
-            c = (-1.456, 32.23, -32.32, 5.881, -49.41)  # nu, NC
-        elif inttype == 'cc_up':
-            c = (-1.456, 33.47, -33.02, 6.026, -49.41)  # nu, CC
-        elif inttype == 'nc_bar_up':
-            c = (-2.945, 143.2, -76.70, 11.75, -142.8)  # nu_bar, NC
-        elif inttype == 'cc_bar_up':
-            c = (-2.945, 144.5, -77.44, 11.9, -142.8)  # nu_bar, CC
-        elif inttype == 'nc_down':
-            c = (-15.35, 16.16, 37.71, -8.801, -253.1)  # nu, NC
-        elif inttype == 'cc_down':
-            c = (-15.35, 13.86, 39.84, -9.205, -253.1)  # nu, CC
-        elif inttype == 'nc_bar_down':
-            c = (-13.08, 15.17, 31.19, -7.757, -216.1)  # nu_bar, NC
-        elif inttype == 'cc_bar_down':
-            c = (-13.08, 12.48, 33.52, -8.191, -216.1)  # nu_bar, CC
-        else:
-            logger.error("Type {0} of interaction not defined for 'ctw'".format(inttype))
-            raise NotImplementedError
-    elif parameterization == 'hedis_bgr18':
-        """
-        Parameterization as above fitted to GENIE HEDIS module (with BGR18) cross sections
-        as in arXiv:2004.04756v2 (prepared for JCAP)
-        Precalculated xsec tables for 'nu_mu(_bar)_O16/tot_cc(nc)'/16 for isoscalar target
-        obtained from GHE19_00a_00_000.root in https://github.com/pochoarus/GENIE-HEDIS/tree/nupropearth/genie_xsec
-        Fitted in the energy range above 1 TeV; do not use below
-        """
-        if inttype == 'cc':
-            c = (-1.6049779136562436, -17.7480299104706, -6.748861524562085, 1.5569481852252935, -16.545379184836094)  # nu, CC
-        elif inttype == 'nc':
-            c = (-1.9625311094497564, -17.576550328008224, -6.444583672267122, 1.4702739736023922, -18.6167800243672)  # nu, NC
-        elif inttype == 'cc_bar':
-            c = (-2.28879962998228, -15.725804320703244, -5.273935123272873, 1.0314821502761589, -23.15773837113476)  # nu_bar, CC
-        elif inttype == 'nc_bar':
-            c = (-2.582585867636026, -15.742658435090945, -5.075692336968196, 0.9963850387362603, -24.870843546539973)  # nu_bar, NC
-        else:
-            logger.error("Type {0} of interaction not defined for 'hedis_bgr18'".format(inttype))
-            raise NotImplementedError
-    else:
+    if parameterization not in param_coefficients:
         logger.error("Parameterization {0} of interaction cross section not defined".format(parameterization))
         raise NotImplementedError
+    if inttype not in param_coefficients[parameterization]:
+        logger.error("Type {0} of interaction not defined for '{1}'".format(inttype, parameterization))
+        raise NotImplementedError
+    c = param_coefficients[parameterization][inttype]
 
     epsilon = np.log10(energy / units.GeV)
     l_eps = np.log(epsilon - c[0])
@@ -83,116 +116,154 @@ def param(energy, inttype='cc', parameterization='ctw'):
     return crscn
 
 
-def csms(energy, inttype, flavors):
+# Amanda Cooper-Sarkar, Philipp Mertsch, Subir Sarkar, JHEP 08 (2011) 042
+# energy [GeV], CC and NC cross sections [pb]
+_csms_neutrino = np.array((
+    [50, 0.32, 0.10],
+    [100, 0.65, 0.20],
+    [200, 1.3, 0.41],
+    [500, 3.2, 1.0],
+    [1000, 6.2, 2.0],
+    [2000, 12., 3.8],
+    [5000, 27., 8.6],
+    [10000, 47., 15.],
+    [20000, 77., 26.],
+    [50000, 140., 49.],
+    [100000, 210., 75.],
+    [200000, 310., 110.],
+    [500000, 490., 180.],
+    [1e6, 690., 260.],
+    [2e6, 950., 360.],
+    [5e6, 1400., 540.],
+    [1e7, 1900., 730.],
+    [2e7, 2600., 980.],
+    [5e7, 3700., 1400.],
+    [1e8, 4800., 1900.],
+    [2e8, 6200., 2400.],
+    [5e8, 8700., 3400.],
+    [1e9, 11000., 4400.],
+    [2e9, 14000., 5600.],
+    [5e9, 19000., 7600.],
+    [1e10, 24000., 9600.],
+    [2e10, 30000., 12000.],
+    [5e10, 39000., 16000.],
+    [1e11, 48000., 20000.],
+    [2e11, 59000., 24000.],
+    [5e11, 75000., 31000.]
+))
+
+_csms_antineutrino = np.array((
+    [50, 0.15, 0.05],
+    [100, 0.33, 0.12],
+    [200, 0.69, 0.24],
+    [500, 1.8, 0.61],
+    [1000, 3.6, 1.20],
+    [2000, 7., 2.4],
+    [5000, 17., 5.8],
+    [10000, 31., 11.],
+    [20000, 55., 19.],
+    [50000, 110., 39.],
+    [100000, 180., 64.],
+    [200000, 270., 99.],
+    [500000, 460., 170.],
+    [1e6, 660., 240.],
+    [2e6, 920., 350.],
+    [5e6, 1400., 530.],
+    [1e7, 1900., 730.],
+    [2e7, 2500., 980.],
+    [5e7, 3700., 1400.],
+    [1e8, 4800., 1900.],
+    [2e8, 6200., 2400.],
+    [5e8, 8700., 3400.],
+    [1e9, 11000., 4400.],
+    [2e9, 14000., 5600.],
+    [5e9, 19000., 7600.],
+    [1e10, 24000., 9600.],
+    [2e10, 30000., 12000.],
+    [5e10, 39000., 16000.],
+    [1e11, 48000., 20000.],
+    [2e11, 59000., 24000.],
+    [5e11, 75000., 31000.]
+))
+
+# natural log of the energies and of the (nu CC, nu NC, nu_bar CC, nu_bar NC) cross sections, in standard units,
+# and the power law index of every table interval
+_csms_log_energy = np.log(_csms_neutrino[:, 0] * units.GeV)
+_csms_log_crscn = np.log(np.array((_csms_neutrino[:, 1], _csms_neutrino[:, 2],
+                                   _csms_antineutrino[:, 1], _csms_antineutrino[:, 2])) * units.picobarn)
+_csms_slopes = np.diff(_csms_log_crscn) / np.diff(_csms_log_energy)
+_csms_log_crscn = np.ascontiguousarray(_csms_log_crscn[:, :-1])
+
+# table interval of every cell of a uniform log energy grid finer than the table
+# (a lookup is much faster than a binary search for unsorted energies)
+_csms_cell_width = np.min(np.diff(_csms_log_energy)) / 2
+_csms_cell_intervals = np.searchsorted(_csms_log_energy, _csms_log_energy[0] + _csms_cell_width * np.arange(
+    int(np.ptp(_csms_log_energy) / _csms_cell_width) + 1), side='right') - 1
+
+csms_extrapolations = (None, 'nan', 'clip', 'extrapolate')
+
+
+def csms(energy, inttype, flavors, extrapolation=None):
     """
     Neutrino cross sections according to
     Amanda Cooper-Sarkar, Philipp Mertsch, Subir Sarkar
     JHEP 08 (2011) 042
-    """
-    if type(inttype) == str:
-        inttype = np.array([inttype] * energy.shape[0])
-
-    if isinstance(flavors, (int, np.integer)):
-        flavors = np.array([flavors] * energy.shape[0])
-
-    neutrino = np.array((
-        [50, 0.32, 0.10],
-        [100, 0.65, 0.20],
-        [200, 1.3, 0.41],
-        [500, 3.2, 1.0],
-        [1000, 6.2, 2.0],
-        [2000, 12., 3.8],
-        [5000, 27., 8.6],
-        [10000, 47., 15.],
-        [20000, 77., 26.],
-        [50000, 140., 49.],
-        [100000, 210., 75.],
-        [200000, 310., 110.],
-        [500000, 490., 180.],
-        [1e6, 690., 260.],
-        [2e6, 950., 360.],
-        [5e6, 1400., 540.],
-        [1e7, 1900., 730.],
-        [2e7, 2600., 980.],
-        [5e7, 3700., 1400.],
-        [1e8, 4800., 1900.],
-        [2e8, 6200., 2400.],
-        [5e8, 8700., 3400.],
-        [1e9, 11000., 4400.],
-        [2e9, 14000., 5600.],
-        [5e9, 19000., 7600.],
-        [1e10, 24000., 9600.],
-        [2e10, 30000., 12000.],
-        [5e10, 39000., 16000.],
-        [1e11, 48000., 20000.],
-        [2e11, 59000., 24000.],
-        [5e11, 75000., 31000.]
-        ))
-
-    neutrino[:, 0] *= units.GeV
-    neutrino[:, 1] *= units.picobarn  # CC
-    neutrino[:, 2] *= units.picobarn  # NC
-
-    neutrino_cc = interp1d(neutrino[:, 0], neutrino[:, 1], bounds_error=True)
-    neutrino_nc = interp1d(neutrino[:, 0], neutrino[:, 2], bounds_error=True)
-
-    antineutrino = np.array((
-        [50, 0.15, 0.05],
-        [100, 0.33, 0.12],
-        [200, 0.69, 0.24],
-        [500, 1.8, 0.61],
-        [1000, 3.6, 1.20],
-        [2000, 7., 2.4],
-        [5000, 17., 5.8],
-        [10000, 31., 11.],
-        [20000, 55., 19.],
-        [50000, 110., 39.],
-        [100000, 180., 64.],
-        [200000, 270., 99.],
-        [500000, 460., 170.],
-        [1e6, 660., 240.],
-        [2e6, 920., 350.],
-        [5e6, 1400., 530.],
-        [1e7, 1900., 730.],
-        [2e7, 2500., 980.],
-        [5e7, 3700., 1400.],
-        [1e8, 4800., 1900.],
-        [2e8, 6200., 2400.],
-        [5e8, 8700., 3400.],
-        [1e9, 11000., 4400.],
-        [2e9, 14000., 5600.],
-        [5e9, 19000., 7600.],
-        [1e10, 24000., 9600.],
-        [2e10, 30000., 12000.],
-        [5e10, 39000., 16000.],
-        [1e11, 48000., 20000.],
-        [2e11, 59000., 24000.],
-        [5e11, 75000., 31000.]
-    ))
-
-    antineutrino[:, 0] *= units.GeV
-    antineutrino[:, 1] *= units.picobarn  # CC
-    antineutrino[:, 2] *= units.picobarn  # NC
-
-    antineutrino_cc = interp1d(antineutrino[:, 0], antineutrino[:, 1], bounds_error=True)
-    antineutrino_nc = interp1d(antineutrino[:, 0], antineutrino[:, 2], bounds_error=True)
-
-    crscn = np.zeros_like(energy)
-
-    particles_cc = np.where((flavors >= 0) & (inttype == 'cc'))
-    particles_nc = np.where((flavors >= 0) & (inttype == 'nc'))
-    antiparticles_cc = np.where((flavors < 0) & (inttype == 'cc'))
-    antiparticles_nc = np.where((flavors < 0) & (inttype == 'nc'))
-#
-    crscn[particles_cc] = neutrino_cc(energy[particles_cc])
-    crscn[particles_nc] = neutrino_nc(energy[particles_nc])
-    crscn[antiparticles_cc] = antineutrino_cc(energy[antiparticles_cc])
-    crscn[antiparticles_nc] = antineutrino_nc(energy[antiparticles_nc])
 
-    return crscn
+    Interpolated in log-log between the tabulated energies (50 GeV - 5e11 GeV),
+    for any mix of neutrinos / anti-neutrinos and CC / NC in one pass.
 
+    Parameters
+    ----------
+    energy, flavors: float / array of floats
+        as in get_nu_cross_section, broadcast against each other
 
-def get_nu_cross_section(energy, flavors, inttype='total', cross_section_type='ctw'):
+    inttype: str, array of str
+        'cc', 'nc' or 'total' (cc + nc); entries of an array that are
+        not 'cc' or 'nc' get 0
+
+    extrapolation: {None, 'nan', 'clip', 'extrapolate'}
+        energies outside of the table raise a ValueError (None), give nan,
+        the cross section at the closest table energy ('clip'), or continue
+        the power law of the first / last table interval ('extrapolate')
+    """
+    if extrapolation not in csms_extrapolations:
+        raise ValueError("Unrecognized extrapolation {}, options are {}".format(extrapolation, csms_extrapolations))
+
+    # rows of the tables are 2 * antiparticle + (inttype == 'nc'), summed over the interactions
+    valid = True
+    if type(inttype) == str:
+        interactions = {'cc': (0,), 'nc': (1,), 'total': (0, 1)}.get(inttype, ())
+    else:
+        inttype = np.asarray(inttype)
+        valid = (inttype == 'cc') | (inttype == 'nc')
+        interactions = (inttype == 'nc',)
+    energy, antiparticle, valid = np.broadcast_arrays(np.asarray(energy, dtype=float), np.asarray(flavors) < 0, valid)
+
+    log_energy = np.log(energy)
+    outside = (log_energy < _csms_log_energy[0]) | (log_energy > _csms_log_energy[-1])
+    if extrapolation is None and np.any(outside):
+        raise ValueError("CSMS cross sections are only tabulated between {:.0f} GeV and {:.0e} GeV".format(
+            np.exp(_csms_log_energy[0]) / units.GeV, np.exp(_csms_log_energy[-1]) / units.GeV))
+    if extrapolation == 'clip':
+        log_energy = np.clip(log_energy, _csms_log_energy[0], _csms_log_energy[-1])
+
+    with np.errstate(invalid='ignore'):
+        cells = ((log_energy - _csms_log_energy[0]) / _csms_cell_width).astype(np.intp)
+    index = _csms_cell_intervals.take(cells, mode='clip')
+    index = np.minimum(index + (log_energy >= _csms_log_energy.take(index + 1, mode='clip')), len(_csms_log_energy) - 2)
+    offset = log_energy - _csms_log_energy.take(index)
+
+    crscn = np.zeros(energy.shape)
+    for interaction in interactions:
+        flat_index = (2 * antiparticle + interaction) * _csms_slopes.shape[1] + index
+        crscn += np.exp(_csms_log_crscn.take(flat_index) + offset * _csms_slopes.take(flat_index))
+    crscn[~valid] = 0
+    if extrapolation == 'nan':
+        crscn[outside] = np.nan
+    return crscn if crscn.ndim else crscn[()]
+
+
+def get_nu_cross_section(energy, flavors, inttype='total', cross_section_type='ctw', extrapolation=None):
     """
     return neutrino cross-section
 
@@ -225,6 +296,9 @@ def get_nu_cross_section(energy, flavors, inttype='total', cross_section_type='c
           only one cross-section for all interactions and flavors
         * csms : A. Cooper-Sarkar, P. Mertsch, S. Sarkar, JHEP 08 (2011) 042
 
+    extrapolation: {None, 'nan', 'clip', 'extrapolate'}
+        only for 'csms', what to do with energies outside of its table, see csms()
+
     """
 
     if cross_section_type == 'ghandi':
@@ -306,7 +380,7 @@ def get_nu_cross_section(energy, flavors, inttype='total', cross_section_type='c
                     crscn[antiparticles_nc] = param(energy[antiparticles_nc], 'nc_bar', parameterization=cross_section_type)
 
     elif cross_section_type == 'csms':
-        crscn = csms(energy, inttype, flavors)
+        crscn = csms(energy, inttype, flavors, extrapolation=extrapolation)
 
     else:
         logger.error("Cross-section {} not defined".format(cross_section_type))
@@ -315,6 +389,135 @@ def get_nu_cross_section(energy, flavors, inttype='total', cross_section_type='c
     return crscn
 
 
+def _coefficient_row(parameterization, inttype):
+    if parameterization not in param_coefficients:
+        logger.error("Parameterization {0} of interaction cross section not defined".format(parameterization))
+        raise NotImplementedError
+    if (parameterization, inttype) not in _coefficient_rows:
+        logger.error("Type {0} of interaction not defined for '{1}'".format(inttype, parameterization))
+        raise NotImplementedError
+    return _coefficient_rows[(parameterization, inttype)]
+
+
+def get_nu_cross_section_fused(energy, flavors, inttype='total', cross_section_type='ctw', chunk_size=16384):
+    """
+    get_nu_cross_section for large mixed flavor / interaction type arrays
+
+    Every (flavor sign, inttype) pair is mapped to a row of one coefficient
+    matrix, so the CTW / BGR18 parameterization is evaluated for the whole
+    array in a single pass (in cache-sized chunks) instead of once per
+    np.where subset. The result equals get_nu_cross_section() for the same
+    arguments; other cross-section types are passed on to it.
+
+    Energies below 1e4 GeV give nan for those entries only (param() sets the
+    whole subset to nan), and entries with an inttype other than 'cc' or
+    'nc' in an inttype array are 0, as in get_nu_cross_section().
+
+    Parameters
+    ----------
+    energy, flavors, inttype, cross_section_type:
+        as in get_nu_cross_section; energy, flavors and an inttype array are broadcast
+
+    chunk_size: int
+        number of entries evaluated at once
+
+    Returns
+    -------
+    crscn: array of floats
+        cross section for every entry
+    """
+    if cross_section_type not in param_coefficients:
+        return get_nu_cross_section(energy, flavors, inttype=inttype, cross_section_type=cross_section_type)
+
+    # rows of the coefficient matrix per term (summed) and code = 2 * antiparticle + (inttype == 'nc')
+    nc = False
+    valid = True
+    if type(inttype) == str:
+        if inttype in ('total', 'total_up', 'total_down'):
+            suffix = inttype[len('total'):]
+            # as in get_nu_cross_section, the NC part of total_up/down is always CTW
+            nc_parameterization = cross_section_type if suffix == '' else 'ctw'
+            rows = [[_coefficient_row(parameterization, interaction + bar + suffix) for bar in ('', '_bar') for _ in range(2)]
+                    for parameterization, interaction in ((nc_parameterization, 'nc'), (cross_section_type, 'cc'))]
+        else:
+            rows = [[_coefficient_row(cross_section_type, inttype)] * 4]
+    else:
+        inttype = np.asarray(inttype)
+        nc = inttype == 'nc'
+        valid = nc | (inttype == 'cc')
+        rows = [[_coefficient_row(cross_section_type, interaction + bar) for bar in ('', '_bar') for interaction in ('cc', 'nc')]]
+
+    if np.ndim(flavors) == 0 and type(inttype) == str:
+        # a single row per term
+        rows = [[term_rows[2 * int(flavors < 0)]] * 4 for term_rows in rows]
+
+    energy, antiparticle, nc, valid = np.broadcast_arrays(np.asarray(energy, dtype=float), np.asarray(flavors) < 0, nc, valid)
+    shape = energy.shape
+    energy = energy.ravel()
+    codes = 2 * antiparticle.ravel().astype(np.intp)
+    codes += nc.ravel()
+    # coefficients that are the same for all codes are used as scalars, the others are gathered
+    coefficients = [[coefficient[0] if np.all(coefficient == coefficient[0]) else coefficient
+                     for coefficient in _coefficient_matrix[:, term_rows]] for term_rows in rows]
+
+    # evaluated in chunks that fit in the cache, with the same operations as param(), so the result is identical
+    crscn = np.zeros(energy.shape)
+    buffers = np.empty((9, min(len(energy), chunk_size)))
+    for start in range(0, len(energy), chunk_size):
+        stop = min(start + chunk_size, len(energy))
+        buffer = buffers[:, :stop - start]
+        epsilon = np.log10(np.divide(energy[start:stop], units.GeV, out=buffer[0]), out=buffer[0])
+        for term_coefficients in coefficients:
+            c0, c1, c2, c3, c4 = [coefficient if np.ndim(coefficient) == 0 else coefficient.take(codes[start:stop], out=out)
+                                  for coefficient, out in zip(term_coefficients, buffer[1:6])]
+            with np.errstate(invalid='ignore'):
+                l_eps = np.log(np.subtract(epsilon, c0, out=buffer[6]), out=buffer[6])
+            term = np.multiply(c2, l_eps, out=buffer[7])
+            term += c1
+            term += np.multiply(np.square(l_eps, out=buffer[8]), c3, out=buffer[8])
+            term += np.divide(c4, l_eps, out=buffer[8])
+            np.power(10, term, out=term)
+            term *= units.cm ** 2
+            crscn[start:stop] += term
+
+    invalid = energy < 1e4 * units.GeV
+    if np.any(invalid):
+        logger.warning(f"CTW / BGR neutrino nucleon cross sections not valid for energies below 1e4 GeV, ({energy[invalid]/units.GeV}GeV was requested)")
+        crscn[invalid] = np.nan
+    if not np.all(valid):
+        crscn[~valid.ravel()] = 0
+    return crscn.reshape(shape)
+
+
+# get_interaction_length memo: LRU of the most recent arguments, keyed on a fingerprint of the arrays
+interaction_length_cache_size = 128
+_interaction_length_cache = collections.OrderedDict()
+_interaction_length_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _fingerprint(value):
+    """hashable key of an argument; arrays by shape, dtype and a hash of their bytes"""
+    if isinstance(value, (np.ndarray, list, tuple)):
+        value = np.ascontiguousarray(value)
+        return (value.shape, value.dtype.str, hashlib.blake2b(value, digest_size=16).digest())
+    return value
+
+
+def _copy(value):
+    return value.copy() if isinstance(value, np.ndarray) else value
+
+
+def interaction_length_cache_info():
+    """hits, misses, current and maximum size of the get_interaction_length memo"""
+    return dict(_interaction_length_cache_stats, size=len(_interaction_length_cache),
+                maxsize=interaction_length_cache_size)
+
+
+def clear_interaction_length_cache():
+    _interaction_length_cache.clear()
+    _interaction_length_cache_stats.update(hits=0, misses=0)
+
+
 def get_interaction_length(Enu, density=.917 * units.g / units.cm ** 3, flavor=12, inttype='total',
                            cross_section_type='ctw'):
     """
@@ -353,14 +556,111 @@ def get_interaction_length(Enu, density=.917 * units.g / units.cm ** 3, flavor=1
     Returns
     -------
     L_int: float
-        interaction length
+        interaction length; arrays are copies of the memoized one
+        (see interaction_length_cache_info), so they can be modified
 
     """
+    key = tuple(_fingerprint(value) for value in (Enu, density, flavor, inttype, cross_section_type))
+    if key in _interaction_length_cache:
+        _interaction_length_cache_stats["hits"] += 1
+        _interaction_length_cache.move_to_end(key)
+        return _copy(_interaction_length_cache[key])
+    _interaction_length_cache_stats["misses"] += 1
+
+    L_int = interaction_length(get_nu_cross_section(Enu, flavors=flavor, inttype=inttype, cross_section_type=cross_section_type),
+                               density=density)
+    if interaction_length_cache_size > 0:
+        _interaction_length_cache[key] = _copy(L_int)
+        while len(_interaction_length_cache) > interaction_length_cache_size:
+            _interaction_length_cache.popitem(last=False)
+    return L_int
+
+
+def interaction_length(crscn, density=.917 * units.g / units.cm ** 3):
+    """
+    interaction length for a cross section (array), e.g. the columns of a
+    get_nu_cross_section_ensemble
+
+    Parameters
+    ----------
+    crscn: float / array of floats
+        neutrino cross section
+    density: float (optional)
+        density of the medium, default density of ice = 0.917 g/cm**3
+    """
+    from scipy import constants
     m_n = constants.m_p * units.kg  # nucleon mass, assuming proton mass
-    L_int = m_n / get_nu_cross_section(Enu, flavors=flavor, inttype=inttype, cross_section_type=cross_section_type) / density
+    L_int = m_n / crscn / density
     return L_int
 
 
+# variants of get_nu_cross_section_ensemble: cross_section_type and the suffix of inttype
+cross_section_variants = {
+    'ctw': ('ctw', ''),
+    'ctw_up': ('ctw', '_up'),
+    'ctw_down': ('ctw', '_down'),
+    'hedis_bgr18': ('hedis_bgr18', ''),
+    'csms': ('csms', ''),
+    'ghandi': ('ghandi', ''),
+}
+
+
+def _bound_cross_section(energy, flavors, inttype, suffix):
+    """
+    CTW upper / lower bound (suffix '_up' / '_down') for an array of 'cc' / 'nc',
+    which the array path of get_nu_cross_section_fused does not know
+    """
+    inttype = np.asarray(inttype)
+    antiparticle = np.asarray(flavors) < 0
+    crscn = 0
+    for interaction in ('cc', 'nc'):
+        for bar in ('', '_bar'):
+            selected = (inttype == interaction) & (antiparticle == (bar == '_bar'))
+            crscn = np.where(selected, get_nu_cross_section_fused(energy, flavors, interaction + bar + suffix), crscn)
+    return crscn
+
+
+def get_nu_cross_section_ensemble(energy, flavors=12, inttype='total', variants=tuple(cross_section_variants),
+                                  extrapolation='nan'):
+    """
+    neutrino cross section of every model variant, to estimate the cross-section uncertainty
+
+    Parameters
+    ----------
+    energy, flavors, inttype:
+        as in get_nu_cross_section; 'ctw_up' / 'ctw_down' use inttype + '_up' / '_down'
+        (e.g. 'total_up'), the upper and lower CTW bounds, also for every entry
+        of an array of 'cc' / 'nc'
+    variants: tuple of str
+        keys of cross_section_variants, all by default
+    extrapolation: {None, 'nan', 'clip', 'extrapolate'}
+        for 'csms', see csms(); by default energies outside of its table are nan,
+        which get_limit_band skips
+
+    Returns
+    -------
+    ensemble: structured array
+        one float field per variant, with the shape of the cross section,
+        e.g. ensemble['ctw_up']; fluxes.get_limit_flux takes it as nuCrsScn
+    """
+    columns = []
+    for variant in variants:
+        if variant not in cross_section_variants:
+            raise ValueError("Unrecognized cross-section variant {}, options are {}".format(variant, tuple(cross_section_variants)))
+        cross_section_type, suffix = cross_section_variants[variant]
+        if cross_section_type == 'csms':
+            columns.append(get_nu_cross_section(energy, flavors, inttype, cross_section_type, extrapolation=extrapolation))
+        elif suffix and type(inttype) != str:
+            columns.append(_bound_cross_section(energy, flavors, inttype, suffix))
+        else:
+            columns.append(get_nu_cross_section_fused(energy, flavors, inttype + suffix if suffix else inttype, cross_section_type))
+
+    ensemble = np.empty(np.shape(columns[0]), dtype=[(variant, float) for variant in variants])
+    for variant, column in zip(variants, columns):
+        ensemble[variant] = column
+    return ensemble
+
+
 if __name__ == "__main__":  # this part of the code gets only executed it the script is directly called
 
     n_points = 100
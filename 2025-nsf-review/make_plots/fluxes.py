@@ -1,10 +1,56 @@
+import importlib.util
+import os
 import numpy as np
-import scipy.constants
+from numpy.lib import recfunctions
 import units
 import cross_sections
 import logging
 logger = logging.getLogger('fluxes')
 
+# the Veff store (veff_store.py and its veff_tables.npz) is shared with computing_stuff
+veff_store_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'computing_stuff', 'veff_store.py')
+_veff_store_module = None
+
+
+def get_veff_store():
+    """
+    the Veff store of computing_stuff (its default veff_tables.npz)
+
+    veff_store.py is loaded from its path on first use, without adding
+    computing_stuff to sys.path, where its limits.py / rnog.py could
+    shadow other modules
+    """
+    global _veff_store_module
+    if _veff_store_module is None:
+        spec = importlib.util.spec_from_file_location("veff_store", veff_store_file)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _veff_store_module = module
+    return _veff_store_module.get_store()
+
+
+def _is_ensemble(nuCrsScn):
+    return isinstance(nuCrsScn, np.ndarray) and nuCrsScn.dtype.names is not None
+
+
+def _interaction_length(energy, nuCrsScn, inttype):
+    """
+    interaction length for a cross-section type, or for every variant of a
+    cross-section ensemble (cross_sections.get_nu_cross_section_ensemble),
+    stacked along a leading axis
+    """
+    if _is_ensemble(nuCrsScn):
+        crscn = np.moveaxis(recfunctions.structured_to_unstructured(nuCrsScn), -1, 0)
+        return cross_sections.interaction_length(crscn)
+    return cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype)
+
+
+def _per_variant(limit, nuCrsScn):
+    """limits stacked by _interaction_length back as a structured array with one field per variant"""
+    if _is_ensemble(nuCrsScn):
+        return recfunctions.unstructured_to_structured(np.moveaxis(limit, 0, -1), dtype=nuCrsScn.dtype)
+    return limit
+
 
 def get_limit_from_aeff(energy, aeff,
                         livetime,
@@ -58,8 +104,9 @@ def get_limit_flux(energy, veff_sr,
     ----------
     energy: array of floats
         neutrino energy
-    veff_sr: array of floats
-        effective volume x solid angle
+    veff_sr: array of floats or str
+        effective volume x solid angle,
+        or the name of a table in the Veff store (see computing_stuff/veff_store.py)
     livetime: float
         time used
     signalEff: float
@@ -69,21 +116,27 @@ def get_limit_flux(energy, veff_sr,
     upperLimOnEvents: float
          2.3 for Neyman UL w/ 0 background,
          2.44 for F-C UL w/ 0 background, etc
-    nuCrsScn: str
-        type of neutrino cross-section
+    nuCrsScn: str or structured array
+        type of neutrino cross-section, or a cross-section ensemble
+        (cross_sections.get_nu_cross_section_ensemble(energy)), which gives
+        a structured array with the limit for every variant
 
 
     """
 
+    if isinstance(veff_sr, str):
+        # the store is in GeV and km^3 sr
+        veff_sr = get_veff_store().veff(veff_sr, energy / units.GeV) * units.km ** 3 * units.sr
+
     evtsPerFluxPerEnergy = veff_sr * signalEff
     evtsPerFluxPerEnergy *= livetime
-    evtsPerFluxPerEnergy /= cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype)
+    evtsPerFluxPerEnergy = evtsPerFluxPerEnergy / _interaction_length(energy, nuCrsScn, inttype)
 
     ul = upperLimOnEvents / evtsPerFluxPerEnergy
     ul *= energyBinsPerDecade / np.log(10)
     ul /= energy
 
-    return ul
+    return _per_variant(ul, nuCrsScn)
 
 # def get_integrated_limit_flux(energy, veff,
 #                               livetime,
@@ -152,20 +205,20 @@ def get_limit_e1_flux(energy, veff_sr,
     upperLimOnEvents: float
          2.3 for Neyman UL w/ 0 background,
          2.44 for F-C UL w/ 0 background, etc
-    nuCrsScn: str
-        type of neutrino cross-section
+    nuCrsScn: str or structured array
+        type of neutrino cross-section, or a cross-section ensemble (see get_limit_flux)
 
 
     """
 
     evtsPerFluxPerEnergy = veff_sr * signalEff
     evtsPerFluxPerEnergy *= livetime
-    evtsPerFluxPerEnergy /= cross_sections.get_interaction_length(energy, cross_section_type=nuCrsScn, inttype=inttype)
+    evtsPerFluxPerEnergy = evtsPerFluxPerEnergy / _interaction_length(energy, nuCrsScn, inttype)
 
     ul = upperLimOnEvents / evtsPerFluxPerEnergy
     ul *= energyBinsPerDecade / np.log(10)
 
-    return ul
+    return _per_variant(ul, nuCrsScn)
 
 
 def get_limit_e2_flux(energy, veff_sr,
@@ -193,13 +246,34 @@ def get_limit_e2_flux(energy, veff_sr,
     upperLimOnEvents: float
          2.3 for Neyman UL w/ 0 background,
          2.44 for F-C UL w/ 0 background, etc
-    nuCrsScn: str
-        type of neutrino cross-section
+    nuCrsScn: str or structured array
+        type of neutrino cross-section, or a cross-section ensemble (see get_limit_flux)
+
+
+    """
+    limit = get_limit_flux(energy, veff_sr, livetime, signalEff, energyBinsPerDecade, upperLimOnEvents, nuCrsScn, inttype)
+    if _is_ensemble(nuCrsScn):
+        return recfunctions.unstructured_to_structured(
+            np.asarray(energy)[..., np.newaxis] ** 2 * recfunctions.structured_to_unstructured(limit), dtype=limit.dtype)
+    return energy ** 2 * limit
 
 
+def get_limit_band(limits):
+    """
+    lower and upper limit over the variants of a limit from a cross-section ensemble
+
+    Parameters
+    ----------
+    limits: structured array
+        e.g. get_limit_e2_flux(energy, veff_sr, livetime, nuCrsScn=cross_sections.get_nu_cross_section_ensemble(energy))
+
+    Returns
+    -------
+    lower, upper: arrays of floats
+        to draw with fill_between
     """
-    return energy ** 2 * get_limit_flux(energy, veff_sr, livetime, signalEff, energyBinsPerDecade, upperLimOnEvents,
-                                        nuCrsScn, inttype)
+    stacked = recfunctions.structured_to_unstructured(limits)
+    return np.nanmin(stacked, axis=-1), np.nanmax(stacked, axis=-1)
 
 
 def get_number_of_events_for_flux(energies, flux, Veff, livetime, nuCrsScn='ctw'):
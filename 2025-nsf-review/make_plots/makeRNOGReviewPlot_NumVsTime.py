@@ -5,6 +5,8 @@ from pylab import setp
 
 from scipy import interpolate
 
+import fluxes
+
 NucleonMass = 1.67e-24 #nucleon mass in grams
 EarthDensity = 3.8 #g/cm^2
 
@@ -176,25 +178,29 @@ def beautify_counts(this_ax):
 energies = np.asarray([ 3.162e+07,  1.000e+08,  3.162e+08,  1.000e+09,  3.162e+09,
         1.000e+10,  3.162e+10,  1.000e+11]) * 1E9
 
+# Veff (km^3 sr) per DAQ from the Veff store, see computing_stuff/veff_store.py;
+# the grid is the tables' half decades rounded to 4 digits, so its ends are clipped back into the tables
+veff_store = fluxes.get_veff_store()
+veff_tables = {"hilo": "deep_high_low_1Hz", "pa": "simple_threshold_2.5", "didaq": "simple_threshold_2"}
+veffs = {}
+for daq, name in veff_tables.items():
+    table_energies = veff_store.table(name)["energy"]
+    veffs[daq] = veff_store.veff(name, np.clip(energies/1E9, table_energies[0], table_energies[-1]))
+
+# station-years per DAQ at the start of every year: the Hi/Lo livetime on disk (2031 days) plus 4 more,
+# 4 per year of PA, and DiDAQ at 2/3 uptime on 5, 11, 17, 23 and then 27 stations
+didaq_stations = {2026: 5, 2027: 11, 2028: 17, 2029: 23}
+livetime = {}
+for y in range(2024, 2041):
+    livetime[y] = {
+        "hilo": 2031/365. + (4. if y >= 2025 else 0.),
+        "pa": 4.*(y - 2024),
+        "didaq": sum(2/3*didaq_stations.get(year, 27) for year in range(2026, y+1)),
+    }
+
 # units of cm3 sr seconds
-data = {2024: np.asarray([ 8.591e+20,  8.472e+21,  4.895e+22,  2.069e+23,  6.410e+23,
-        1.586e+24,  4.333e+24,  7.687e+24]), 2025: np.asarray([ 5.097e+21,  4.118e+22,  1.879e+23,  7.028e+23,  2.092e+24,
-        4.804e+24,  1.204e+25,  2.132e+25]), 2026: np.asarray([ 1.345e+22,  9.853e+22,  4.104e+23,  1.416e+24,  4.061e+24,
-        8.918e+24,  2.103e+25,  3.693e+25]), 2027: np.asarray([ 2.750e+22,  1.928e+23,  7.754e+23,  2.568e+24,  7.207e+24,
-        1.547e+25,  3.532e+25,  6.155e+25]), 2028: np.asarray([ 4.722e+22,  3.239e+23,  1.283e+24,  4.160e+24,  1.153e+25,
-        2.447e+25,  5.490e+25,  9.517e+25]), 2029: np.asarray([ 7.263e+22,  4.919e+23,  1.933e+24,  6.191e+24,  1.703e+25,
-        3.592e+25,  7.977e+25,  1.378e+26]), 2030: np.asarray([ 1.018e+23,  6.845e+23,  2.678e+24,  8.515e+24,  2.331e+25,
-        4.899e+25,  1.082e+26,  1.864e+26]), 2031: np.asarray([ 1.310e+23,  8.771e+23,  3.423e+24,  1.084e+25,  2.959e+25,
-        6.206e+25,  1.366e+26,  2.351e+26]), 2032: np.asarray([ 1.602e+23,  1.070e+24,  4.168e+24,  1.316e+25,  3.587e+25,
-        7.513e+25,  1.650e+26,  2.837e+26]), 2033: np.asarray([ 1.894e+23,  1.262e+24,  4.913e+24,  1.549e+25,  4.215e+25,
-        8.820e+25,  1.934e+26,  3.323e+26]), 2034: np.asarray([ 2.186e+23,  1.455e+24,  5.658e+24,  1.781e+25,  4.844e+25,
-        1.013e+26,  2.218e+26,  3.810e+26]), 2035: np.asarray([ 2.478e+23,  1.648e+24,  6.403e+24,  2.013e+25,  5.472e+25,
-        1.143e+26,  2.502e+26,  4.296e+26]), 2036: np.asarray([ 2.770e+23,  1.840e+24,  7.148e+24,  2.246e+25,  6.100e+25,
-        1.274e+26,  2.786e+26,  4.783e+26]), 2037: np.asarray([ 3.062e+23,  2.033e+24,  7.892e+24,  2.478e+25,  6.728e+25,
-        1.405e+26,  3.070e+26,  5.269e+26]), 2038: np.asarray([ 3.354e+23,  2.225e+24,  8.637e+24,  2.711e+25,  7.356e+25,
-        1.536e+26,  3.354e+26,  5.755e+26]), 2039: np.asarray([ 3.646e+23,  2.418e+24,  9.382e+24,  2.943e+25,  7.985e+25,
-        1.666e+26,  3.638e+26,  6.242e+26]), 2040: np.asarray([ 3.938e+23,  2.611e+24,  1.013e+25,  3.175e+25,  8.613e+25,
-        1.797e+26,  3.922e+26,  6.728e+26])}
+km3_sr_yr_to_cm3_sr_s = 1E15 * (86400 * 365)
+data = {y: sum(livetime[y][daq]*veffs[daq] for daq in veffs) * km3_sr_yr_to_cm3_sr_s for y in livetime}
 
 
 logeV = np.log10(energies)
@@ -13,8 +13,6 @@ livetime = 10 * units.year
 plotUnitsLivetime = '5 years or 100 days'
 #=================
 
-from scipy.interpolate import interp1d
-
 
 def get_TAGZK_flux(energy):
     """
@@ -24,6 +22,7 @@ def get_TAGZK_flux(energy):
     TA_data = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "TA_combined_fit_m3.txt"))
     E = TA_data[:, 0] * units.GeV
     f = TA_data[:, 1] * plotUnitsFlux / E ** 2
+    from scipy.interpolate import interp1d
     get_TAGZK_flux = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return get_TAGZK_flux(energy)
 
@@ -36,6 +35,7 @@ def get_TAGZK_flux_ICRC2021(energy):
     TA_data = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "TA_GZKprediction_ICRC2021.txt"))
     E = TA_data[:, 0] * units.GeV
     f = TA_data[:, 1] * plotUnitsFlux / E ** 2
+    from scipy.interpolate import interp1d
     get_TAGZK_flux = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return get_TAGZK_flux(energy)
 
@@ -47,6 +47,7 @@ def get_proton_10(energy):
     vanVliet_reas = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "ReasonableNeutrinos1.txt"))
     E = vanVliet_reas[0, :] * units.GeV
     f = vanVliet_reas[1, :] * plotUnitsFlux / E ** 2
+    from scipy.interpolate import interp1d
     getE = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return getE(energy)
 
@@ -55,6 +56,7 @@ def get_GZK_Auger_best_fit(energy):
     Heinze_band = np.loadtxt(os.path.join(os.path.dirname(__file__), 'data', "talys_neu_bands.out"))
     E = Heinze_band[:, 0] * units.GeV
     f = Heinze_band[:, 1] / units.GeV / units.cm ** 2 / units.s / units.sr
+    from scipy.interpolate import interp1d
     getE = interp1d(E, f, bounds_error=False, fill_value="extrapolate")
     return getE(energy)
 
@@ -0,0 +1,278 @@
+import numpy as np
+
+import cross_sections
+import units
+
+'''
+Check the fast cross-section paths in cross_sections.py against
+get_nu_cross_section and the baseline formulas they replace.
+Run with `python -m pytest` from this directory.
+'''
+
+# coefficients of the original param(), (c0, ..., c4)
+reference_coefficients = {
+    'ctw': {
+        'cc': (-1.826, -17.31, -6.406, 1.431, -17.91),
+        'nc': (-1.826, -17.31, -6.448, 1.431, -18.61),
+        'cc_bar': (-1.033, -15.95, -7.247, 1.569, -17.72),
+        'nc_bar': (-1.033, -15.95, -7.296, 1.569, -18.30),
+        'nc_up': (-1.456, 32.23, -32.32, 5.881, -49.41),
+        'cc_up': (-1.456, 33.47, -33.02, 6.026, -49.41),
+        'nc_bar_up': (-2.945, 143.2, -76.70, 11.75, -142.8),
+        'cc_bar_up': (-2.945, 144.5, -77.44, 11.9, -142.8),
+        'nc_down': (-15.35, 16.16, 37.71, -8.801, -253.1),
+        'cc_down': (-15.35, 13.86, 39.84, -9.205, -253.1),
+        'nc_bar_down': (-13.08, 15.17, 31.19, -7.757, -216.1),
+        'cc_bar_down': (-13.08, 12.48, 33.52, -8.191, -216.1),
+    },
+    'hedis_bgr18': {
+        'cc': (-1.6049779136562436, -17.7480299104706, -6.748861524562085, 1.5569481852252935, -16.545379184836094),
+        'nc': (-1.9625311094497564, -17.576550328008224, -6.444583672267122, 1.4702739736023922, -18.6167800243672),
+        'cc_bar': (-2.28879962998228, -15.725804320703244, -5.273935123272873, 1.0314821502761589, -23.15773837113476),
+        'nc_bar': (-2.582585867636026, -15.742658435090945, -5.075692336968196, 0.9963850387362603, -24.870843546539973),
+    },
+}
+
+
+def reference_param(energy, inttype, parameterization='ctw'):
+    c = reference_coefficients[parameterization][inttype]
+    epsilon = np.log10(energy / units.GeV)
+    l_eps = np.log(epsilon - c[0])
+    crscn = c[1] + c[2] * l_eps + c[3] * l_eps ** 2 + c[4] / l_eps
+    return np.power(10, crscn) * units.cm ** 2
+
+
+def reference_cross_section(energy, flavors, inttype, parameterization='ctw'):
+    """entry by entry, with the interaction types written out; 'total...' only as a string"""
+    crscn = np.zeros(len(energy))
+    for i, (e, flavor, interaction) in enumerate(zip(energy, flavors, np.broadcast_to(inttype, len(energy)))):
+        bar = '_bar' if flavor < 0 else ''
+        if interaction in ('cc', 'nc'):
+            crscn[i] = reference_param(e, interaction + bar, parameterization)
+        elif isinstance(inttype, str) and interaction.startswith('total'):
+            suffix = interaction[len('total'):]
+            crscn[i] = reference_param(e, 'cc' + bar + suffix, parameterization) \
+                + reference_param(e, 'nc' + bar + suffix, 'ctw' if suffix else parameterization)
+    return crscn
+
+
+rng = np.random.default_rng(0)
+energies = 10 ** rng.uniform(4.5, 12, 1000) * units.GeV
+flavors = rng.choice([12, -12, 14, -14, 16, -16], 1000)
+inttypes = rng.choice(['cc', 'nc'], 1000)
+
+
+def test_param_matches_reference():
+    for parameterization, coefficients in reference_coefficients.items():
+        for inttype in coefficients:
+            assert np.allclose(cross_sections.param(energies, inttype, parameterization),
+                               reference_param(energies, inttype, parameterization), rtol=1e-12, atol=0)
+
+
+def test_fused_matches_get_nu_cross_section():
+    for cross_section_type in ('ctw', 'hedis_bgr18'):
+        cases = [(energies, flavors, inttypes), (energies, flavors, 'total'), (energies, flavors, 'cc'),
+                 (energies, 14, inttypes), (energies, -14, 'nc'), (energies, -16, 'total')]
+        if cross_section_type == 'ctw':
+            cases += [(energies, flavors, 'total_up'), (energies, flavors, 'total_down'), (energies, 12, 'total_up')]
+        for energy, flavor, inttype in cases:
+            fused = cross_sections.get_nu_cross_section_fused(energy, flavor, inttype, cross_section_type, chunk_size=100)
+            looped = cross_sections.get_nu_cross_section(energy, flavor, inttype, cross_section_type)
+            assert fused.shape == energy.shape
+            assert np.array_equal(fused, looped)
+
+
+def test_fused_is_bit_identical_on_many_entries():
+    many = np.random.default_rng(1)
+    energy = 10 ** many.uniform(4.5, 12, 200000) * units.GeV
+    flavor = many.choice([12, -12, 14, -14, 16, -16], 200000)
+    inttype = many.choice(['cc', 'nc'], 200000)
+    for cross_section_type in ('ctw', 'hedis_bgr18'):
+        for interaction in (inttype, 'total'):
+            assert np.array_equal(cross_sections.get_nu_cross_section_fused(energy, flavor, interaction, cross_section_type),
+                                  cross_sections.get_nu_cross_section(energy, flavor, interaction, cross_section_type))
+
+
+def test_fused_matches_reference():
+    for cross_section_type in ('ctw', 'hedis_bgr18'):
+        for inttype in (inttypes, 'total'):
+            fused = cross_sections.get_nu_cross_section_fused(energies, flavors, inttype, cross_section_type)
+            assert np.allclose(fused, reference_cross_section(energies, flavors, inttype, cross_section_type),
+                               rtol=1e-12, atol=0)
+    for suffix in ('_up', '_down'):
+        fused = cross_sections.get_nu_cross_section_fused(energies, flavors, 'total' + suffix)
+        assert np.allclose(fused, reference_cross_section(energies, flavors, 'total' + suffix),
+                           rtol=1e-12, atol=0)
+
+
+def test_fused_scalar_and_low_energies():
+    fused = cross_sections.get_nu_cross_section_fused(1e9 * units.GeV, -12, 'total')
+    assert np.ndim(fused) == 0
+    assert np.array_equal(fused, cross_sections.get_nu_cross_section(1e9 * units.GeV, -12, 'total'))
+    assert np.isclose(fused, reference_param(1e9 * units.GeV, 'cc_bar') + reference_param(1e9 * units.GeV, 'nc_bar'),
+                      rtol=1e-12, atol=0)
+
+    # 'total' is only known as a string; in an array it gives 0 like any other unknown entry
+    fused = cross_sections.get_nu_cross_section_fused(energies, flavors, np.full(1000, 'total'))
+    assert np.all(fused == 0)
+
+    # below 1e4 GeV everything is nan, as in get_nu_cross_section
+    energy = np.geomspace(1e2, 9e3, 20) * units.GeV
+    for inttype in ('total', inttypes[:20]):
+        fused = cross_sections.get_nu_cross_section_fused(energy, flavors[:20], inttype)
+        assert np.array_equal(fused, cross_sections.get_nu_cross_section(energy, flavors[:20], inttype), equal_nan=True)
+
+    # with some energies below 1e4 GeV only those entries are nan
+    energy = np.array([1e3, 1e6, 5e3, 1e8]) * units.GeV
+    fused = cross_sections.get_nu_cross_section_fused(energy, 14, np.array(['cc', 'nc', 'cc', 'xx']))
+    assert np.all(np.isnan(fused[[0, 2]]))
+    assert np.isclose(fused[1], reference_param(energy[1], 'nc'), rtol=1e-12, atol=0)
+    assert fused[3] == 0
+
+
+# the original CSMS tables: energy [GeV], CC and NC cross sections [pb], interpolated linearly
+reference_csms = {
+    'neutrino': np.array((
+        [50, 0.32, 0.10], [100, 0.65, 0.20], [200, 1.3, 0.41], [500, 3.2, 1.0], [1000, 6.2, 2.0],
+        [2000, 12., 3.8], [5000, 27., 8.6], [10000, 47., 15.], [20000, 77., 26.], [50000, 140., 49.],
+        [100000, 210., 75.], [200000, 310., 110.], [500000, 490., 180.], [1e6, 690., 260.], [2e6, 950., 360.],
+        [5e6, 1400., 540.], [1e7, 1900., 730.], [2e7, 2600., 980.], [5e7, 3700., 1400.], [1e8, 4800., 1900.],
+        [2e8, 6200., 2400.], [5e8, 8700., 3400.], [1e9, 11000., 4400.], [2e9, 14000., 5600.], [5e9, 19000., 7600.],
+        [1e10, 24000., 9600.], [2e10, 30000., 12000.], [5e10, 39000., 16000.], [1e11, 48000., 20000.],
+        [2e11, 59000., 24000.], [5e11, 75000., 31000.])),
+    'antineutrino': np.array((
+        [50, 0.15, 0.05], [100, 0.33, 0.12], [200, 0.69, 0.24], [500, 1.8, 0.61], [1000, 3.6, 1.20],
+        [2000, 7., 2.4], [5000, 17., 5.8], [10000, 31., 11.], [20000, 55., 19.], [50000, 110., 39.],
+        [100000, 180., 64.], [200000, 270., 99.], [500000, 460., 170.], [1e6, 660., 240.], [2e6, 920., 350.],
+        [5e6, 1400., 530.], [1e7, 1900., 730.], [2e7, 2500., 980.], [5e7, 3700., 1400.], [1e8, 4800., 1900.],
+        [2e8, 6200., 2400.], [5e8, 8700., 3400.], [1e9, 11000., 4400.], [2e9, 14000., 5600.], [5e9, 19000., 7600.],
+        [1e10, 24000., 9600.], [2e10, 30000., 12000.], [5e10, 39000., 16000.], [1e11, 48000., 20000.],
+        [2e11, 59000., 24000.], [5e11, 75000., 31000.])),
+}
+
+
+def reference_csms_linear(energy, inttype, flavor):
+    table = reference_csms['antineutrino' if flavor < 0 else 'neutrino']
+    column = {'cc': 1, 'nc': 2}[inttype]
+    assert np.all((energy >= table[0, 0] * units.GeV) & (energy <= table[-1, 0] * units.GeV))
+    return np.interp(energy, table[:, 0] * units.GeV, table[:, column] * units.picobarn)
+
+
+def test_csms_matches_table_at_nodes():
+    for particle, flavor in (('neutrino', 14), ('antineutrino', -14)):
+        nodes = reference_csms[particle][:, 0] * units.GeV
+        for inttype in ('cc', 'nc'):
+            assert np.allclose(cross_sections.csms(nodes, inttype, flavor),
+                               reference_csms_linear(nodes, inttype, flavor), rtol=1e-12, atol=0)
+
+
+def test_csms_between_nodes():
+    # log-log instead of linear interpolation moves points between the nodes by less than 3%
+    energy = np.geomspace(50, 5e11, 20001) * units.GeV
+    for flavor in (12, -12):
+        for inttype in ('cc', 'nc'):
+            assert np.allclose(cross_sections.csms(energy, inttype, flavor),
+                               reference_csms_linear(energy, inttype, flavor), rtol=0.03, atol=0)
+
+    # a mix of flavors and interaction types in one call, in any order
+    energy = rng.permutation(energy)[:1000]
+    mixed = cross_sections.csms(energy, inttypes, flavors)
+    for inttype in ('cc', 'nc'):
+        for flavor in (12, -12):
+            selected = (inttypes == inttype) & ((flavors < 0) == (flavor < 0))
+            assert np.array_equal(mixed[selected], cross_sections.csms(energy[selected], inttype, flavor))
+    total = cross_sections.get_nu_cross_section(energy, flavors, 'total', 'csms')
+    assert np.allclose(total, cross_sections.csms(energy, 'cc', flavors) + cross_sections.csms(energy, 'nc', flavors),
+                       rtol=1e-12, atol=0)
+
+
+def test_csms_extrapolation():
+    energy = np.array([10, 50, 1e6, 5e11, 1e12]) * units.GeV
+    with np.testing.assert_raises(ValueError):
+        cross_sections.csms(energy, 'cc', 14)
+    with np.testing.assert_raises(ValueError):
+        cross_sections.csms(energy[1:4], 'cc', 14, extrapolation='linear')
+
+    inside = cross_sections.csms(energy[1:4], 'cc', 14)
+    nan = cross_sections.csms(energy, 'cc', 14, extrapolation='nan')
+    assert np.all(np.isnan(nan[[0, 4]]))
+    assert np.array_equal(nan[1:4], inside)
+
+    clip = cross_sections.csms(energy, 'cc', 14, extrapolation='clip')
+    assert np.array_equal(clip, inside[[0, 0, 1, 2, 2]])
+
+    # the power law of the first / last table interval continues
+    extrapolated = cross_sections.csms(energy, 'cc', 14, extrapolation='extrapolate')
+    table = reference_csms['neutrino']
+    assert np.isclose(extrapolated[0], 0.32 * units.picobarn * (0.65 / 0.32) ** np.log2(10 / 50), rtol=1e-12, atol=0)
+    assert np.isclose(extrapolated[4], table[-1, 1] * units.picobarn * (75000. / 59000.) ** (np.log(2) / np.log(2.5)),
+                      rtol=1e-12, atol=0)
+    assert np.array_equal(extrapolated[1:4], inside)
+
+
+def test_ensemble_matches_variants():
+    energy = np.geomspace(1e5, 1e11, 61) * units.GeV
+    for flavor, inttype in ((12, 'total'), (-14, 'cc'), (flavors[:61], 'nc')):
+        ensemble = cross_sections.get_nu_cross_section_ensemble(energy, flavor, inttype)
+        assert ensemble.dtype.names == tuple(cross_sections.cross_section_variants)
+        assert ensemble.shape == energy.shape
+        for variant, (cross_section_type, suffix) in cross_sections.cross_section_variants.items():
+            single = cross_sections.get_nu_cross_section(energy, flavor, inttype + suffix, cross_section_type)
+            assert np.allclose(ensemble[variant], single, rtol=1e-12, atol=0)
+
+    # an array of cc / nc gets the bound of every entry's interaction and particle type
+    ensemble = cross_sections.get_nu_cross_section_ensemble(energy, flavors[:61], inttypes[:61])
+    for variant in ('ctw', 'hedis_bgr18', 'csms', 'ghandi'):
+        cross_section_type = cross_sections.cross_section_variants[variant][0]
+        single = cross_sections.get_nu_cross_section(energy, flavors[:61], inttypes[:61], cross_section_type)
+        assert np.array_equal(ensemble[variant], single)
+    for suffix in ('_up', '_down'):
+        bound = [reference_param(e, interaction + ('_bar' if flavor < 0 else '') + suffix)
+                 for e, flavor, interaction in zip(energy, flavors[:61], inttypes[:61])]
+        assert np.all(ensemble['ctw' + suffix] > 0)
+        assert np.allclose(ensemble['ctw' + suffix], bound, rtol=1e-12, atol=0)
+
+    ensemble = cross_sections.get_nu_cross_section_ensemble(energy, variants=('csms', 'ctw'))
+    assert ensemble.dtype.names == ('csms', 'ctw')
+    with np.testing.assert_raises(ValueError):
+        cross_sections.get_nu_cross_section_ensemble(energy, variants=('ctw', 'bgr'))
+
+
+def test_ensemble_past_the_csms_table():
+    # 1e7 - 1e12 GeV: csms is nan above 5e11 GeV instead of raising, the other variants are unchanged
+    energy = np.logspace(16, 21, 51) * units.eV
+    ensemble = cross_sections.get_nu_cross_section_ensemble(energy)
+    outside = energy > 5e11 * units.GeV
+    assert np.any(outside)
+    assert np.all(np.isnan(ensemble['csms'][outside]))
+    assert np.array_equal(ensemble['csms'][~outside], cross_sections.csms(energy[~outside], 'total', 12))
+    assert np.array_equal(ensemble['ctw'], cross_sections.get_nu_cross_section(energy, 12))
+    with np.testing.assert_raises(ValueError):
+        cross_sections.get_nu_cross_section_ensemble(energy, extrapolation=None)
+
+
+def test_interaction_length_memo():
+    cross_sections.clear_interaction_length_cache()
+    energy = np.geomspace(1e5, 1e11, 31) * units.GeV
+    uncached = cross_sections.interaction_length(cross_sections.get_nu_cross_section(energy, 12))
+
+    first = cross_sections.get_interaction_length(energy)
+    assert np.array_equal(first, uncached)
+    # the caller owns the result, modifying it does not change later calls
+    first *= 2
+    second = cross_sections.get_interaction_length(energy.copy())
+    assert np.array_equal(second, uncached)
+    second[:] = 0
+    assert np.array_equal(cross_sections.get_interaction_length(energy), uncached)
+    info = cross_sections.interaction_length_cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (2, 1, 1)
+
+    # other arguments are other entries
+    csms = cross_sections.get_interaction_length(energy, flavor=-14, inttype='cc', cross_section_type='csms')
+    assert np.array_equal(csms, cross_sections.interaction_length(cross_sections.csms(energy, 'cc', -14)))
+    assert cross_sections.interaction_length_cache_info()["misses"] == 2
+    assert np.isclose(cross_sections.get_interaction_length(1e9 * units.GeV),
+                      cross_sections.interaction_length(cross_sections.get_nu_cross_section(1e9 * units.GeV, 12)),
+                      rtol=1e-12, atol=0)
+    cross_sections.clear_interaction_length_cache()
+    assert cross_sections.interaction_length_cache_info()["size"] == 0
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import cross_sections
+import fluxes
+import units
+
+'''
+Check the limit functions of fluxes.py against their baseline forms,
+and limits from a cross-section ensemble against one variant at a time.
+Run with `python -m pytest` from this directory.
+'''
+
+
+def test_limit_flux_by_table_name():
+    store = fluxes.get_veff_store()
+    table = store.table("deep_high_low_1Hz")
+    energy = table["energy"] * units.GeV
+    veff_sr = table["veff"] * units.km**3 * units.sr
+    by_name = fluxes.get_limit_flux(energy, "deep_high_low_1Hz", livetime=5*units.year)
+    by_array = fluxes.get_limit_flux(energy, veff_sr, livetime=5*units.year)
+    assert np.array_equal(by_name, by_array)
+
+
+def test_veff_store_leaves_sys_path():
+    # computing_stuff has its own limits.py / rnog.py, which must not become importable from here
+    code = ("import sys, fluxes; path = list(sys.path); fluxes.get_veff_store().names(); "
+            "print(sys.path == path, 'veff_store' in sys.modules)")
+    here = os.path.dirname(os.path.abspath(__file__))
+    printed = subprocess.run([sys.executable, '-c', code], cwd=here, capture_output=True,
+                             text=True, check=True).stdout.splitlines()[-1]
+    assert printed=='True False'
+
+
+def test_ensemble_limit_matches_variants():
+    energy = np.geomspace(1e6, 1e11, 11) * units.GeV
+    veff_sr = np.geomspace(0.1, 100, 11) * units.km**3 * units.sr
+    ensemble = cross_sections.get_nu_cross_section_ensemble(energy)
+    limits = fluxes.get_limit_e2_flux(energy, veff_sr, 5*units.year, nuCrsScn=ensemble)
+    assert limits.dtype.names == ensemble.dtype.names
+    for variant, (cross_section_type, suffix) in cross_sections.cross_section_variants.items():
+        single = fluxes.get_limit_e2_flux(energy, veff_sr, 5*units.year, nuCrsScn=cross_section_type,
+                                          inttype='total' + suffix)
+        assert np.allclose(limits[variant], single, rtol=1e-12, atol=0)
+
+    lower, upper = fluxes.get_limit_band(limits)
+    stacked = np.array([limits[variant] for variant in limits.dtype.names])
+    assert np.array_equal(lower, stacked.min(axis=0))
+    assert np.array_equal(upper, stacked.max(axis=0))
+
+
+def test_ensemble_limit_band_past_the_csms_table():
+    energy = np.logspace(16, 21, 11) * units.eV
+    veff_sr = np.geomspace(0.1, 100, 11) * units.km**3 * units.sr
+    for inttype in ('total', np.array(['cc', 'nc'] * 5 + ['cc'])):
+        ensemble = cross_sections.get_nu_cross_section_ensemble(energy, inttype=inttype)
+        limits = fluxes.get_limit_e2_flux(energy, veff_sr, 5*units.year, nuCrsScn=ensemble)
+        lower, upper = fluxes.get_limit_band(limits)
+        assert np.all(np.isfinite(lower)) and np.all(np.isfinite(upper))
+        assert np.all(lower <= limits['ctw']) and np.all(limits['ctw'] <= upper)
+        # the csms limit is only missing past its table
+        assert np.array_equal(np.isnan(limits['csms']), energy > 5e11 * units.GeV)
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import types
+
+import numpy as np
+from scipy import interpolate
+
+import cross_sections
+import modeldata
+import units
+
+'''
+Check that make_plots imports without NuRadioReco, scipy or pandas, that
+check_units finds differing constants, and that the np.interp astro bands
+give what interp1d with fill_value=-99. did.
+Run with `python -m pytest` from this directory.
+'''
+
+_here = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_import_is_light():
+    code = ("import sys, E2_fluxes_HESnowmass, fluxes, cross_sections; "
+            "print(','.join(m for m in ('NuRadioReco', 'scipy', 'pandas') if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], cwd=_here, capture_output=True,
+                            text=True, check=True).stdout.splitlines()[-1].strip()
+    assert loaded==''
+
+
+def test_check_units():
+    reference = types.ModuleType('reference_units')
+    reference.__dict__.update({name: value for name, value in vars(units).items() if not name.startswith('_')})
+    assert cross_sections.check_units(reference)=={}
+
+    reference.GeV = units.GeV * 1.001
+    del reference.picobarn
+    assert cross_sections.check_units(reference)=={'GeV': (units.GeV, units.GeV * 1.001)}
+
+
+def test_astro_bands_match_interp1d():
+    log_astro_energies = np.log10(np.logspace(11, 21.1, num=70))
+    with np.errstate(divide='ignore'):
+        bands = ((modeldata.muf_epos_cosmo[:, 0], np.log10(modeldata.muf_astro[:, 3] + modeldata.muf_astro[:, 6])),
+                  (np.log10(modeldata.clusters[:, 0]) + 9., np.log10(modeldata.clusters[:, 1])),
+                  (np.log10(modeldata.tde[:, 0]) + 9., np.log10(modeldata.tde[:, 2] * 3)),
+                  (np.log10(modeldata.tde[:, 0]) + 9., np.log10(modeldata.tde[:, 3] * 3)))
+    for x, y in bands:
+        with np.errstate(invalid='ignore'):
+            reference = interpolate.interp1d(x, y, fill_value=-99., bounds_error=False)(log_astro_energies)
+            fast = np.interp(log_astro_energies, x, y, left=-99., right=-99.)
+        reference[np.isinf(reference)] = -99.
+        fast[np.isinf(fast)] = -99.
+        assert np.array_equal(fast, reference, equal_nan=True)